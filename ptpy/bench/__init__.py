@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Benchmarks, each runnable as a module:
+#
+#     python -m ptpy.bench             (same as ptpy.bench.throughput)
+#     python -m ptpy.bench.throughput
+#     python -m ptpy.bench.strings
+#     python -m ptpy.bench.literals
+#     python -m ptpy.bench.backends
+#     python -m ptpy.bench.interning
+#
+# ptpy.bench.corpus makes the synthetic sources they run on.
+
+import time
+
+
+def timed(func, repeat=3):
+    """Shortest time of repeat calls to func, and what the last call
+    returned"""
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        result = func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def best_of(func, repeat=3):
+    """Shortest time of repeat calls to func"""
+    return timed(func, repeat)[0]
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# python -m ptpy.bench runs the throughput benchmark
+
+import sys
+
+from ptpy.bench import throughput
+
+
+sys.exit(throughput.main())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Code generation time of each PtpyCompiler backend on the synthetic
+# corpora of ptpy.bench.corpus, from the same parsed trees, and how
+# many times faster the ast backend is.
+#
+#     python -m ptpy.bench.backends [size in KB]
+
+import sys
+
+import ptpy.p_lower as ptpylower
+import ptpy.p_parser as ptpyparser
+from ptpy.bench import best_of, corpus, throughput
+
+
+def main(size=64):
+    size = float(size)
+    parser = ptpyparser.PtpyParser()
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, throughput.RECURSION_LIMIT))
+    print "%-10s %8s %12s %12s %8s" % ("shape", "KB", "compiler s",
+                                       "ast s", "speedup")
+    try:
+        for shape in sorted(corpus.SHAPES):
+            source = corpus.generate(shape, int(size * 1024))
+            tree = parser.parse(source)
+            old = best_of(lambda: throughput.generate_code(tree))
+            new = best_of(lambda: ptpylower.generate(tree, '<bench>'))
+            print "%-10s %8.1f %12.3f %12.3f %7.1fx" % (
+                shape, len(source) / 1024.0, old, new, old / new)
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
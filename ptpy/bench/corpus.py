@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Synthetic ptpy sources for the benchmarks. Each shape stresses a
+# different part of the lexer and parser; all of them are valid
+# programs the compiler takes. Sources are built from a seeded random
+# generator, so the same arguments always give the same source.
+#
+#     python -m ptpy.bench.corpus [shape] [size in KB] [seed] > x.ptpy
+
+import random
+import sys
+
+
+def _names(rng, count):
+    return ['%s%i' % (rng.choice(['nome', 'valor', 'total', 'x', 'item']), i)
+            for i in range(count)]
+
+
+def _expr(rng, names, depth=2):
+    if depth == 0 or rng.random() < 0.3:
+        if rng.random() < 0.6:
+            return rng.choice(names)
+        return str(rng.randint(0, 1000))
+    op = rng.choice(['+', '-', '*', '/', '%', '<<', '&', '|'])
+    expr = "%s %s %s" % (_expr(rng, names, depth - 1), op,
+                         _expr(rng, names, depth - 1))
+    if rng.random() < 0.3:
+        return "(%s)" % expr
+    return expr
+
+
+def _statement(rng, names, indent):
+    kind = rng.random()
+    if kind < 0.5:
+        line = "%s = %s" % (rng.choice(names), _expr(rng, names))
+    elif kind < 0.7:
+        line = "%s += %s" % (rng.choice(names), _expr(rng, names, 1))
+    elif kind < 0.85:
+        # the grammar doesn't take empty lists yet
+        line = "%s = [%s]" % (rng.choice(names), ", ".join(
+            _expr(rng, names, 0) for _ in range(rng.randint(1, 6))))
+    else:
+        line = '%s = "%s"' % (rng.choice(names), 'texto ' * rng.randint(1, 8))
+    return indent + line + "\n"
+
+
+def _block(rng, names, indent, lines):
+    return "".join(_statement(rng, names, indent) for _ in range(lines))
+
+
+def mixed(rng, size):
+    """Ordinary code: assignments, ifs, loops and functions"""
+    names = _names(rng, 50)
+    parts = ["".join("%s = %i\n" % (name, i) for i, name in enumerate(names))]
+    total = len(parts[0])
+    while total < size:
+        kind = rng.random()
+        if kind < 0.4:
+            part = _block(rng, names, "", 5)
+        elif kind < 0.6:
+            part = ("se %s < %s:\n" % (rng.choice(names), rng.choice(names)) +
+                    _block(rng, names, "    ", 3) + "senao:\n" +
+                    _block(rng, names, "    ", 2))
+        elif kind < 0.8:
+            part = ("para %s em [1, 2, 3]:\n" % rng.choice(names) +
+                    _block(rng, names, "    ", 3))
+        else:
+            part = ("definir f%i:\n" % total +
+                    _block(rng, names, "    ", 4))
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def nested(rng, size, depth=30):
+    """definir blocks nested depth deep"""
+    names = _names(rng, 10)
+    parts = []
+    total = 0
+    while total < size:
+        lines = []
+        for level in range(depth):
+            indent = "    " * level
+            lines.append("%sdefinir f%i_%i:\n" % (indent, total, level))
+            lines.append(_statement(rng, names, indent + "    "))
+        part = "".join(lines)
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def closures(rng, size, depth=30, uses=20):
+    """definir blocks nested depth deep in one binding the names, each
+    reading uses of them, which are free in the blocks in between"""
+    names = _names(rng, 200)
+    parts = []
+    total = 0
+    while total < size:
+        lines = ["definir g%i:\n" % total]
+        lines.extend("    %s = %i\n" % (name, i) for i, name in enumerate(names))
+        for level in range(1, depth + 1):
+            indent = "    " * level
+            lines.append("%sdefinir f%i_%i:\n" % (indent, total, level))
+            lines.append("%s    resultado = [%s]\n" % (indent, ", ".join(
+                rng.sample(names, uses))))
+        part = "".join(lines)
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def configs(rng, size, kinds=20, keys=10):
+    """definir blocks of settings, as in generated configuration: most
+    bodies are one of kinds repeated, the others differ in a value"""
+    words = ['padrao', 'local', 'remoto', 'ativo', 'http', 'cache']
+    bodies = []
+    for _ in range(kinds):
+        values = []
+        for i in range(keys):
+            kind = rng.random()
+            if kind < 0.4:
+                value = '"%s"' % rng.choice(words)
+            elif kind < 0.7:
+                value = str(rng.choice([0, 1, 80, 8080, 3600]))
+            else:
+                value = '[%s]' % ', '.join('"%s"' % word for word in
+                                           rng.sample(words, 3))
+            values.append("    chave%i = %s\n" % (i, value))
+        bodies.append(values)
+    parts = []
+    total = 0
+    while total < size:
+        values = list(rng.choice(bodies))
+        if rng.random() < 0.2:
+            values[rng.randrange(keys)] = "    chave0 = %i\n" % total
+        part = "definir config%i:\n%s" % (total, "".join(values))
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def chains(rng, size, length=200):
+    """se / ouse / senao chains length conditions long"""
+    names = _names(rng, 10)
+    parts = []
+    total = 0
+    while total < size:
+        var = rng.choice(names)
+        lines = ["se %s == 0:\n" % var, _statement(rng, names, "    ")]
+        for i in range(1, length):
+            lines.append("ouse %s == %i:\n" % (var, i))
+            lines.append(_statement(rng, names, "    "))
+        lines.append("senao:\n")
+        lines.append(_statement(rng, names, "    "))
+        part = "".join(lines)
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def literals(rng, size, items=2000):
+    """List and dict literals items elements long, one per line"""
+    parts = []
+    total = 0
+    while total < size:
+        if rng.random() < 0.5:
+            part = "lista = [%s]\n" % ", ".join(
+                str(rng.randint(0, 10 ** 6)) for _ in range(items))
+        else:
+            part = "tabela = {%s}\n" % ", ".join(
+                '"k%i": %i' % (i, rng.randint(0, 10 ** 6))
+                for i in range(items))
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def strings(rng, size, length=10000):
+    """String literals length characters long, escaped and triple
+    quoted"""
+    words = ['um', 'texto', 'qualquer', '\\"citado\\"', '\\t', '\\n']
+    parts = []
+    total = 0
+    while total < size:
+        text = []
+        count = 0
+        while count < length:
+            word = rng.choice(words)
+            text.append(word)
+            count += len(word) + 1
+        text = " ".join(text)
+        if rng.random() < 0.5:
+            part = 'texto = "%s"\n' % text
+        else:
+            part = 'texto = """%s"""\n' % text.replace(' um ', '\num\n')
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def comments(rng, size, ratio=0.8):
+    """Mostly comment lines, ratio of them, with some code between"""
+    names = _names(rng, 10)
+    parts = []
+    total = 0
+    while total < size:
+        if rng.random() < ratio:
+            part = "#%s %s\n" % (" " * rng.randint(0, 8),
+                                 "comentario " * rng.randint(1, 8))
+        else:
+            part = _statement(rng, names, "") + "\n"
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+SHAPES = {
+    'mixed': mixed,
+    'nested': nested,
+    'closures': closures,
+    'configs': configs,
+    'chains': chains,
+    'literals': literals,
+    'strings': strings,
+    'comments': comments,
+}
+
+
+def generate(shape='mixed', size=64 * 1024, seed=0, **options):
+    """Return a source of about size bytes of the given shape. options
+    are passed on to the shape's generator, such as depth for nested
+    or items for literals."""
+    try:
+        make = SHAPES[shape]
+    except KeyError:
+        raise ValueError("unknown shape %r" % shape)
+    return make(random.Random(seed), size, **options)
+
+
+def main(shape='mixed', size=64, seed=0):
+    sys.stdout.write(generate(shape, int(float(size) * 1024), int(seed)))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Size of the code compiled from the synthetic corpora of
+# ptpy.bench.corpus, with and without interning: marshalled, as in the
+# cache, and in memory, the objects the code is made of counted once.
+#
+#     python -m ptpy.bench.interning [size in KB]
+
+import marshal
+import sys
+import types
+
+import ptpy.p_compiler as ptpycompiler
+from ptpy.bench import corpus, throughput
+
+
+def code_size(code):
+    """Bytes taken by code and the objects it's made of, each counted
+    once"""
+    seen = set()
+    total = 0
+    todo = [code]
+    while todo:
+        value = todo.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, types.CodeType):
+            todo.extend([value.co_code, value.co_consts, value.co_names,
+                         value.co_varnames, value.co_freevars,
+                         value.co_cellvars, value.co_filename,
+                         value.co_name, value.co_lnotab])
+        elif isinstance(value, tuple):
+            todo.extend(value)
+    return total
+
+
+def main(size=64):
+    size = float(size)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, throughput.RECURSION_LIMIT))
+    print "%-10s %-9s %10s %10s %10s %10s" % (
+        "shape", "backend", "marshal", "interned", "memory", "interned")
+    try:
+        for shape in sorted(corpus.SHAPES):
+            source = corpus.generate(shape, int(size * 1024))
+            for backend in ptpycompiler.BACKENDS:
+                codes = [ptpycompiler.PtpyCompiler(
+                    backend=backend, interning=interning).compile(source)
+                    for interning in (False, True)]
+                sizes = [len(marshal.dumps(code)) for code in codes] + \
+                    [code_size(code) for code in codes]
+                print "%-10s %-9s %10i %10i %10i %10i" % (
+                    (shape, backend) + tuple(sizes))
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
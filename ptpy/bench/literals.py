@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Parser time on single literals and argument lists of many items,
+# and on modules of as many statements. Linear rules take about ten
+# times as long for ten times the items.
+#
+#     python -m ptpy.bench.literals [items]
+
+import sys
+
+import ptpy.p_lexer as ptpylexer
+import ptpy.p_parser as ptpyparser
+from ptpy.bench import best_of
+
+
+SOURCES = [
+    ('list', lambda items: 'a = [%s]\n' % ', '.join(
+        str(i) for i in range(items))),
+    ('tuple', lambda items: 'a = %s\n' % ', '.join(
+        str(i) for i in range(items))),
+    ('dict', lambda items: 'a = {%s}\n' % ', '.join(
+        '"k%i": %i' % (i, i) for i in range(items))),
+    ('call', lambda items: 'a = f(%s)\n' % ', '.join(
+        str(i) for i in range(items))),
+    ('stmts', lambda items: ''.join(
+        'a%i = %i\n' % (i, i) for i in range(items))),
+]
+
+
+def main(items=100000):
+    items = int(items)
+    lexer = ptpylexer.PtpyLexer(engine='fused')
+    parser = ptpyparser.PtpyParser()
+    print "%-8s %10s %10s %12s" % ("source", "items", "parse s",
+                                   "items/s")
+    for name, make in SOURCES:
+        for count in (items // 10, items):
+            tokbuf = lexer.tokenize_all(make(count))
+            elapsed = best_of(lambda: parser.parse(tokbuf))
+            print "%-8s %10i %10.3f %12.0f" % (name, count, elapsed,
+                                               count / elapsed)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Lexer throughput on sources made of a few megabyte-long string
+# literals, for every kind of literal the lexer takes.
+#
+#     python -m ptpy.bench.strings [size in MB]
+
+import sys
+
+import ptpy.p_lexer as ptpylexer
+from ptpy.bench import best_of
+
+
+LITERALS = [
+    ('plain', '"%s"', 'um texto qualquer '),
+    ('escaped', '"%s"', 'um \\"texto\\"\\tqualquer\\n'),
+    ('single', "'%s'", "um \\'texto\\' qualquer "),
+    ('triple', '"""%s"""', 'um "texto"\nqualquer\n'),
+    ('raw', 'r"%s"', 'um \\d+ qualquer '),
+]
+
+
+def make_source(quotes, text, size):
+    body = text * (size // len(text))
+    return 'a = %s\nb = %s\n' % (quotes % body, quotes % body)
+
+
+def lex(engine, source):
+    lexer = ptpylexer.PtpyLexer(engine=engine)
+    lexer.input(source)
+    for tok in lexer:
+        pass
+
+
+def main(size=1):
+    size = int(size * (1 << 20))
+    print "%-10s %-8s %10s" % ("literal", "engine", "MB/s")
+    for name, quotes, text in LITERALS:
+        source = make_source(quotes, text, size)
+        for engine in ('ply', 'fused'):
+            elapsed = best_of(lambda: lex(engine, source))
+            print "%-10s %-8s %10.1f" % (name, engine,
+                                         len(source) / elapsed / (1 << 20))
+
+
+if __name__ == '__main__':
+    main(*[float(arg) for arg in sys.argv[1:]])
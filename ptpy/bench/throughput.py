@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Lexer, parser and compiler throughput on the synthetic corpora of
+# ptpy.bench.corpus, one per shape. Each shape runs in a process of its
+# own, so its peak memory isn't hidden by the shapes run before it.
+#
+#     python -m ptpy.bench.throughput [options]
+#
+# --save writes the results to a JSON file and --baseline compares
+# them with one saved before, exiting with status 1 if any phase got
+# slower or bigger than the tolerance allows.
+
+import json
+import optparse
+import os
+import pickle
+import sys
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import ptpy.p_lexer as ptpylexer
+import ptpy.p_parser as ptpyparser
+import ptpy.p_symbols as ptpysymbols
+import ptpy.p_compiler as ptpycompiler
+from ptpy.bench import corpus, timed
+
+
+PHASES = ['lex', 'parse', 'compile']
+
+RECURSION_LIMIT = 20000
+
+
+class _Discard(object):
+    # stdout and stderr for the phases, which may print debugging
+    # output
+    def write(self, text):
+        pass
+
+
+def _peak_memory():
+    # peak resident memory of this process, in KB
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak //= 1024
+    return peak
+
+
+def generate_code(tree, filename='<bench>'):
+    """The code generation PtpyCompiler.compile does after parsing"""
+    analysis = ptpysymbols.analyze(tree, filename)
+    return ptpycompiler.PtpyModuleCodeGenerator(tree,
+                                                analysis=analysis).getCode()
+
+
+def measure(source, repeat=3):
+    """Time each phase on source, returning a dict with their times in
+    seconds, the number of lines and tokens and the peak memory the
+    phases took, in KB"""
+    lexer = ptpylexer.PtpyLexer(engine='fused')
+    parser = ptpyparser.PtpyParser()
+    start_memory = _peak_memory()
+
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = _Discard()
+    # pyassem walks the flow graph recursively, a frame per block
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, RECURSION_LIMIT))
+    try:
+        lex_time, tokbuf = timed(lambda: lexer.tokenize_all(source), repeat)
+        parse_time, tree = timed(lambda: parser.parse(tokbuf), repeat)
+        compile_time, code = timed(lambda: generate_code(tree), repeat)
+    finally:
+        sys.setrecursionlimit(limit)
+        sys.stdout, sys.stderr = stdout, stderr
+
+    result = {'lex': lex_time, 'parse': parse_time, 'compile': compile_time,
+              'lines': source.count('\n'), 'tokens': len(tokbuf),
+              'peak': None}
+    if start_memory is not None:
+        result['peak'] = _peak_memory() - start_memory
+    return result
+
+
+def in_child(func, *args):
+    """Call func in a forked process and return its result, which must
+    pickle. Without fork, func is called in this process."""
+    if not hasattr(os, 'fork'):
+        return func(*args)
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        try:
+            try:
+                result = (True, func(*args))
+            except Exception, e:
+                result = (False, "%s: %s" % (type(e).__name__, e))
+            os.write(write_end, pickle.dumps(result, 2))
+        finally:
+            os._exit(0)
+
+    os.close(write_end)
+    chunks = []
+    chunk = os.read(read_end, 1 << 16)
+    while chunk:
+        chunks.append(chunk)
+        chunk = os.read(read_end, 1 << 16)
+    os.close(read_end)
+    os.waitpid(pid, 0)
+    if not chunks:
+        raise RuntimeError("benchmark process died")
+    ok, result = pickle.loads(''.join(chunks))
+    if not ok:
+        raise RuntimeError(result)
+    return result
+
+
+def run(shapes, size, seed=0, repeat=3, errors=sys.stderr):
+    """Measure every shape, returning {shape: measure() result}. Shapes
+    that fail, such as by running out of stack in the compiler package
+    on large sources, are reported to errors and left out."""
+    results = {}
+    for shape in shapes:
+        source = corpus.generate(shape, size, seed)
+        try:
+            results[shape] = in_child(measure, source, repeat)
+        except RuntimeError, e:
+            errors.write("%s: %s\n" % (shape, e))
+    return results
+
+
+def report(results, out=sys.stdout):
+    out.write("%-9s %7s %8s %8s %8s %8s %10s %9s %8s\n" % (
+        "shape", "lines", "tokens", "lex s", "parse s", "compile s",
+        "tokens/s", "lines/s", "peak MB"))
+    for shape in sorted(results):
+        result = results[shape]
+        total = sum(result[phase] for phase in PHASES)
+        peak = result['peak']
+        out.write("%-9s %7i %8i %8.3f %8.3f %8.3f %10.0f %9.0f %8s\n" % (
+            shape, result['lines'], result['tokens'],
+            result['lex'], result['parse'], result['compile'],
+            result['tokens'] / max(result['lex'], 1e-9),
+            result['lines'] / max(total, 1e-9),
+            peak is None and '-' or '%.1f' % (peak / 1024.0)))
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Return the (shape, measure, baseline value, value) of each phase
+    time or peak memory more than tolerance above the baseline's"""
+    regressions = []
+    for shape in sorted(results):
+        if shape not in baseline:
+            continue
+        for name in PHASES + ['peak']:
+            old = baseline[shape].get(name)
+            new = results[shape][name]
+            if old is None or new is None:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append((shape, name, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage="%prog [options]")
+    parser.add_option("-s", "--size", type="float", default=64,
+                      help="size of each corpus, in KB [%default]")
+    parser.add_option("--seed", type="int", default=0,
+                      help="seed of the corpus generator [%default]")
+    parser.add_option("--shape", action="append", dest="shapes",
+                      choices=sorted(corpus.SHAPES),
+                      help="shape to run, may be repeated [all]")
+    parser.add_option("-r", "--repeat", type="int", default=3,
+                      help="runs of each phase, the best is kept "
+                           "[%default]")
+    parser.add_option("--save", metavar="FILE",
+                      help="save the results as a baseline")
+    parser.add_option("--baseline", metavar="FILE",
+                      help="compare the results with a saved baseline")
+    parser.add_option("--tolerance", type="float", default=0.2,
+                      help="slowdown allowed before flagging a "
+                           "regression [%default]")
+    options, args = parser.parse_args(argv)
+
+    shapes = options.shapes or sorted(corpus.SHAPES)
+    size = int(options.size * 1024)
+    results = run(shapes, size, options.seed, options.repeat)
+    report(results)
+
+    if options.save:
+        f = open(options.save, 'w')
+        try:
+            json.dump({'size': size, 'seed': options.seed,
+                       'results': results}, f, indent=1, sort_keys=True)
+        finally:
+            f.close()
+
+    if options.baseline:
+        f = open(options.baseline)
+        try:
+            baseline = json.load(f)
+        finally:
+            f.close()
+        if (baseline['size'], baseline['seed']) != (size, options.seed):
+            print "warning: the baseline ran on other corpora"
+        regressions = compare(results, baseline['results'],
+                              options.tolerance)
+        for shape, name, old, new in regressions:
+            print "regression: %s %s %.3f -> %.3f (%+.0f%%)" % (
+                shape, name, old, new, (new / old - 1) * 100)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,10 @@
+# ptpy.lextab.py. This file automatically created by PLY (version 3.4). Don't edit!
+_tabversion   = '3.4'
+_lextokens    = {'IAND': 1, 'INOT': 1, 'ELIF': 1, 'RETURN': 1, 'RAISE': 1, 'BOR': 1, 'GLOBAL': 1, 'IMUL': 1, 'IXOR': 1, 'MOD': 1, 'ASSERT': 1, 'WHILE': 1, 'DEL': 1, 'BNOT': 1, 'LSHIFT': 1, 'IPOW': 1, 'PRINT': 1, 'RSHIFT': 1, 'PASS': 1, 'BLOCK': 1, 'MINUS': 1, 'DEF': 1, 'IPLUS': 1, 'IMINUS': 1, 'LE': 1, 'RPAREN': 1, 'FCONST': 1, 'SEMICOLON': 1, 'POW': 1, 'DEDENT': 1, 'NEWLINE': 1, 'EXCEPT': 1, 'SCONST': 1, 'PLUS': 1, 'LT': 1, 'COLON': 1, 'DOT': 1, 'IMPORT': 1, 'CLASS': 1, 'WS': 1, 'ILSHIFT': 1, 'GT': 1, 'XOR': 1, 'RBRACE': 1, 'FOR': 1, 'EXEC': 1, 'IS': 1, 'ELSE': 1, 'TRY': 1, 'BAND': 1, 'FINALLY': 1, 'ENDMARKER': 1, 'ICONST': 1, 'LPAREN': 1, 'IN': 1, 'INDENT': 1, 'EQ': 1, 'NE': 1, 'IF': 1, 'AND': 1, 'LBRACKET': 1, 'LBRACE': 1, 'FROM': 1, 'NAME': 1, 'MULT': 1, 'IMOD': 1, 'IOR': 1, 'GE': 1, 'IDIV': 1, 'ASSIGN': 1, 'BREAK': 1, 'CONTINUE': 1, 'NOT': 1, 'IRSHIFT': 1, 'RBRACKET': 1, 'COMMA': 1, 'OR': 1, 'DIV': 1, 'LAMBDA': 1}
+_lexreflags   = 0
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_COMMENT>[ ]*\\043[^\\n]*)|(?P<t_SCONST>[rR]?(?:"""[^"\\\\]*(?:(?:\\\\(?:.|\\n)|"(?!""))[^"\\\\]*)*"""|\'\'\'[^\'\\\\]*(?:(?:\\\\(?:.|\\n)|\'(?!\'\'))[^\'\\\\]*)*\'\'\'|"(?!"")[^"\\\\\\n]*(?:\\\\.[^"\\\\\\n]*)*"|\'(?!\'\')[^\'\\\\\\n]*(?:\\\\.[^\'\\\\\\n]*)*\'|"""|\'\'\'))|(?P<t_WS> [ ]+ )|(?P<t_NEWLINE>\\n+)|(?P<t_NAME>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACKET>\\[)|(?P<t_RBRACKET>\\])|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})|(?P<t_FCONST>((\\d+)(\\.\\d+)(e(\\+|-)?(\\d+))? | (\\d+)e(\\+|-)?(\\d+))([lL]|[fF])?)|(?P<t_ICONST>\\d+([uU]|[lL]|[uU][lL]|[lL][uU])?)|(?P<t_IPOW>\\*\\*=)|(?P<t_POW>\\*\\*)|(?P<t_ILSHIFT><<=)|(?P<t_IRSHIFT>>>=)|(?P<t_IPLUS>\\+=)|(?P<t_IMUL>\\*=)|(?P<t_IXOR>\\^=)|(?P<t_IOR>\\|=)|(?P<t_IMINUS>-=)|(?P<t_PLUS>\\+)|(?P<t_XOR>\\^)|(?P<t_LSHIFT><<)|(?P<t_LE><=)|(?P<t_IDIV>/=)|(?P<t_IAND>&=)|(?P<t_EQ>==)|(?P<t_IMOD>%=)|(?P<t_MULT>\\*)|(?P<t_NE>!=)|(?P<t_OR>\\|)|(?P<t_GE>>=)|(?P<t_INOT>~=)|(?P<t_RSHIFT>>>)|(?P<t_DOT>\\.)|(?P<t_IN>in)|(?P<t_IS>is)|(?P<t_NOT>~)|(?P<t_SEMICOLON>;)|(?P<t_COMMA>,)|(?P<t_GT>>)|(?P<t_AND>&)|(?P<t_ASSIGN>=)|(?P<t_MINUS>-)|(?P<t_LT><)|(?P<t_COLON>:)|(?P<t_MOD>%)|(?P<t_DIV>/)', [None, ('t_COMMENT', 'COMMENT'), ('t_SCONST', 'SCONST'), ('t_WS', 'WS'), ('t_NEWLINE', 'NEWLINE'), ('t_NAME', 'NAME'), ('t_LPAREN', 'LPAREN'), ('t_RPAREN', 'RPAREN'), ('t_LBRACKET', 'LBRACKET'), ('t_RBRACKET', 'RBRACKET'), ('t_LBRACE', 'LBRACE'), ('t_RBRACE', 'RBRACE'), (None, 'FCONST'), None, None, None, None, None, None, None, None, None, None, (None, 'ICONST'), None, (None, 'IPOW'), (None, 'POW'), (None, 'ILSHIFT'), (None, 'IRSHIFT'), (None, 'IPLUS'), (None, 'IMUL'), (None, 'IXOR'), (None, 'IOR'), (None, 'IMINUS'), (None, 'PLUS'), (None, 'XOR'), (None, 'LSHIFT'), (None, 'LE'), (None, 'IDIV'), (None, 'IAND'), (None, 'EQ'), (None, 'IMOD'), (None, 'MULT'), (None, 'NE'), (None, 'OR'), (None, 'GE'), (None, 'INOT'), (None, 'RSHIFT'), (None, 'DOT'), (None, 'IN'), (None, 'IS'), (None, 'NOT'), (None, 'SEMICOLON'), (None, 'COMMA'), (None, 'GT'), (None, 'AND'), (None, 'ASSIGN'), (None, 'MINUS'), (None, 'LT'), (None, 'COLON'), (None, 'MOD'), (None, 'DIV')])]}
+_lexstateignore = {'INITIAL': ''}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_signature    = 'da7e1bda39e631e811c0463edb297290'
@@ -25,3 +25,21 @@ class Code(Node):
         return tuple(nodelist)
     
 
+
+class Unparsed(Node):
+    # body of a block the parser skipped over, see
+    # p_lexer.block_skipping_filter. It's parsed and compiled by
+    # p_compiler.compile_block when the block is first run
+    def __init__(self, text, dialect, lineno=None):
+        self.text = text
+        self.dialect = dialect
+        self.lineno = lineno
+
+    def getChildren(self):
+        return self.text, self.dialect
+
+    def getChildNodes(self):
+        return ()
+
+    def __repr__(self):
+        return "Unparsed(%r, %r)" % (self.text, self.dialect)
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# On-disk cache of the code compiled from ptpy source files, used by
+# p_compiler.compile_file. Each entry is a file in the cache directory
+# holding two marshalled objects: a header, then the code.
+#
+# The header records the versions of the compiler and of the grammar,
+# the source's path, size, modification time and md5, and the compile
+# options. An entry is used while the versions and options are the
+# same and the source's size and time match, which takes a stat and a
+# marshal.load; when only the time changed, such as after a checkout,
+# the md5 is checked before compiling again. Entries are written to a
+# temporary file renamed over the old one, so a reader never sees half
+# an entry and concurrent writers just replace each other's.
+#
+# Entries of sources that changed or are gone are left behind until
+# pruned:
+#
+#     python -m ptpy.p_cache [--dir DIR] [--dry-run]
+#
+# CompileCache is an in-memory cache of the code compiled from source
+# strings, for PtpyCompiler, bounded by number of entries and size.
+
+import collections
+import glob
+import imp
+import marshal
+import optparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
+import ptpy.p_lexer as ptpylexer
+import ptpy.p_parser as ptpyparser
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MAGIC = 'ptpyc1'
+
+SUFFIX = '.ptpyc'
+
+# temporary files older than this, in seconds, were left by a writer
+# that died and are removed when pruning
+TEMP_AGE = 3600
+
+# header fields
+(H_MAGIC, H_COMPILER, H_GRAMMAR, H_PATH, H_OPTIONS,
+ H_SIZE, H_MTIME, H_DIGEST) = range(8)
+
+_versions = None
+
+
+def versions():
+    """Return the versions of the compiler and of the grammar. The
+    compiler's is a digest of the bytecode magic of this Python and of
+    the modules of this package, so any change to them drops the
+    entries compiled before."""
+    global _versions
+    if _versions is None:
+        sig = md5(imp.get_magic())
+        for filename in sorted(glob.glob(os.path.join(PACKAGE_DIR,
+                                                      'p_*.py'))):
+            f = open(filename, 'rb')
+            try:
+                sig.update(f.read())
+            finally:
+                f.close()
+        _versions = (sig.hexdigest(), ptpylexer.lexer_signature() +
+                     ptpyparser.grammar_signature())
+    return _versions
+
+
+def default_directory():
+    """The cache directory used when none is given: $PTPY_CACHE_DIR,
+    or ptpy in the user's cache directory"""
+    directory = os.environ.get('PTPY_CACHE_DIR')
+    if directory:
+        return directory
+    base = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ptpy')
+
+
+def read_source(filename):
+    """Return the source in filename and its md5"""
+    f = open(filename, 'rU')
+    try:
+        source = f.read()
+    finally:
+        f.close()
+    return source, md5(source).hexdigest()
+
+
+def _matches(header, stat):
+    return (header[H_SIZE], header[H_MTIME]) == (stat.st_size,
+                                                 stat.st_mtime)
+
+
+
+class CodeCache(object):
+    """The entries in directory, default_directory() by default. It's
+    made when the first entry is stored.
+
+    options are any marshallable value standing for the options the
+    code is compiled with, such as the dialect and optimisation level.
+    Each source has an entry for each options it's compiled with.
+    """
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = default_directory()
+        self.directory = directory
+
+    def entry_path(self, filename, options):
+        """The path of the entry for filename compiled with options"""
+        path = os.path.abspath(filename)
+        key = md5('%s\0%r' % (path, options)).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.directory,
+                            '%s.%s%s' % (name, key, SUFFIX))
+
+    def read(self, path):
+        """Return the header and the code in the entry at path, or None
+        if it can't be read or is for another version"""
+        try:
+            f = open(path, 'rb')
+        except IOError:
+            return None
+        try:
+            try:
+                header = marshal.load(f)
+                if not (isinstance(header, tuple) and
+                        len(header) == H_DIGEST + 1 and
+                        header[H_MAGIC] == MAGIC and
+                        header[H_COMPILER:H_GRAMMAR+1] == versions()):
+                    return None
+                return header, marshal.load(f)
+            except (EOFError, ValueError, TypeError, IOError):
+                return None
+        finally:
+            f.close()
+
+    def write(self, path, header, code):
+        """Write an entry to path, replacing the one there at once.
+        Return whether it could be written."""
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, temp = tempfile.mkstemp(SUFFIX + '.tmp',
+                                        os.path.basename(path) + '.',
+                                        self.directory)
+        except OSError:
+            return False
+        try:
+            f = os.fdopen(fd, 'wb')
+            try:
+                marshal.dump(header, f)
+                marshal.dump(code, f)
+            finally:
+                f.close()
+            try:
+                os.rename(temp, path)
+            except OSError:
+                # Windows won't rename over a file
+                os.remove(path)
+                os.rename(temp, path)
+            return True
+        except (IOError, OSError, ValueError):
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            return False
+
+    def get(self, filename, options, compile):
+        """Return the code of the source file filename compiled with
+        options, from its entry if it's valid. Otherwise the code is
+        compile(source), and stored."""
+        stat = os.stat(filename)
+        path = self.entry_path(filename, options)
+        entry = self.read(path)
+        if entry is not None and entry[0][H_OPTIONS] == options and \
+                _matches(entry[0], stat):
+            return entry[1]
+
+        source, digest = read_source(filename)
+        if entry is not None and entry[0][H_OPTIONS] == options and \
+                entry[0][H_DIGEST] == digest:
+            code = entry[1]
+        else:
+            code = compile(source)
+        compiler, grammar = versions()
+        self.write(path, (MAGIC, compiler, grammar, os.path.abspath(filename),
+                          options, stat.st_size, stat.st_mtime, digest),
+                   code)
+        return code
+
+    def fresh(self, filename, options):
+        """Whether get would take the code of filename compiled with
+        options from its entry, the source's size and time matching"""
+        entry = self.read(self.entry_path(filename, options))
+        if entry is None or entry[0][H_OPTIONS] != options:
+            return False
+        try:
+            return _matches(entry[0], os.stat(filename))
+        except OSError:
+            return False
+
+    def stale(self, path):
+        """Whether the entry at path can't be used anymore: it can't be
+        read, is for another version or its source changed or is gone"""
+        entry = self.read(path)
+        if entry is None:
+            return True
+        header = entry[0]
+        try:
+            stat = os.stat(header[H_PATH])
+            if _matches(header, stat):
+                return False
+            return read_source(header[H_PATH])[1] != header[H_DIGEST]
+        except (IOError, OSError):
+            return True
+
+    def prune(self, dry_run=False):
+        """Remove the stale entries, and the temporary files left behind
+        by writers that died. Return the paths removed, or with dry_run
+        the paths that would be."""
+        removed = []
+        now = time.time()
+        for path in sorted(glob.glob(os.path.join(self.directory,
+                                                  '*' + SUFFIX))):
+            if self.stale(path):
+                removed.append(path)
+        for path in glob.glob(os.path.join(self.directory,
+                                           '*' + SUFFIX + '.tmp')):
+            try:
+                if now - os.path.getmtime(path) > TEMP_AGE:
+                    removed.append(path)
+            except OSError:
+                pass
+        if not dry_run:
+            for path in removed:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return removed
+
+
+
+class CompileCache(object):
+    """The code compiled from the last sources, evicting the least
+    recently used past max_entries entries or max_bytes of marshalled
+    code. None means no limit. Safe to share between compilers and
+    threads.
+
+    hits, misses and evictions count the lookups that found code, the
+    ones that didn't, and the entries evicted.
+    """
+    def __init__(self, max_entries=256, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self.bytes = 0
+        # {key: (code, size)}, least recently used first
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, source, filename, options):
+        """The key of the code of source, a string, compiled for
+        filename with options"""
+        if isinstance(source, unicode):
+            digest = md5(source.encode('utf-8')).digest()
+        else:
+            digest = md5(source).digest()
+        return type(source), digest, filename, options
+
+    def get(self, key):
+        """Return the code for key, or None"""
+        self._lock.acquire()
+        try:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+        finally:
+            self._lock.release()
+
+    def put(self, key, code):
+        """Keep code for key, unless it's bigger than the cache"""
+        size = len(marshal.dumps(code))
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._lock.acquire()
+        try:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = code, size
+            self.bytes += size
+            while (self.max_entries is not None and
+                   len(self._entries) > self.max_entries) or \
+                  (self.max_bytes is not None and self.bytes > self.max_bytes):
+                self.bytes -= self._entries.popitem(last=False)[1][1]
+                self.evictions += 1
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        """Drop every entry, keeping the counters"""
+        self._lock.acquire()
+        try:
+            self._entries.clear()
+            self.bytes = 0
+        finally:
+            self._lock.release()
+
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage="%prog [options]",
+                                   description="Remove the stale entries "
+                                   "from a ptpy code cache.")
+    parser.add_option("-d", "--dir", dest="directory",
+                      help="cache directory [%s]" % default_directory())
+    parser.add_option("-n", "--dry-run", action="store_true", default=False,
+                      help="only list the entries to remove")
+    parser.add_option("-v", "--verbose", action="store_true", default=False,
+                      help="list the entries removed")
+    options, args = parser.parse_args(argv)
+    if args:
+        parser.error("unexpected arguments: %s" % ' '.join(args))
+
+    removed = CodeCache(options.directory).prune(options.dry_run)
+    if options.dry_run or options.verbose:
+        for path in removed:
+            print path
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
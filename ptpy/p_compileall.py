@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Compiles every ptpy source in directory trees into the code cache,
+# the same p_import loads from, the way compileall does for Python:
+#
+#     python -m ptpy.p_compileall [options] PATH...
+#
+# Files whose cache entry is still valid are skipped. The rest are
+# compiled by a pool of processes, one per CPU unless --jobs says
+# otherwise, each keeping one PtpyCompiler from file to file. A file
+# that fails to compile is reported and the others still compiled; the
+# exit status is 1 if any failed.
+
+import multiprocessing
+import optparse
+import os
+import sys
+import time
+import traceback
+
+import ptpy.p_compiler as ptpycompiler
+import ptpy.p_import as ptpyimport
+import ptpy.p_lexer as ptpylexer
+
+
+def find_sources(paths):
+    """The ptpy sources in paths, files or directories searched
+    recursively, in order"""
+    sources = []
+    for path in paths:
+        if not os.path.isdir(path):
+            sources.append(path)
+            continue
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted([name for name in dirnames
+                                  if name != ptpyimport.CACHE_DIRNAME])
+            sources.extend([os.path.join(directory, name)
+                            for name in sorted(filenames)
+                            if name.endswith(ptpyimport.SUFFIX)])
+    return sources
+
+
+def _cache_dir(filename, cache_dir):
+    if cache_dir is None:
+        return ptpyimport.cache_directory(filename)
+    return cache_dir
+
+
+# the compiler of each process, by its options
+_compilers = {}
+
+
+def _compile((options, cache_dir, filename)):
+    # Compile filename into the cache, returning (filename, error
+    # message or None, seconds taken)
+    try:
+        compiler = _compilers[options]
+    except KeyError:
+        dialect, optimize, lazy_blocks, backend, interning = options
+        compiler = _compilers[options] = ptpycompiler.PtpyCompiler(
+            lazy_blocks, dialect, optimize, backend=backend,
+            interning=interning)
+    start = time.time()
+    try:
+        compiler.compile_file(filename, _cache_dir(filename, cache_dir))
+    except (SyntaxError, IOError, OSError), e:
+        error = "%s: %s" % (type(e).__name__, e)
+    except Exception:
+        error = traceback.format_exc().rstrip()
+    else:
+        error = None
+    return filename, error, time.time() - start
+
+
+def compile_all(sources, dialect=ptpylexer.p_dialects.DEFAULT_DIALECT,
+                optimize=1, lazy_blocks=False, cache_dir=None, jobs=None,
+                report=None, backend=ptpycompiler.DEFAULT_BACKEND,
+                interning=False):
+    """Compile the sources whose cache entries aren't valid, in cache_dir
+    or next to each source, with jobs processes, the number of CPUs by
+    default. report(filename, error, seconds) is called after each
+    compile. Return the number of sources skipped and the (filename,
+    error) of each that failed."""
+    compiler = ptpycompiler.PtpyCompiler(lazy_blocks, dialect, optimize,
+                                         backend=backend,
+                                         interning=interning)
+    options = compiler.options()
+    tasks = [(options, cache_dir, filename) for filename in sources
+             if not compiler.is_cached(filename,
+                                       _cache_dir(filename, cache_dir))]
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    jobs = min(jobs, len(tasks))
+
+    failed = []
+    if jobs > 1:
+        pool = multiprocessing.Pool(jobs)
+        results = pool.imap_unordered(_compile, tasks)
+    else:
+        pool = None
+        results = (_compile(task) for task in tasks)
+    try:
+        for filename, error, seconds in results:
+            if error is not None:
+                failed.append((filename, error))
+            if report is not None:
+                report(filename, error, seconds)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return len(sources) - len(tasks), failed
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage="%prog [options] PATH...",
+                                   description="Compile the ptpy sources "
+                                   "in the given files and directory trees.")
+    parser.add_option("-j", "--jobs", type="int",
+                      help="processes compiling at once [number of CPUs]")
+    parser.add_option("-d", "--dialect",
+                      default=ptpylexer.p_dialects.DEFAULT_DIALECT,
+                      help="dialect of the sources [%default]")
+    parser.add_option("-O", "--optimize", type="int", default=1,
+                      help="optimisation level [%default]")
+    parser.add_option("--lazy-blocks", action="store_true", default=False,
+                      help="compile definir bodies when first run")
+    parser.add_option("-b", "--backend", type="choice",
+                      choices=list(ptpycompiler.BACKENDS),
+                      default=ptpycompiler.DEFAULT_BACKEND,
+                      help="code generator, one of %s [%%default]"
+                           % ', '.join(ptpycompiler.BACKENDS))
+    parser.add_option("--intern", action="store_true", default=False,
+                      dest="interning",
+                      help="share the constants and code the blocks of "
+                           "a module have in common")
+    parser.add_option("--cache-dir",
+                      help="cache directory [%s next to each source]"
+                           % ptpyimport.CACHE_DIRNAME)
+    parser.add_option("-q", "--quiet", action="store_true", default=False,
+                      help="only report failures")
+    options, args = parser.parse_args(argv)
+    if not args:
+        parser.error("no paths to compile")
+
+    def report(filename, error, seconds):
+        if error is not None:
+            sys.stderr.write("*** %s\n%s\n" % (filename, error))
+        elif not options.quiet:
+            print "%s (%.3fs)" % (filename, seconds)
+
+    start = time.time()
+    sources = find_sources(args)
+    skipped, failed = compile_all(sources, options.dialect,
+                                  options.optimize, options.lazy_blocks,
+                                  options.cache_dir, options.jobs, report,
+                                  options.backend, options.interning)
+    elapsed = time.time() - start
+    compiled = len(sources) - skipped - len(failed)
+    print "%i files: %i compiled, %i up to date, %i failed in %.2fs" % (
+        len(sources), compiled, skipped, len(failed), elapsed)
+    if compiled:
+        print "%.1f files/s compiled" % (compiled / max(elapsed, 1e-9))
+    return failed and 1 or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,16 +8,35 @@ __date__ = "Sat Sep 29 00:23:11 2012"
 
 
 
-from compiler import misc, syntax, pycodegen, visitor
-from compiler import symbols, pyassem, future
+import Queue
+import threading
+import types
+
+from compiler import pycodegen, visitor
+from compiler import symbols, pyassem
 
 from compiler.consts import CO_NEWLOCALS
 
+import ptpy.p_ast as ptpyast
+import ptpy.p_cache as ptpycache
+import ptpy.p_intern as ptpyintern
+import ptpy.p_lexer as ptpylexer
+import ptpy.p_lower as ptpylower
+import ptpy.p_optimize as ptpyoptimize
 import ptpy.p_parser as ptpyparser
+import ptpy.p_peephole as ptpypeephole
+import ptpy.p_stats as ptpystats
 import ptpy.p_symbols as ptpysymbols
+import ptpy.p_tokens as ptpytokens
 import ptpy.p_builtins as ptpybuiltins
 
 
+# the code generators PtpyCompiler can compile with: the compiler
+# package's, or the built-in compile, see p_lower
+BACKENDS = ('compiler', 'ast')
+
+DEFAULT_BACKEND = 'compiler'
+
 
 class PtpyNameFinder(pycodegen.LocalNameFinder):
     def visitCode(self, node):
@@ -47,10 +66,28 @@ class PtpyCodeGenerator(pycodegen.CodeGenerator):
             intro = "Bad class construction for %s" % self.__class__.__name__
             raise AssertionError, intro
 
+    def getCode(self):
+        """Return a code object, the graph going through the peephole
+        optimizer first"""
+        module = self.get_module()
+        stats = module.stats
+        stats.start('peephole')
+        try:
+            ptpypeephole.optimize(self.graph, module.optimize)
+        finally:
+            stats.stop()
+        if stats.enabled:
+            stats.count('instructions', len([
+                inst for block in self.graph.getBlocks()
+                for inst in block.insts if inst[0] != 'SET_LINENO']))
+        stats.start('assemble')
+        try:
+            return self.graph.getCode()
+        finally:
+            stats.stop()
+
     def parseSymbols(self, tree):
-        s = ptpysymbols.PtpySymbolVisitor()
-        visitor.walk(tree, s)
-        return s.scopes
+        return self.get_module().analysis.scopes
 
     def makeClosure(self, gen, args, frees):
         if frees:
@@ -60,6 +97,28 @@ class PtpyCodeGenerator(pycodegen.CodeGenerator):
 
 
     def visitCode(self, node):
+        self.get_module().stats.count('blocks')
+        if isinstance(node.code, ptpyast.Unparsed):
+            self.set_lineno(node)
+            self.emit('LOAD_CONST',
+                      block_stub(node, self.get_module().optimize))
+            self.storeName(node.name)
+        else:
+            self.visitParsedCode(node)
+
+        if node.wrapper is not None:
+            # load wrapper callable to TOS
+            self.visit(node.wrapper)
+            # load pattern name to TOS
+            self.emit('LOAD_CONST', node.name)
+            # load pattern to TOS
+            self.loadName(node.name)
+            # call wrapper(name, pattern)
+            self.emit('CALL_FUNCTION', 2)
+            # store it back
+            self.storeName(node.name)
+
+    def visitParsedCode(self, node):
         gen = self.BlockGen(node, self.scopes, self.get_module(), node.lazy)
         visitor.walk(node.code, gen)
         gen.finish()
@@ -68,8 +127,9 @@ class PtpyCodeGenerator(pycodegen.CodeGenerator):
         #self.emit('LOAD_CONST', node.name)
 
         frees = gen.scope.get_free_vars()
-        #print node.name, 'free', frees
-        gen.scope.DEBUG()
+        stats = self.get_module().stats
+        if stats.enabled:
+            stats.debug('scope', ptpystats.describe_scope(gen.scope))
         self.makeClosure(gen, 0, frees)
 
         self.emit('LOAD_CONST', gen)
@@ -83,18 +143,6 @@ class PtpyCodeGenerator(pycodegen.CodeGenerator):
 
         self.storeName(node.name)
 
-        if node.wrapper is not None:
-            # load wrapper callable to TOS
-            self.visit(node.wrapper)
-            # load pattern name to TOS
-            self.emit('LOAD_CONST', node.name)
-            # load pattern to TOS
-            self.loadName(node.name)
-            # call wrapper(name, pattern)
-            self.emit('CALL_FUNCTION', 2)
-            # store it back
-            self.storeName(node.name)
-
 
 
 class PtpyAbstractBlockCode:
@@ -102,11 +150,10 @@ class PtpyAbstractBlockCode:
     def __init__(self, block, scopes, module):
         self.block_name = block.name
         self.module = module
-        self.graph = pyassem.PyFlowGraph(block.name, block.filename,
+        self.graph = ptpypeephole.PtpyFlowGraph(block.name, block.filename,
                                            optimized=0)
         self.super_init()
-        lnf = visitor.walk(block.code, self.NameFinder(), verbose=0)
-        self.locals.push(lnf.getLocals())
+        self.locals.push(module.analysis.local_names(scopes[block]))
         if not self.lazy:
             self.graph.setFlag(CO_NEWLOCALS)
         if block.doc:
@@ -146,29 +193,287 @@ class PtpyModuleCodeGenerator(PtpyNestedScopeMixin, PtpyCodeGenerator):
 
     scopes = None
 
-    def __init__(self, tree):
-        self.graph = pyassem.PyFlowGraph("<module>", tree.filename)
-        self.futures = future.find_futures(tree)
+    def __init__(self, tree, optimize=0, stats=ptpystats.NO_STATS,
+                 analysis=None):
+        # the level tree was optimized for, which the lazy blocks in
+        # it are compiled with
+        self.optimize = optimize
+        self.stats = stats
+        # the p_symbols.PtpyAnalysis of tree, made here if not given
+        if analysis is None:
+            analysis = ptpysymbols.analyze(tree, tree.filename)
+        self.analysis = analysis
+        self.graph = ptpypeephole.PtpyFlowGraph("<module>", tree.filename)
+        self.futures = analysis.futures
         self.__super_init()
         visitor.walk(tree, self)
 
     def get_module(self):
         return self
 
+    def visitModule(self, node):
+        # as CodeGenerator's, with the local names from the analysis
+        self.scopes = self.parseSymbols(node)
+        self.scope = self.scopes[node]
+        self.emit('SET_LINENO', 0)
+        if node.doc:
+            self.emit('LOAD_CONST', node.doc)
+            self.storeName('__doc__')
+        self.locals.push(self.analysis.local_names(self.scope))
+        self.visit(node.node)
+        self.emit('LOAD_CONST', None)
+        self.emit('RETURN_VALUE')
+
         
 
 class PtpyCompiler(object):
-    def __init__(self):
-        self.parser = ptpyparser.PtpyParser()
+    """Compiles ptpy sources to code objects.
+
+    A compiler runs one compile at a time. Threads compiling at once
+    should each have their own, or share a PtpyCompilerPool.
+
+    With lazy_blocks the bodies of definir blocks are only parsed and
+    compiled the first time each block is run, see block_stub.
+
+    optimize is the optimisation level, see p_optimize. 0 compiles the
+    tree as it's parsed.
+
+    With cache, a p_cache.CompileCache, the code compiled from source
+    strings is kept there, and compiling the same source for the same
+    filename again takes it from there. Compilers with the same
+    options can share a cache.
+
+    With stats, a p_stats.CompileStats, each phase of the compiles is
+    measured there. Sources are then tokenized apart from parsing,
+    unless with lazy_blocks, which needs the lexer as the parser runs.
+
+    backend is the code generator, one of BACKENDS. 'ast' lowers the
+    tree to the stdlib ast and compiles it with the built-in compile,
+    which is faster, see p_lower.
+
+    With interning, the constants and code the code objects of a
+    module have in common are shared, see p_intern.
+    """
+    def __init__(self, lazy_blocks=False,
+                 dialect=ptpylexer.p_dialects.DEFAULT_DIALECT, optimize=1,
+                 cache=None, stats=None, backend=DEFAULT_BACKEND,
+                 interning=False):
+        if backend not in BACKENDS:
+            raise ValueError("unknown backend %r" % (backend,))
+        self.lexer = ptpylexer.PtpyLexer(dialect=dialect)
+        self.parser = ptpyparser.PtpyParser(self.lexer, lazy_blocks)
+        self.lazy_blocks = lazy_blocks
+        self.dialect = dialect
+        self.optimize = optimize
+        self.cache = cache
+        self.stats = stats
+        self.backend = backend
+        self.interning = interning
 
     def compile(self, code, filename="<string>"):
-        tree = self.parser.parse(code)
-        misc.set_filename(filename, tree)
-        syntax.check(tree)
-        gen = PtpyModuleCodeGenerator(tree)
-        code = gen.getCode()
+        if self.cache is None or not isinstance(code, basestring):
+            return self._compile(code, filename)
+        key = self.cache.key(code, filename, self.options())
+        result = self.cache.get(key)
+        if result is None:
+            result = self._compile(code, filename)
+            self.cache.put(key, result)
+        return result
+
+    def _compile(self, code, filename):
+        stats = self.stats
+        if stats is None:
+            stats = ptpystats.NO_STATS
+        stats.begin()
+        try:
+            if stats.enabled and not self.lazy_blocks and \
+                    not isinstance(code, ptpytokens.TokenBuffer):
+                stats.start('lex')
+                code = self.lexer.buffer_tokens(code)
+                stats.stop()
+                stats.count('tokens', len(code))
+
+            stats.start('parse')
+            tree = self.parser.parse(code)
+            stats.stop()
+            stats.start('optimize')
+            tree = ptpyoptimize.optimize(tree, self.optimize)
+            stats.stop()
+            if stats.enabled:
+                stats.count('nodes', ptpystats.count_nodes(tree))
+
+            if self.backend == 'ast':
+                code = ptpylower.generate(tree, filename, self.optimize,
+                                          stats)
+            else:
+                stats.start('analysis')
+                analysis = ptpysymbols.analyze(tree, filename)
+                stats.stop()
+                stats.start('codegen')
+                gen = PtpyModuleCodeGenerator(tree, self.optimize, stats,
+                                              analysis)
+                stats.stop()
+                code = gen.getCode()
+
+            if self.interning:
+                stats.start('intern')
+                interner = ptpyintern.CodeInterner()
+                code = interner.intern(code)
+                stats.stop()
+                stats.count('shared', interner.shared)
+            return code
+        finally:
+            stats.end()
+
+    def compile_file(self, filename, cache_dir=None):
+        """Compile the source file filename, through the cache in
+        cache_dir, see compile_file"""
+        def compile(source):
+            return self.compile(source, filename)
+
+        if cache_dir is False:
+            return compile(ptpycache.read_source(filename)[0])
+        return ptpycache.CodeCache(cache_dir).get(filename, self.options(),
+                                                  compile)
+
+    def is_cached(self, filename, cache_dir=None):
+        """Whether compile_file would load filename from the cache in
+        cache_dir without reading it"""
+        return ptpycache.CodeCache(cache_dir).fresh(filename, self.options())
+
+    def options(self):
+        """The options the code compiled depends on"""
+        return (self.dialect, self.optimize, self.lazy_blocks, self.backend,
+                self.interning)
+
+
+
+class PtpyCompilerPool(object):
+    """Compiles ptpy sources from any number of threads at once.
+
+    Each compile borrows an idle compiler from the pool, making a new
+    one when there is none, and gives it back when done. The compilers
+    share the lexer and parser tables, so a new one is cheap. With size
+    set, at most size compilers are made and compiles beyond that wait
+    for one to be given back.
+    """
+    def __init__(self, size=None, factory=PtpyCompiler):
+        self.size = size
+        self.factory = factory
+        self.created = 0
+        # most recently used first, as it's the likeliest to be warm
+        self._idle = Queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a compiler from the pool; give it back with release"""
+        try:
+            return self._idle.get_nowait()
+        except Queue.Empty:
+            pass
+        self._lock.acquire()
+        try:
+            full = self.size is not None and self.created >= self.size
+            if not full:
+                self.created += 1
+        finally:
+            self._lock.release()
+        if full:
+            return self._idle.get()
+        try:
+            return self.factory()
+        except:
+            self._lock.acquire()
+            self.created -= 1
+            self._lock.release()
+            raise
+
+    def release(self, compiler):
+        self._idle.put(compiler)
+
+    def compile(self, code, filename="<string>"):
+        """Same as PtpyCompiler.compile, safe to call from any thread"""
+        compiler = self.acquire()
+        try:
+            return compiler.compile(code, filename)
+        finally:
+            self.release(compiler)
+
+
+
+def compile_file(filename, cache_dir=None, lazy_blocks=False,
+                 dialect=ptpylexer.p_dialects.DEFAULT_DIALECT, optimize=1,
+                 backend=DEFAULT_BACKEND, interning=False):
+    """Return the code of the ptpy source file filename.
+
+    The code is kept in the p_cache.CodeCache in cache_dir, and loaded
+    from there while the source, the compiler and the options are the
+    same. With cache_dir False the file is just compiled.
+    """
+    compiler = PtpyCompiler(lazy_blocks, dialect, optimize,
+                            backend=backend, interning=interning)
+    return compiler.compile_file(filename, cache_dir)
+
+
+
+# Lazily parsed blocks
+
+# The code a definir block with an unparsed body compiles to. Run, it
+# gets the code of the body from compile_block and runs it in its own
+# namespaces, the same as running that code directly.
+_BLOCK_STUB = ("exec __import__('ptpy.p_compiler', None, None, ['compile_block']"
+               ").compile_block(%r, %r, %r, %i, %r, %i, %r)\n")
+
+
+def block_stub(node, optimize=0, backend=DEFAULT_BACKEND):
+    """Return the code standing for the definir block node, whose body
+    is a p_ast.Unparsed, until the body is compiled with the
+    optimisation level optimize by backend"""
+    body = node.code
+    stub = compile(_BLOCK_STUB % (node.name, body.text, node.filename,
+                                  body.lineno, body.dialect, optimize,
+                                  backend),
+                   node.filename, 'exec', 0, True)
+    # named and numbered as the block, for tracebacks
+    return types.CodeType(stub.co_argcount, stub.co_nlocals,
+                          stub.co_stacksize, stub.co_flags, stub.co_code,
+                          stub.co_consts, stub.co_names, stub.co_varnames,
+                          stub.co_filename, node.name, node.lineno,
+                          stub.co_lnotab)
+
+
+# Most block bodies compile_block keeps compiled
+BLOCK_CACHE_SIZE = 256
+
+# the bodies last compiled, by compile_block arguments
+_blocks = ptpycache.CompileCache(BLOCK_CACHE_SIZE)
+
+
+def compile_block(name, text, filename, lineno, dialect, optimize=0,
+                  backend=DEFAULT_BACKEND):
+    """Return the code of the body of block name, text being its source
+    starting on line lineno of filename. The blocks nested in it are
+    compiled along with it. The last BLOCK_CACHE_SIZE bodies compiled
+    are kept, and not compiled again while they are."""
+    key = _blocks.key(text, filename,
+                      (name, lineno, dialect, optimize, backend))
+    code = _blocks.get(key)
+    if code is not None:
         return code
 
+    # a header on the line before, so the body keeps its line numbers
+    keyword = [word for word, type in
+               ptpylexer.dialect_keywords(dialect).items()
+               if type == 'DEF'][0]
+    source = "\n" * (lineno - 2) + "%s %s:\n" % (keyword, name) + text
+    module = PtpyCompiler(dialect=dialect, optimize=optimize,
+                          backend=backend).compile(source, filename)
+    for code in module.co_consts:
+        if isinstance(code, types.CodeType) and code.co_name == name:
+            _blocks.put(key, code)
+            return code
+    raise AssertionError("no code for block %r" % name)
+
 
 
 def main():
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:21:50 2012"
+
+
+# Keyword tables of the languages ptpy programs can be written in.
+# Each maps a keyword to the token it stands for; everything else in
+# the grammar is the same for all of them. The lexer compiles each
+# dialect into its own tables the first time it's used, see
+# p_lexer.get_scanner and p_lexer.get_lexer.
+#
+# Sources are UTF-8. A dialect with non-ASCII keywords also gets
+# non-ASCII identifiers, the others reject any non-ASCII character
+# outside strings and comments.
+
+
+DIALECTS = {}
+
+DEFAULT_DIALECT = 'pt-PT'
+
+
+def register_dialect(name, keywords):
+    """Register the dialect name with the keyword table keywords,
+    mapping each keyword, unicode or UTF-8 str, to its token type"""
+    table = {}
+    for word, type in keywords.items():
+        if isinstance(word, unicode):
+            word = word.encode('utf-8')
+        table[word] = type
+    DIALECTS[name] = table
+
+
+PT_PT = {
+    'garantir': 'ASSERT',  # assert
+    'e': 'BAND',  # and
+    'continuar': 'CONTINUE',  # continue
+    'classe': 'CLASS',  # class
+    'importar': 'IMPORT',  # import
+    'executar': 'EXEC',  # exec
+    'global': 'GLOBAL',  # global
+    'ou': 'BOR',  # or
+    'enquanto': 'WHILE',  # while
+    'tentar': 'TRY',  # try
+    'em': 'IN',  # in
+    'para': 'FOR',  # for
+    'de': 'FROM',  # from
+
+    'sair': 'BREAK',  # break
+    'definir': 'DEF',  # def
+    'apagar': 'DEL',  # del
+    'finalizar': 'FINALLY',  # finally
+    'exibir': 'PRINT',  # print
+    'devolver': 'RETURN',  # return
+    'passar': 'PASS',  # pass
+
+    'exceto': 'EXCEPT',  # except
+    'lambda': 'LAMBDA',  # lambda
+
+    'raise': 'RAISE',  # raise
+
+    'se': 'IF',  # if
+    'ouse': 'ELIF',  # elif
+    'senao': 'ELSE',  # else
+
+    'is': 'IS',  # is
+    'nao': 'BNOT',  # not
+}
+
+# pt-PT, spelled with accents
+PT_BR = dict(PT_PT)
+del PT_BR['nao'], PT_BR['senao']
+PT_BR.update({
+    u'senão': 'ELSE',  # else
+    u'não': 'BNOT',  # not
+})
+
+EN = {
+    'assert': 'ASSERT',
+    'and': 'BAND',
+    'continue': 'CONTINUE',
+    'class': 'CLASS',
+    'import': 'IMPORT',
+    'exec': 'EXEC',
+    'global': 'GLOBAL',
+    'or': 'BOR',
+    'while': 'WHILE',
+    'try': 'TRY',
+    'in': 'IN',
+    'for': 'FOR',
+    'from': 'FROM',
+
+    'break': 'BREAK',
+    'def': 'DEF',
+    'del': 'DEL',
+    'finally': 'FINALLY',
+    'print': 'PRINT',
+    'return': 'RETURN',
+    'pass': 'PASS',
+
+    'except': 'EXCEPT',
+    'lambda': 'LAMBDA',
+
+    'raise': 'RAISE',
+
+    'if': 'IF',
+    'elif': 'ELIF',
+    'else': 'ELSE',
+
+    'is': 'IS',
+    'not': 'BNOT',
+}
+
+register_dialect('pt-PT', PT_PT)
+register_dialect('pt-BR', PT_BR)
+register_dialect('en', EN)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Import hook loading ptpy modules with the import statement:
+#
+#     import ptpy.p_import
+#     ptpy.p_import.install()
+#     import spam          # spam.ptpy, or spam/__init__.ptpy, on sys.path
+#
+# The finder goes through sys.path, or the package's __path__, in
+# order, leaving a name to the normal import when a Python module of
+# that name comes first. Directory listings are kept and read again
+# only when the directory's time changes, so the finder, asked about
+# every import, costs a stat per path entry.
+#
+# Modules are compiled by one PtpyCompiler, its parser staying warm
+# from one import to the next, through a p_cache.CodeCache in a
+# __ptpycache__ directory next to each source. The p_builtins names
+# are added to __builtin__ once, when the hook is installed, as a
+# __builtins__ of their own would make the modules run in restricted
+# mode.
+
+import __builtin__
+import imp
+import os
+import sys
+
+import ptpy.p_builtins as ptpybuiltins
+import ptpy.p_compiler as ptpycompiler
+import ptpy.p_lexer as ptpylexer
+
+
+SUFFIX = '.ptpy'
+
+CACHE_DIRNAME = '__ptpycache__'
+
+# what makes a name a Python module or package in a directory
+_PYTHON_SUFFIXES = [suffix for suffix, mode, type in imp.get_suffixes()]
+
+
+def _public(module):
+    return dict([(name, value) for name, value in vars(module).items()
+                 if not name.startswith('_')])
+
+
+def cache_directory(filename):
+    """The cache directory of the source file filename"""
+    return os.path.join(os.path.dirname(os.path.abspath(filename)),
+                        CACHE_DIRNAME)
+
+
+
+class PtpyLoader(object):
+    """Loads the module fullname from the source file filename, an
+    __init__ file when it's a package"""
+    def __init__(self, importer, fullname, filename, is_package):
+        self.importer = importer
+        self.fullname = fullname
+        self.filename = filename
+        self.ispackage = is_package
+
+    def get_filename(self, fullname):
+        return self.filename
+
+    def is_package(self, fullname):
+        return self.ispackage
+
+    def get_source(self, fullname):
+        f = open(self.filename, 'rU')
+        try:
+            return f.read()
+        finally:
+            f.close()
+
+    def get_code(self, fullname):
+        return self.importer.compile_file(self.filename)
+
+    def load_module(self, fullname):
+        code = self.get_code(fullname)
+        module = sys.modules.get(fullname)
+        new = module is None
+        if new:
+            module = sys.modules[fullname] = imp.new_module(fullname)
+        module.__file__ = self.filename
+        module.__loader__ = self
+        if self.ispackage:
+            module.__path__ = [os.path.dirname(self.filename)]
+            module.__package__ = fullname
+        else:
+            module.__package__ = fullname.rpartition('.')[0]
+        try:
+            exec code in module.__dict__
+        except:
+            if new:
+                del sys.modules[fullname]
+            raise
+        # the module may have put something else in its place
+        return sys.modules[fullname]
+
+
+
+class PtpyImporter(object):
+    """sys.meta_path finder of ptpy modules, compiling them with the
+    given options. With cache False, compiled code isn't cached."""
+    def __init__(self, lazy_blocks=False,
+                 dialect=ptpylexer.p_dialects.DEFAULT_DIALECT, optimize=1,
+                 cache=True, backend=ptpycompiler.DEFAULT_BACKEND,
+                 interning=False):
+        self.compiler = ptpycompiler.PtpyCompiler(lazy_blocks, dialect,
+                                                  optimize, backend=backend,
+                                                  interning=interning)
+        self.cache = cache
+        # {directory: (its time, the names in it)}
+        self._listings = {}
+
+    def compile_file(self, filename):
+        cache_dir = self.cache and cache_directory(filename)
+        return self.compiler.compile_file(filename, cache_dir)
+
+    def invalidate_caches(self):
+        """Forget the directory listings, for files added within the
+        resolution of the directory's time"""
+        self._listings.clear()
+
+    def _listing(self, directory):
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return ()
+        listing = self._listings.get(directory)
+        if listing is None or listing[0] != mtime:
+            try:
+                names = frozenset(os.listdir(directory))
+            except OSError:
+                names = frozenset()
+            listing = self._listings[directory] = mtime, names
+        return listing[1]
+
+    def find_module(self, fullname, path=None):
+        name = fullname.rpartition('.')[2]
+        if path is None:
+            path = sys.path
+        for entry in path:
+            if not isinstance(entry, basestring):
+                continue
+            directory = entry or os.curdir
+            names = self._listing(directory)
+            if not names:
+                continue
+            if name in names:
+                package = os.path.join(directory, name)
+                for suffix in _PYTHON_SUFFIXES:
+                    if os.path.isfile(os.path.join(package,
+                                                   '__init__' + suffix)):
+                        return None
+                init = os.path.join(package, '__init__' + SUFFIX)
+                if os.path.isfile(init):
+                    return PtpyLoader(self, fullname, init, True)
+            for suffix in _PYTHON_SUFFIXES:
+                if name + suffix in names:
+                    return None
+            if name + SUFFIX in names:
+                return PtpyLoader(self, fullname,
+                                  os.path.join(directory, name + SUFFIX),
+                                  False)
+        return None
+
+
+
+_installed = None
+_saved_builtins = {}
+
+
+def install(lazy_blocks=False, dialect=ptpylexer.p_dialects.DEFAULT_DIALECT,
+            optimize=1, cache=True, backend=ptpycompiler.DEFAULT_BACKEND,
+            interning=False):
+    """Put a PtpyImporter with the given options first in
+    sys.meta_path, replacing the one installed before, and return it"""
+    global _installed
+    uninstall()
+    for name, value in _public(ptpybuiltins).items():
+        _saved_builtins[name] = getattr(__builtin__, name, _saved_builtins)
+        setattr(__builtin__, name, value)
+    _installed = PtpyImporter(lazy_blocks, dialect, optimize, cache,
+                              backend, interning)
+    sys.meta_path.insert(0, _installed)
+    return _installed
+
+
+def uninstall():
+    """Take the installed PtpyImporter out of sys.meta_path. The ptpy
+    modules already imported stay in sys.modules."""
+    global _installed
+    if _installed is None:
+        return
+    if _installed in sys.meta_path:
+        sys.meta_path.remove(_installed)
+    for name, value in _saved_builtins.items():
+        if value is _saved_builtins:
+            delattr(__builtin__, name)
+        else:
+            setattr(__builtin__, name, value)
+    _saved_builtins.clear()
+    _installed = None
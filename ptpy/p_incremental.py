@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:21:50 2012"
+
+
+# Incremental lexing for editors and the REPL. The source and its
+# tokens are kept as segments starting after each run of newlines,
+# each with its text, tokens and the fused scanner's state at its
+# start. An edit re-scans from the segment it falls in, and stops as
+# soon as the scan reaches an old segment start with the same state,
+# since everything after that is the same tokens, moved by the edit.
+#
+# So that moving them costs nothing, segments before the gap (the
+# place of the last edit) store absolute positions and the ones after
+# it positions relative to the end of the source. Only the segments
+# between the last edit and the next one are converted.
+
+import p_dialects
+import p_lexer
+
+from ply.lex import LexToken
+
+
+# Segment fields
+POS, LINENO, FIRST, STATE, TOKENS, TEXT = range(6)
+
+
+def _relative_state(pos, state):
+    # The scanner state with positions made relative to pos, so two
+    # states at different positions compare equal when the scan would
+    # go on the same way from both
+    (lineno, paren_count, at_line_start, indent, levels, depth,
+     last_lineno, tok_lineno, tok_lexpos) = state
+    if last_lineno is not None:
+        last_lineno -= lineno
+    if tok_lexpos != -1:
+        tok_lexpos -= pos
+    else:
+        tok_lexpos = None
+    return (paren_count, at_line_start, indent, levels, depth,
+            last_lineno, tok_lineno - lineno, tok_lexpos)
+
+
+def _absolute_state(pos, lineno, state):
+    (paren_count, at_line_start, indent, levels, depth,
+     last_lineno, tok_lineno, tok_lexpos) = state
+    if last_lineno is not None:
+        last_lineno += lineno
+    if tok_lexpos is not None:
+        tok_lexpos += pos
+    else:
+        tok_lexpos = -1
+    return (lineno, paren_count, at_line_start, indent, levels, depth,
+            last_lineno, tok_lineno + lineno, tok_lexpos)
+
+
+def _make_token(type, value, lineno, lexpos):
+    tok = LexToken()
+    tok.type = type
+    tok.value = value
+    tok.lineno = lineno
+    tok.lexpos = lexpos
+    return tok
+
+
+class IncrementalLexer(object):
+    """Token stream of a source that is edited in place.
+
+    edit() takes the same edits an editor makes and returns which
+    tokens changed, re-scanning only the lines the edit affects. The
+    tokens are the same the fused engine gives for the whole source.
+
+    If an edit leaves the source with a lexical error, edit() raises
+    it and the next edit re-scans the whole source. Until then the
+    tokens can't be read, and reading them raises the error again.
+    """
+
+    def __init__(self, data='', reflags=0,
+                 dialect=p_dialects.DEFAULT_DIALECT):
+        self.scanner = p_lexer.get_scanner(reflags, dialect)
+        self.ntokens = 0
+        self.reset(data)
+
+    def reset(self, data):
+        """Replace the whole source, returning its tokens"""
+        self.segments = None
+        self.source = data
+        self.length = len(data)
+        self.segments, _, tokens = self._scan(
+            [(data, 0)], 0, 0, p_lexer.INITIAL_STATE, None, len(data))
+        self.source = None
+        self.gap = len(self.segments)
+        self.nlines = data.count('\n')
+        self.ntokens = len(tokens)
+        return tokens
+
+    @property
+    def text(self):
+        """The current source"""
+        if self.segments is None:
+            return self.source
+        return ''.join([segment[TEXT] for segment in self.segments])
+
+    def edit(self, offset, deleted, inserted):
+        """Replace deleted characters at offset with inserted.
+
+        Returns (start, end, tokens): tokens[start:end] of the old
+        stream were replaced by these new tokens. The tokens after them
+        are the same, moved by the edit.
+        """
+        length = self.length
+        if offset < 0 or deleted < 0 or offset + deleted > length:
+            raise ValueError("edit out of range")
+
+        if self.segments is None:
+            text = self.source
+            return (0, self.ntokens,
+                    self.reset(text[:offset] + inserted +
+                               text[offset+deleted:]))
+
+        # Resume from the last segment starting before the edit, since
+        # an edit at a segment start can join the newlines before it
+        segments = self.segments
+        k = self._find(offset) if offset else 0
+        self._move_gap(k)
+        m = max(k, self._find(offset + deleted)) + 1
+
+        segment = segments[k]
+        pos = segment[POS] + length
+        lineno = segment[LINENO] + self.nlines
+        first = segment[FIRST] + self.ntokens
+        state = _absolute_state(pos, lineno, segment[STATE])
+
+        # The edited segments, joined with the ones after them until
+        # the text ends in a newline again, so no token is split
+        old = ''.join([segment[TEXT] for segment in segments[k:m]])
+        chunk = old[:offset-pos] + inserted + old[offset+deleted-pos:]
+        while m < len(segments) and not chunk.endswith('\n'):
+            chunk += segments[m][TEXT]
+            m += 1
+
+        new_length = length + len(inserted) - deleted
+        def chunks():
+            yield chunk, pos
+            for i in xrange(m, len(segments)):
+                yield segments[i][TEXT], segments[i][POS] + new_length
+
+        try:
+            new_segments, j, tokens = self._scan(chunks(), pos, first,
+                                                 state, m, new_length)
+        except (SyntaxError, IndentationError):
+            text = self.text
+            self.source = text[:offset] + inserted + text[offset+deleted:]
+            self.segments = None
+            self.length = new_length
+            raise
+
+        if j is None:
+            j = len(segments)
+            end = self.ntokens
+        else:
+            end = segments[j][FIRST] + self.ntokens
+
+        segments[k:j] = new_segments
+        self.gap = k + len(new_segments)
+        self.length = new_length
+        self.nlines += inserted.count('\n') - old.count(
+            '\n', offset-pos, offset+deleted-pos)
+        self.ntokens += len(tokens) - (end - first)
+        return (first, end, tokens)
+
+    def _find(self, offset):
+        # index of the last segment starting before offset
+        segments = self.segments
+        gap = self.gap
+        length = self.length
+        lo, hi = 0, len(segments)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = segments[mid][POS]
+            if mid >= gap:
+                pos += length
+            if pos < offset:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def _move_gap(self, k):
+        segments = self.segments
+        length, nlines, ntokens = self.length, self.nlines, self.ntokens
+        if k < self.gap:
+            for segment in segments[k:self.gap]:
+                segment[POS] -= length
+                segment[LINENO] -= nlines
+                segment[FIRST] -= ntokens
+        else:
+            for segment in segments[self.gap:k]:
+                segment[POS] += length
+                segment[LINENO] += nlines
+                segment[FIRST] += ntokens
+        self.gap = k
+
+    def _scan(self, chunks, pos, first, state, j, length):
+        """Scan chunks, a sequence of (text, pos) pieces of the source
+        ending in newlines, from pos and the state there. Returns the
+        new segments, the index of the old segment the scan resynced
+        with (None if it reached the end) and the new tokens.
+
+        Resyncing is tried with the old segments from j on, the ones
+        after the gap, length being the new length of the source.
+        """
+        segments = self.segments
+        new_segments = []
+        tokens = []
+        resync = [None, j]
+        current = []
+        # the chunks holding the current segment's text, which only
+        # spans more than one when a triple-quoted string does
+        window = []
+
+        def windows():
+            for data, offset in chunks:
+                window.append((data, offset))
+                yield data, offset, 0, len(data)
+
+        def start_segment(pos, state):
+            lineno = state[0]
+            segment = [pos, lineno, first + len(tokens),
+                       _relative_state(pos, state), [], None]
+            new_segments.append(segment)
+            current[:] = pos, lineno, segment[TOKENS].append
+
+        def end_segment(pos):
+            start = current[0]
+            if len(window) > 1:
+                text = ''.join([data[max(start-offset, 0):pos-offset]
+                                for data, offset in window])
+                del window[:-1]
+            else:
+                data, offset = window[0]
+                text = data[start-offset:pos-offset]
+            new_segments[-1][TEXT] = text
+
+        def new_token(type, value, lineno, lexpos, size=0):
+            tok = _make_token(type, value, lineno, lexpos)
+            tokens.append(tok)
+            # INDENT and DEDENT have no position (-1), and an ENDMARKER
+            # after them the fixed position 0, which don't move
+            moves = lexpos > 0
+            if moves:
+                lexpos -= current[0]
+            current[2]((type, value, lineno - current[1], lexpos, moves))
+
+        def checkpoint(pos, state):
+            end_segment(pos)
+            if j is not None:
+                rel_pos = pos - length
+                i = resync[1]
+                while i < len(segments) and segments[i][POS] < rel_pos:
+                    i += 1
+                resync[1] = i
+                if i < len(segments) and segments[i][POS] == rel_pos and \
+                        segments[i][STATE] == _relative_state(pos, state):
+                    resync[0] = i
+                    return True
+            start_segment(pos, state)
+
+        start_segment(pos, state)
+        for _ in p_lexer.fused_scan(windows(), self.scanner, True, new_token,
+                                    state, checkpoint):
+            pass
+        if resync[0] is None:
+            data, offset = window[-1]
+            end_segment(offset + len(data))
+
+        return new_segments, resync[0], tokens
+
+    def __len__(self):
+        return self.ntokens
+
+    def __iter__(self):
+        if self.segments is None:
+            # the last edit left an error, scan the source for it
+            self.reset(self.source)
+        length, nlines = self.length, self.nlines
+        for i, segment in enumerate(self.segments):
+            pos, lineno = segment[POS], segment[LINENO]
+            if i >= self.gap:
+                pos += length
+                lineno += nlines
+            for type, value, line, lexpos, moves in segment[TOKENS]:
+                if moves:
+                    lexpos += pos
+                yield _make_token(type, value, lineno + line, lexpos)
+
+    def tokens(self):
+        """All the tokens of the current source"""
+        return list(self)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Sharing of what the code objects of a module have in common, run by
+# PtpyCompiler with interning on. Each block is a code object of its
+# own, with its own constants, and generated sources repeat the same
+# strings, numbers and whole block bodies many times over:
+#
+# - strings, the constants and the names, bytecode and line tables of
+#   the code, are interned, so each is kept once and marshal writes
+#   each once, referring back to it after that
+# - other constants equal in type and value, such as tuples, floats
+#   and unicode, are one object
+# - code objects with the same body are one object, whatever their
+#   name and first line: a block sharing another's code shows the
+#   other's name and line in tracebacks
+#
+# Code loaded back by marshal only keeps the strings shared.
+
+import types
+
+
+class CodeInterner(object):
+    """Shares the constants and code of the code objects given to
+    intern. shared counts the objects replaced by an equal one."""
+    def __init__(self):
+        # {key: object}
+        self._objects = {}
+        self.shared = 0
+
+    def _key(self, value):
+        # constants with the same key are the same constant
+        kind = type(value)
+        if kind in (float, complex):
+            # repr tells 0.0 from -0.0
+            return kind, repr(value)
+        if kind is tuple:
+            return kind, tuple([self._key(item) for item in value])
+        if kind in (str, unicode, int, long, bool) or value is None:
+            return kind, value
+        return kind, id(value)
+
+    def _const(self, value):
+        # the key of the constant value, and the object standing for it
+        if type(value) is types.CodeType:
+            value = self.intern(value)
+            return (types.CodeType, id(value)), value
+        key = self._key(value)
+        if key in self._objects:
+            shared = self._objects[key]
+            if shared is not value:
+                self.shared += 1
+            return key, shared
+        if type(value) is str:
+            value = intern(value)
+        elif type(value) is tuple:
+            value = tuple([self._const(item)[1] for item in value])
+        self._objects[key] = value
+        return key, value
+
+    def intern(self, code):
+        """code, with its constants, names and nested code shared with
+        the ones seen before"""
+        consts = [self._const(const) for const in code.co_consts]
+        names, varnames, freevars, cellvars = [
+            tuple([intern(name) for name in names])
+            for names in (code.co_names, code.co_varnames,
+                          code.co_freevars, code.co_cellvars)]
+        key = (types.CodeType, code.co_argcount, code.co_nlocals,
+               code.co_stacksize, code.co_flags, code.co_code,
+               tuple([const[0] for const in consts]), names, varnames,
+               code.co_filename, code.co_lnotab, freevars, cellvars)
+        shared = self._objects.get(key)
+        if shared is not None:
+            self.shared += 1
+            return shared
+        return self._objects.setdefault(key, types.CodeType(
+            code.co_argcount, code.co_nlocals, code.co_stacksize,
+            code.co_flags, intern(code.co_code),
+            tuple([const[1] for const in consts]), names, varnames,
+            intern(code.co_filename), intern(code.co_name),
+            code.co_firstlineno, intern(code.co_lnotab), freevars,
+            cellvars))
+
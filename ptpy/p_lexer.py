@@ -7,53 +7,35 @@ __author__ = "Pedro Werneck (pjwerneck@gmail.com)"
 __date__ = "Sat Sep 29 00:21:50 2012"
 
 
+import collections
+import mmap
 import re
+import sys
+import types
 
-import ply.lex as lex
-
-
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
 
-# Reserved words
-RESERVED = {
-    'garantir': 'ASSERT',  # assert
-    'e': 'BAND',  # and
-    'continuar': 'CONTINUE',  # continue
-    'classe': 'CLASS',  # class
-    'importar': 'IMPORT',  # import
-    'executar': 'EXEC',  # exec
-    'global': 'GLOBAL',  # global
-    'ou': 'BOR',  # or
-    'enquanto': 'WHILE',  # while
-    'tentar': 'TRY',  # try
-    'em': 'IN',  # in
-    'para': 'FOR',  # for
-    'de': 'FROM',  # from
+import ply.lex as lex
 
-    'sair': 'BREAK',  # break
-    'definir': 'DEF',  # def
-    'apagar': 'DEL',  # del
-    'finalizar': 'FINALLY',  # finally
-    'exibir': 'PRINT',  # print
-    'devolver': 'RETURN',  # return
-    'passar': 'PASS',  # pass
+import p_dialects
+import p_tokens
 
-    'exceto': 'EXCEPT',  # except
-    'lambda': 'LAMBDA',  # lambda
 
-    'raise': 'RAISE',  # raise
+# Pre-generated lexer table shipped with the package, see p_tables
+LEXTAB = 'ptpy.lextab'
 
-    'se': 'IF',  # if
-    'ouse': 'ELIF',  # elif
-    'senao': 'ELSE',  # else
 
-    'is': 'IS',  # is
-    'nao': 'BNOT',  # not
-}
+# Reserved words of the default dialect, see p_dialects
+RESERVED = p_dialects.DIALECTS[p_dialects.DEFAULT_DIALECT]
 
 
 
-# List of token names.   This is always required
-tokens = RESERVED.values() + [
+# List of token names.   This is always required. Reserved words are
+# sorted so the table signatures don't depend on dict ordering
+tokens = sorted(RESERVED.values()) + [
     # literals, identifies, constants
     'NAME',
     'ICONST',
@@ -117,6 +99,9 @@ tokens = RESERVED.values() + [
     'INDENT',
     'DEDENT',
     'ENDMARKER',
+
+    # a block body skipped by block_skipping_filter
+    'BLOCK',
 ]
 
 
@@ -126,8 +111,7 @@ t_ICONST = r'\d+([uU]|[lL]|[uU][lL]|[lL][uU])?'
 # floating literal
 t_FCONST = r'((\d+)(\.\d+)(e(\+|-)?(\d+))? | (\d+)e(\+|-)?(\d+))([lL]|[fF])?'
 
-# string literal
-#t_SCONST = r'\"([^\\\n]|(\\.))*?\"'
+# string literal, see t_SCONST
 
 # delimiters
 t_COLON = r':'
@@ -177,7 +161,9 @@ t_IN = r'in'
 
 # Error handling rule
 def t_error(t):
-    raise SyntaxError("Illegal character %r, (%i, %i)" % (t.value[0], t.lineno, t.lexpos))
+    column = t.lexer.line_index.column(t.lineno, t.lexpos)
+    raise SyntaxError("Illegal character %r at line %i, column %i" %
+                      (t.value[0], t.lineno, column))
 
     t.lexer.skip(1)
 
@@ -189,9 +175,68 @@ def t_COMMENT(t):
     r"[ ]*\043[^\n]*"  # \043 is '#'
 
 
+# String literals, single or triple-quoted with " or ', and raw with
+# an r prefix. The patterns are unrolled, so the regex engine runs over
+# the text between quotes and backslashes in one step and never
+# backtracks, taking linear time however long the literal is.
+_TRIPLE_STRING = r'%(q)s%(q)s%(q)s[^%(q)s\\]*(?:(?:\\(?:.|\n)|%(q)s(?!%(q)s%(q)s))[^%(q)s\\]*)*%(q)s%(q)s%(q)s'
+_SINGLE_STRING = r'%(q)s(?!%(q)s%(q)s)[^%(q)s\\\n]*(?:\\.[^%(q)s\\\n]*)*%(q)s'
+
+# The last two alternatives only match the opening quotes of a
+# triple-quoted string that isn't closed, see open_string
+STRING = r'[rR]?(?:%s)' % '|'.join([_TRIPLE_STRING % {'q': '"'},
+                                    _TRIPLE_STRING % {'q': "'"},
+                                    _SINGLE_STRING % {'q': '"'},
+                                    _SINGLE_STRING % {'q': "'"},
+                                    '"""', "'''"])
+
+# Literals up to this size are interned, since the same keys and
+# words tend to repeat all over a source
+SHORT_STRING = 32
+
+
+def open_string(text):
+    """True if a SCONST token's text is just the opening quotes of a
+    triple-quoted string"""
+    return len(text) < 6 and text[-3:] in ('"""', "'''")
+
+
+def string_lines(line_starts, text, lexpos):
+    """Add the lines starting inside a string literal at lexpos to
+    line_starts, returning where the last one starts"""
+    i = text.find('\n')
+    while i >= 0:
+        line_starts.append(lexpos + i + 1)
+        i = text.find('\n', i + 1)
+    return line_starts[-1]
+
+
+def string_value(text):
+    """Value of a string literal from its text in the source"""
+    raw = text[0] in 'rR'
+    if raw:
+        text = text[1:]
+    if len(text) >= 6 and text[:3] in ('"""', "'''"):
+        value = text[3:-3]
+    else:
+        value = text[1:-1]
+    if not raw and '\\' in value:
+        value = value.decode("string-escape")
+    if len(value) <= SHORT_STRING and type(value) is str:
+        value = intern(value)
+    return value
+
+
+@lex.TOKEN(STRING)
 def t_SCONST(t):
-    r'\"([^\\\n]|(\\.))*?\"'
-    t.value = t.value[1:-1].decode("string-escape")
+    if open_string(t.value):
+        column = t.lexer.line_index.column(t.lineno, t.lexpos)
+        raise SyntaxError("EOF while scanning triple-quoted string "
+                          "at line %i, column %i" % (t.lineno, column))
+    if '\n' in t.value:
+        t.lexer.lineno += t.value.count('\n')
+        string_lines(t.lexer.line_index.starts, t.value, t.lexpos)
+    t.value = string_value(t.value)
     return t
 
 # whitespace
@@ -205,6 +250,8 @@ def t_WS(t):
 def t_NEWLINE(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
+    t.lexer.line_index.starts.extend(xrange(t.lexpos + 1,
+                                            t.lexpos + len(t.value) + 1))
     t.type = "NEWLINE"
     try:
         if t.lexer.paren_count == 0:
@@ -213,13 +260,39 @@ def t_NEWLINE(t):
         return t
 
 
-# identifiers
+# identifiers. The lexer's keywords are the table of its dialect
 def t_NAME(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'
-    t.type = RESERVED.get(t.value, "NAME")
+    t.type = t.lexer.keywords.get(t.value, "NAME")
     return t
 
 
+# t_NAME of the dialects with non-ASCII identifiers, see _rules
+UNICODE_NAME = r'[a-zA-Z_\x80-\xff][a-zA-Z0-9_\x80-\xff]*'
+
+@lex.TOKEN(UNICODE_NAME)
+def _t_unicode_NAME(t):
+    if _non_ascii(t.value) and not is_identifier(t.value):
+        column = t.lexer.line_index.column(t.lineno, t.lexpos)
+        raise SyntaxError("invalid identifier %r at line %i, column %i" %
+                          (t.value, t.lineno, column))
+    t.type = t.lexer.keywords.get(t.value, "NAME")
+    return t
+
+
+_non_ascii = re.compile(r'[\x80-\xff]').search
+
+_identifier = re.compile(r'[^\W\d]\w*$', re.UNICODE).match
+
+
+def is_identifier(name):
+    """Whether the UTF-8 str name is a valid identifier"""
+    try:
+        return _identifier(name.decode('utf-8')) is not None
+    except UnicodeDecodeError:
+        return False
+
+
 # parenthesis
 def t_LPAREN(t):
     r'\('
@@ -319,6 +392,11 @@ def track_tokens_filter(lexer, tokens):
         yield token
         lexer.at_line_start = at_line_start
 
+    # The source doesn't have to end with a newline, but the parser
+    # needs the NEWLINE closing the last statement
+    if not at_line_start:
+        yield _end_newline(lexer.lineno, lexer.lexlen)
+
 
 def _new_token(type, lineno, lexpos=-1):
     tok = lex.LexToken()
@@ -329,6 +407,14 @@ def _new_token(type, lineno, lexpos=-1):
     return tok
 
 
+def _end_newline(lineno, lexpos):
+    tok = _new_token("NEWLINE", lineno, lexpos)
+    tok.value = "\n"
+    tok.at_line_start = False
+    tok.must_indent = False
+    return tok
+
+
 def _add_endmarker(token_stream):
     "Put a sentinel marker at the end of the token_stream"
     tok = None
@@ -336,9 +422,11 @@ def _add_endmarker(token_stream):
         yield tok
     if tok is not None:
         lineno = tok.lineno
+        lexpos = tok.lexpos + 1
     else:
         lineno = 1
-    yield _new_token("ENDMARKER", lineno, tok.lexpos+1)
+        lexpos = 0
+    yield _new_token("ENDMARKER", lineno, lexpos)
 
 
 # Synthesize a DEDENT tag
@@ -386,7 +474,8 @@ def indentation_filter(tokens):
         if token.must_indent:
             # The current depth must be larger than the previous level
             if not (depth > levels[-1]):
-                raise IndentationError("expected an indented block")
+                raise IndentationError("expected an indented block "
+                                       "at line %i" % token.lineno)
 
             levels.append(depth)
             yield INDENT(token.lineno)
@@ -397,13 +486,15 @@ def indentation_filter(tokens):
                 # At the same level
                 pass
             elif depth > levels[-1]:
-                raise IndentationError("indentation increase but not in new block")
+                raise IndentationError("indentation increase but not in "
+                                       "new block at line %i" % token.lineno)
             else:
                 # Back up; but only if it matches a previous level
                 try:
                     i = levels.index(depth)
                 except ValueError:
-                    raise IndentationError("inconsistent indentation")
+                    raise IndentationError("inconsistent indentation "
+                                           "at line %i" % token.lineno)
                 for _ in range(i+1, len(levels)):
                     yield DEDENT(token.lineno)
                     levels.pop()
@@ -417,26 +508,659 @@ def indentation_filter(tokens):
             yield DEDENT(token.lineno)
 
 
+_OPENING = ('LPAREN', 'LBRACKET', 'LBRACE')
+_CLOSING = ('RPAREN', 'RBRACKET', 'RBRACE')
+
+def block_skipping_filter(tokens, source):
+    """Replace the indented body of every definir block with a BLOCK
+    token holding its source text, from the start of its first line to
+    the start of the line of the first token after it. Bodies on the
+    same line as their header are kept."""
+    tokens = iter(tokens)
+    # tokens read past a body, handed out again before the rest
+    pending = collections.deque()
+
+    def take():
+        if pending:
+            return pending.popleft()
+        return next(tokens, None)
+
+    while True:
+        token = take()
+        if token is None:
+            return
+        yield token
+        if token.type != 'DEF':
+            continue
+
+        # the header: the wrapper expression, if any, the name and the
+        # colon ending it
+        depth = 0
+        while True:
+            token = take()
+            if token is None:
+                return
+            yield token
+            if token.type in _OPENING:
+                depth += 1
+            elif token.type in _CLOSING:
+                depth -= 1
+            elif token.type == 'COLON' and depth == 0:
+                break
+
+        newline = take()
+        indent = newline is not None and take()
+        if not indent or (newline.type, indent.type) != ('NEWLINE', 'INDENT'):
+            pending.extend(t for t in (newline, indent) if t)
+            continue
+
+        first = None
+        level = 1
+        while level:
+            token = take()
+            if token is None:
+                return
+            if first is None and token.lexpos >= 0:
+                first = token
+            if token.type == 'INDENT':
+                level += 1
+            elif token.type == 'DEDENT':
+                level -= 1
+
+        # INDENT and DEDENT have no position, the block ends where the
+        # next token with one starts its line
+        end = len(source)
+        after = []
+        token = take()
+        while token is not None:
+            after.append(token)
+            if token.lexpos >= 0 and token.type != 'ENDMARKER':
+                end = source.rfind('\n', 0, token.lexpos) + 1
+                break
+            token = take()
+        pending.extendleft(reversed(after))
+
+        start = source.rfind('\n', 0, first.lexpos) + 1
+        block = _new_token('BLOCK', first.lineno, start)
+        block.value = source[start:end]
+        yield block
+
+
+
+## The fused engine does the same job as PLY's lexer and the three
+# filters above in a single loop over the source. Tokens are matched
+# by one master regex built from the same t_* rules, and the colon /
+# newline tracking and INDENT / DEDENT synthesis are done inline, so
+# the token stream is identical but each token is only touched once.
+
+# Rule names that get their own group in the fused master regex, in
+# the same order PLY tries them. Every other rule is a plain operator
+# or bracket, matched by the OP group and typed by its text.
+_FUSED_RULES = ['COMMENT', 'SCONST', 'WS', 'NEWLINE', 'NAME',
+                'FCONST', 'ICONST']
+
+# Rules that don't produce a token for the parser by themselves
+_TRIVIA = ['COMMENT', 'WS', 'NEWLINE']
+
+_BRACKETS = ['LPAREN', 'RPAREN', 'LBRACKET', 'RBRACKET',
+             'LBRACE', 'RBRACE']
+
+# Fused scanners, one per (reflags, dialect). Threads racing to build
+# the same one all get the first one stored
+_scanners = {}
+
+
+def _rule_pattern(name):
+    rule = globals()['t_' + name]
+    if callable(rule):
+        return rule.__doc__
+    return rule
+
+
+def _literal_trie(words):
+    """Regex matching the longest of words at a position, factored on
+    common prefixes so the regex engine doesn't try them one by one"""
+    heads = {}
+    for word in words:
+        heads.setdefault(word[0], []).append(word[1:])
+    branches = []
+    for head in sorted(heads):
+        tails = [tail for tail in heads[head] if tail]
+        if not tails:
+            branches.append(re.escape(head))
+            continue
+        optional = len(tails) < len(heads[head])
+        branches.append("%s(?:%s)%s" % (re.escape(head), _literal_trie(tails),
+                                        optional and '?' or ''))
+    return "|".join(branches)
+
+
+def dialect_keywords(dialect):
+    """Return the keyword table of dialect, checking it only uses
+    tokens the grammar knows"""
+    try:
+        keywords = p_dialects.DIALECTS[dialect]
+    except KeyError:
+        raise ValueError("unknown dialect %r" % dialect)
+    unknown = set(keywords.values()).difference(tokens)
+    if unknown:
+        raise ValueError("dialect %r has unknown tokens %s" %
+                         (dialect, ', '.join(sorted(unknown))))
+    return keywords
+
+
+def is_wide(keywords):
+    """Whether a keyword table needs non-ASCII identifiers"""
+    for word in keywords:
+        if _non_ascii(word):
+            return True
+    return False
+
+
+def get_scanner(reflags=0, dialect=p_dialects.DEFAULT_DIALECT):
+    """Return the (finditer, operators, keywords, wide_finditer)
+    scanner used by fused_scan.
+
+    wide_finditer is None for ASCII dialects. For the others it scans
+    the windows with non-ASCII characters, the rest being scanned by
+    finditer, the same as for an ASCII dialect.
+    """
+    try:
+        return _scanners[reflags, dialect]
+    except KeyError:
+        pass
+    keywords = dialect_keywords(dialect)
+
+    # PLY tries function rules in definition order and then string
+    # rules from the longest regex to the shortest. For plain operators
+    # that's the same as taking the longest one matching, since a
+    # literal's regex is always longer than the regex of its prefixes.
+    operators = {}
+    for name, rule in globals().items():
+        if name.startswith('t_') and isinstance(rule, basestring) \
+                and name[2:] not in _FUSED_RULES:
+            operators[re.sub(r'\\(.)', r'\1', rule)] = name[2:]
+    for name in _BRACKETS:
+        operators[re.sub(r'\\(.)', r'\1', _rule_pattern(name))] = name
+
+    def master(wide):
+        # Spaces after a real token are always discarded, so they're
+        # swallowed by the same match instead of costing one of their
+        # own
+        groups = []
+        for name in _FUSED_RULES:
+            pattern = _rule_pattern(name)
+            if name == 'NAME' and wide:
+                # names with non-ASCII characters are matched apart,
+                # since only they have to be checked. The lookahead
+                # keeps NAME from matching just their ASCII start
+                groups.append(r"(?P<NAME>%s(?![\w\x80-\xff]))[ ]*|"
+                              r"(?P<UNAME>%s)[ ]*" % (pattern, UNICODE_NAME))
+            elif name in _TRIVIA:
+                groups.append("(?P<%s>%s)" % (name, pattern))
+            else:
+                groups.append("(?P<%s>%s)[ ]*" % (name, pattern))
+        groups.append("(?P<OP>%s)[ ]*" % _literal_trie(operators))
+        return re.compile("|".join(groups), reflags | re.VERBOSE).finditer
+
+    wide_finditer = None
+    if is_wide(keywords):
+        wide_finditer = master(True)
+    scanner = (master(False), operators, keywords, wide_finditer)
+    return _scanners.setdefault((reflags, dialect), scanner)
+
+
+def make_token(type, value, lineno, lexpos, size=0):
+    """Default token factory for fused_scan"""
+    tok = lex.LexToken()
+    tok.type = type
+    tok.value = value
+    tok.lineno = lineno
+    tok.lexpos = lexpos
+    return tok
+
+
+# Scanner state at the start of a source:
+# (lineno, paren_count, at_line_start, indent, levels, depth,
+#  last_lineno, tok_lineno, tok_lexpos)
+INITIAL_STATE = (1, 0, True, NO_INDENT, (0,), 0, None, 1, -1)
+
+
+def fused_scan(windows, scanner, add_endmarker=True, new_token=make_token,
+               state=INITIAL_STATE, checkpoint=None, line_starts=None):
+    """Generate the same tokens as the PLY engine in one pass.
+
+    windows is a sequence of (buffer, offset, start, end) slices
+    covering the source, as made by source_windows, ending after a
+    newline. Only a triple-quoted string can run over the end of a
+    window. The windows after it are only searched for its closing
+    quotes, and the string is scanned once they show up. Tokens are
+    made by calling
+    new_token(type, value, lineno, lexpos, size), size being the
+    length of the token's text in the source.
+
+    To resume a scan in the middle of a source, pass the state saved
+    for that position. If given, checkpoint(pos, state) is called
+    after every run of newlines with the position and state the scan
+    could be resumed from, and stops the scan by returning True.
+
+    If line_starts is given, the offset where each line after the
+    first starts is appended to it, as in p_tokens.LineIndex.
+    """
+    ascii_finditer, operators, keywords, wide_finditer = scanner
+
+    (lineno, paren_count, at_line_start, indent, levels, depth,
+     last_lineno, tok_lineno, tok_lexpos) = state
+    levels = list(levels)
+    lexpos = 0
+
+    # at_line_start and indent are track_tokens_filter's state, levels
+    # and depth indentation_filter's. last_lineno is the line of the
+    # last token seen by the filters, for trailing DEDENTs, tok_lineno
+    # and tok_lexpos the position of the last token generated, for the
+    # ENDMARKER.
+
+    # pieces of a triple-quoted string left open at the end of a
+    # window, their total size, and the quotes that close it
+    carry = None
+    carry_size = 0
+    quotes = None
+    # where the current line starts, for error columns. A scan always
+    # starts or resumes at the start of a line
+    line_start = None
+
+    for data, offset, pos, end in windows:
+        if line_start is None:
+            line_start = offset + pos
+        if carry is not None:
+            piece = data[pos:end]
+            # a window ends after a newline, so the quotes can't be
+            # split between two
+            if piece.find(quotes) < 0:
+                carry.append(piece)
+                carry_size += len(piece)
+                lexpos = offset + end
+                continue
+            carry.append(piece)
+            data = ''.join(carry)
+            offset += end - len(data)
+            pos, end = 0, len(data)
+            carry = None
+        # windows with only ASCII need no identifier checks
+        if wide_finditer is not None and _non_ascii(data, pos, end):
+            finditer = wide_finditer
+        else:
+            finditer = ascii_finditer
+
+        for m in finditer(data, pos, end):
+            start = pos
+            if m.start() != start:
+                # finditer skipped over something no rule matches
+                break
+            kind = m.lastgroup
+            value = m.group(kind)
+            pos = m.end()
+
+            if kind == 'NAME':
+                type = keywords.get(value, 'NAME')
+
+            elif kind == 'OP':
+                type = operators[value]
+                if type == 'LPAREN':
+                    paren_count += 1
+                elif type == 'RPAREN':
+                    paren_count -= 1
+
+            elif kind == 'NEWLINE':
+                token_lineno = lineno
+                lineno += len(value)
+                line_start = offset + pos
+                if line_starts is not None:
+                    line_starts.extend(xrange(offset + start + 1,
+                                              line_start + 1))
+                if paren_count == 0:
+                    last_lineno = token_lineno
+                    depth = 0
+                    if indent == MAY_INDENT:
+                        indent = MUST_INDENT
+                    # nothing to yield for a blank line
+                    if not at_line_start:
+                        at_line_start = True
+                        tok_lineno = token_lineno
+                        tok_lexpos = offset + start
+                        yield new_token('NEWLINE', value, token_lineno,
+                                        tok_lexpos, len(value))
+                if checkpoint is not None and checkpoint(
+                        offset + pos,
+                        (lineno, paren_count, at_line_start, indent,
+                         tuple(levels), depth, last_lineno, tok_lineno,
+                         tok_lexpos)):
+                    return
+                continue
+
+            elif kind == 'WS':
+                if at_line_start and paren_count == 0:
+                    last_lineno = lineno
+                    depth = len(value)
+                continue
+
+            elif kind == 'COMMENT':
+                continue
+
+            elif kind == 'UNAME':
+                if not is_identifier(value):
+                    raise SyntaxError(
+                        "invalid identifier %r at line %i, column %i" %
+                        (value, lineno, offset + start - line_start))
+                type = keywords.get(value, 'NAME')
+
+            elif kind == 'SCONST':
+                if open_string(value):
+                    # scan it again once it's closed
+                    carry = [data[start:end]]
+                    carry_size = end - start
+                    quotes = value[-3:]
+                    pos = end
+                    break
+                type = kind
+
+            else:
+                type = kind
+
+            # a real token
+            size = len(value)
+            last_lineno = tok_lineno = lineno
+            tok_lexpos = offset + start
+            if type == 'SCONST':
+                # the token is on the line the string starts
+                if '\n' in value:
+                    lineno += value.count('\n')
+                    if line_starts is not None:
+                        line_start = string_lines(line_starts, value,
+                                                  tok_lexpos)
+                    else:
+                        line_start = tok_lexpos + value.rfind('\n') + 1
+                value = string_value(value)
+
+            if indent == NO_INDENT and not at_line_start:
+                # the common case, nothing to track
+                if type == 'COLON':
+                    indent = MAY_INDENT
+                yield new_token(type, value, tok_lineno, tok_lexpos, size)
+                continue
+
+            if indent == MUST_INDENT and type != 'COLON':
+                if not (depth > levels[-1]):
+                    raise IndentationError("expected an indented block "
+                                           "at line %i" % tok_lineno)
+                levels.append(depth)
+                yield new_token('INDENT', None, tok_lineno, -1)
+
+            elif at_line_start:
+                if depth == levels[-1]:
+                    pass
+                elif depth > levels[-1]:
+                    raise IndentationError("indentation increase but not in "
+                                           "new block at line %i" % tok_lineno)
+                else:
+                    try:
+                        i = levels.index(depth)
+                    except ValueError:
+                        raise IndentationError("inconsistent indentation "
+                                               "at line %i" % tok_lineno)
+                    for _ in range(i+1, len(levels)):
+                        yield new_token('DEDENT', None, tok_lineno, -1)
+                        levels.pop()
+
+            if type == 'COLON':
+                indent = MAY_INDENT
+            else:
+                indent = NO_INDENT
+            at_line_start = False
+            yield new_token(type, value, tok_lineno, tok_lexpos, size)
+
+        if pos < end:
+            raise SyntaxError("Illegal character %r at line %i, column %i" %
+                              (data[pos], lineno, offset + pos - line_start))
+        lexpos = offset + end
+
+    if carry is not None:
+        raise SyntaxError("EOF while scanning triple-quoted string "
+                          "at line %i, column %i" %
+                          (lineno, lexpos - carry_size - line_start))
+
+    # The source doesn't have to end with a newline, but the parser
+    # needs the NEWLINE closing the last statement
+    if not at_line_start:
+        last_lineno = tok_lineno = lineno
+        tok_lexpos = lexpos
+        yield new_token('NEWLINE', '\n', lineno, lexpos)
+
+    # Must dedent any remaining levels
+    for _ in range(1, len(levels)):
+        tok_lineno = last_lineno
+        tok_lexpos = -1
+        yield new_token('DEDENT', None, last_lineno, -1)
+
+    if add_endmarker:
+        yield new_token('ENDMARKER', None, tok_lineno, tok_lexpos+1)
+
+
+# Size of the chunks read from file objects by source_windows
+CHUNK_SIZE = 1 << 16
+
+
+def _reader(data):
+    """Return a read(size) callable for file objects and memoryviews,
+    or None for sources that can be scanned in place"""
+    if isinstance(data, mmap.mmap):
+        return None
+    if hasattr(data, 'read'):
+        return data.read
+    if isinstance(data, memoryview):
+        state = [0]
+        def read(size):
+            start = state[0]
+            state[0] = start + size
+            return data[start:start+size].tobytes()
+        return read
+    return None
+
+
+def _in_place(data):
+    # the regex engine can scan str, unicode, buffer and mmap objects
+    # directly, but slices of a bytearray would be bytearrays
+    if isinstance(data, bytearray):
+        return buffer(data)
+    return data
+
+
+def source_windows(data, chunk_size=CHUNK_SIZE):
+    """Split a source into the (buffer, offset, start, end) windows
+    scanned by fused_scan.
+
+    Strings and buffers are scanned in place as a single window. File
+    objects and memoryviews are read in chunks of chunk_size, each
+    window ending right after a run of newlines so no token is split.
+    Only the partial line at the end of a chunk is ever copied.
+    """
+    read = _reader(data)
+    if read is None:
+        data = _in_place(data)
+        yield data, 0, 0, len(data)
+        return
+
+    offset = 0
+    buf = read(chunk_size)
+    while buf:
+        more = read(chunk_size)
+        if not more:
+            break
+
+        if buf[-1] == '\n' and more[0] != '\n':
+            cut = len(buf)
+        else:
+            # back up to the last newline followed by something else,
+            # a newline run may carry on into the next chunk
+            k = len(buf)
+            while k and buf[k-1] == '\n':
+                k -= 1
+            cut = buf.rfind('\n', 0, k) + 1
+
+        if cut == 0:
+            # no complete line yet
+            buf += more
+            continue
+
+        yield buf, offset, 0, cut
+        offset += cut
+        buf = buf[cut:] + more
+
+    if buf:
+        yield buf, offset, 0, len(buf)
+
+
+def read_source(data):
+    """Return a source the PLY engine can lex, which needs all of it
+    in memory at once"""
+    read = _reader(data)
+    if read is None:
+        return _in_place(data)
+    chunks = []
+    chunk = read(CHUNK_SIZE)
+    while chunk:
+        chunks.append(chunk)
+        chunk = read(CHUNK_SIZE)
+    return chunks and chunks[0][:0].join(chunks) or ''
+
+
+# Shared PLY lexers, one per reflags value for the ASCII dialects and
+# one for the others. They are never fed input directly; each
+# PtpyLexer works on a clone, given the keywords of its dialect, so
+# any number of them can run at once in different threads.
+_lexers = {}
+
+
+def lexer_signature(reflags=0):
+    """Digest of the token rules in this module, stored in the
+    pre-generated lextab to detect stale tables"""
+    sig = md5()
+    sig.update(str(reflags))
+    sig.update(" ".join(tokens))
+    for name, rule in sorted(globals().items()):
+        if not name.startswith('t_'):
+            continue
+        if callable(rule):
+            rule = rule.__doc__ or ''
+        sig.update(name)
+        sig.update(rule)
+    return sig.hexdigest()
+
+
+def _rules(wide=False):
+    # The PLY rules: this module, or for the dialects with non-ASCII
+    # identifiers a copy of it with their t_NAME
+    module = sys.modules[__name__]
+    if not wide:
+        return module
+    rules = types.ModuleType(__name__)
+    rules.__dict__.update(module.__dict__)
+    rules.t_NAME = _t_unicode_NAME
+    return rules
+
+
+def get_lexer(reflags=0, lextab=LEXTAB, optimize=0, wide=False):
+    """Return the process-wide PLY lexer for reflags, for the dialects
+    with non-ASCII identifiers if wide.
+
+    The lexer is loaded from the lextab module if its signature matches
+    the rules in this module (or unconditionally with optimize) and
+    built in memory otherwise. Nothing is ever written to disk. The
+    lextab only holds the ASCII lexer.
+    """
+    try:
+        return _lexers[reflags, wide]
+    except KeyError:
+        pass
+
+    lexer = None
+    try:
+        tabmodule = __import__(lextab, fromlist=['_signature'])
+        if not wide and (optimize or
+                         tabmodule._signature == lexer_signature(reflags)):
+            lexer = lex.Lexer()
+            lexer.readtab(tabmodule, globals())
+    except (ImportError, AttributeError):
+        lexer = None
+
+    if lexer is None:
+        lexer = lex.lex(module=_rules(wide), reflags=reflags)
+
+    lexer.keywords = RESERVED
+    return _lexers.setdefault((reflags, wide), lexer)
+
 
 # Wrap everything into a new lexer
 class PtpyLexer(object):
-    def __init__(self, debug=0, optimize=0, lextab='lextab', reflags=0):
-        self.lexer = lex.lex(debug=debug,
-                             optimize=optimize,
-                             lextab=lextab,
-                             reflags=reflags)
+    """Token stream for the parser.
+
+    engine selects how tokens are produced: 'ply' runs PLY's lexer
+    through the filters above, 'fused' runs fused_scan over the same
+    rules. Both give the same tokens.
+
+    dialect names the keyword table to use, one of p_dialects.DIALECTS.
+    """
+    def __init__(self, debug=0, optimize=0, lextab=LEXTAB, reflags=0,
+                 engine='ply', chunk_size=CHUNK_SIZE,
+                 dialect=p_dialects.DEFAULT_DIALECT):
+        if engine not in ('ply', 'fused'):
+            raise ValueError("unknown lexer engine %r" % engine)
+        self.engine = engine
+        self.reflags = reflags
+        self.chunk_size = chunk_size
+        self.dialect = dialect
+        keywords = dialect_keywords(dialect)
+
+        if debug:
+            self.lexer = lex.lex(module=_rules(is_wide(keywords)),
+                                 debug=debug, reflags=reflags)
+        else:
+            self.lexer = get_lexer(reflags, lextab, optimize,
+                                   is_wide(keywords)).clone()
+        self.lexer.keywords = keywords
 
         self.token_stream = None
-
-    def input(self, data, add_endmarker=True):
-        data = data + '\n#' # FIXME!!!! PLEASE!!!
-        # for some reason, parser don't get endmarker if there's not a
-        # comment at the end of the stream
+        self.line_index = None
+
+    def input(self, data, add_endmarker=True, skip_blocks=False):
+        """Set the source to tokenize: a string, a buffer or mmap, or a
+        file object. The fused engine reads file objects in chunks,
+        the PLY engine reads them whole.
+
+        With skip_blocks the bodies of definir blocks are replaced by
+        BLOCK tokens, see block_skipping_filter. The source is read
+        whole, since the tokens hold its text.
+        """
+        self.line_index = p_tokens.LineIndex()
+        if skip_blocks:
+            data = read_source(data)[:]
+        if self.engine == 'fused':
+            windows = source_windows(data, self.chunk_size)
+            scanner = get_scanner(self.reflags, self.dialect)
+            tokens = fused_scan(windows, scanner, add_endmarker,
+                                line_starts=self.line_index.starts)
+            if skip_blocks:
+                tokens = block_skipping_filter(tokens, data)
+            self.token_stream = tokens
+            return
+
+        self.lexer.line_index = self.line_index
+        self.lexer.lineno = 1
         self.lexer.paren_count = 0
         self.lexer.bracket_count = 0
         self.lexer.brace_count = 0
 
-        self.lexer.input(data)
+        self.lexer.input(read_source(data))
 
         tokens = iter(self.lexer.token, None)
         tokens = track_tokens_filter(self.lexer, tokens)
@@ -444,9 +1168,38 @@ class PtpyLexer(object):
 
         if add_endmarker:
             tokens = _add_endmarker(tokens)
+        if skip_blocks:
+            tokens = block_skipping_filter(tokens, data)
 
         self.token_stream = tokens
 
+    def tokenize_all(self, data, add_endmarker=True):
+        """Tokenize a whole source into a p_tokens.TokenBuffer.
+
+        Always uses the fused engine, writing straight into the
+        buffer's arrays without making a LexToken per token.
+        """
+        tokbuf = p_tokens.TokenBuffer(tokens, p_tokens.LineIndex())
+        windows = source_windows(data, self.chunk_size)
+        for _ in fused_scan(windows, get_scanner(self.reflags, self.dialect),
+                            add_endmarker, tokbuf.append,
+                            line_starts=tokbuf.line_index.starts):
+            pass
+        return tokbuf
+
+    def buffer_tokens(self, data, add_endmarker=True):
+        """Tokenize a whole source into a p_tokens.TokenBuffer with
+        this lexer's engine, the tokens the parser would get from it.
+        With the PLY engine the tokens' spans are left empty."""
+        if self.engine == 'fused':
+            return self.tokenize_all(data, add_endmarker)
+        self.input(data, add_endmarker)
+        tokbuf = p_tokens.TokenBuffer(tokens, self.line_index)
+        append = tokbuf.append
+        for tok in self.token_stream:
+            append(tok.type, tok.value, tok.lineno, tok.lexpos)
+        return tokbuf
+
     def token(self):
         try:
             return self.token_stream.next()
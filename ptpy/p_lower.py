@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# The ast backend of PtpyCompiler: the tree is lowered to the nodes of
+# the stdlib ast module and compiled by the built-in compile, in C,
+# where the default backend goes through the compiler package's code
+# generator and assembler, in Python.
+#
+# Blocks are lowered to the same values:
+#
+# - a lazy definir block is the code of its body, compiled apart and
+#   named after the block, running in the namespaces it's exec'd in;
+#   its locals are what it leaves there
+# - an eager one is a function returning its locals when called
+# - an unparsed body is the code of p_compiler.block_stub
+# - with a wrapper, the block is then wrapper('name', block)
+#
+# Constants, and the code of the lazy blocks, are put in the tree as
+# ast.Num whatever their type, which compile takes as they are. A
+# string statement so isn't taken for a docstring.
+#
+# The code of a lazy block looks up the names it doesn't bind in the
+# namespaces it runs in, and doesn't close over the blocks around it.
+
+import ast
+import types
+
+import ptpy.p_ast as ptpyast
+import ptpy.p_stats as ptpystats
+
+
+BINARY_OPS = {
+    ptpyast.Add: ast.Add,
+    ptpyast.Sub: ast.Sub,
+    ptpyast.Mul: ast.Mult,
+    ptpyast.Div: ast.Div,
+    ptpyast.FloorDiv: ast.FloorDiv,
+    ptpyast.Mod: ast.Mod,
+    ptpyast.Power: ast.Pow,
+    ptpyast.LeftShift: ast.LShift,
+    ptpyast.RightShift: ast.RShift,
+}
+
+# the operators of p_ast.Bitand and others, applied to their nodes
+BITWISE_OPS = {
+    ptpyast.Bitand: ast.BitAnd,
+    ptpyast.Bitor: ast.BitOr,
+    ptpyast.Bitxor: ast.BitXor,
+}
+
+UNARY_OPS = {
+    ptpyast.UnaryAdd: ast.UAdd,
+    ptpyast.UnarySub: ast.USub,
+    ptpyast.Invert: ast.Invert,
+    ptpyast.Not: ast.Not,
+}
+
+AUGMENTED_OPS = {
+    '+=': ast.Add,
+    '-=': ast.Sub,
+    '*=': ast.Mult,
+    '/=': ast.Div,
+    '//=': ast.FloorDiv,
+    '%=': ast.Mod,
+    '**=': ast.Pow,
+    '<<=': ast.LShift,
+    '>>=': ast.RShift,
+    '&=': ast.BitAnd,
+    '|=': ast.BitOr,
+    '^=': ast.BitXor,
+}
+
+COMPARISONS = {
+    '==': ast.Eq,
+    '!=': ast.NotEq,
+    '<': ast.Lt,
+    '<=': ast.LtE,
+    '>': ast.Gt,
+    '>=': ast.GtE,
+    'is': ast.Is,
+    'is not': ast.IsNot,
+    'in': ast.In,
+    'not in': ast.NotIn,
+}
+
+
+def named(code, name):
+    """code, named name"""
+    return types.CodeType(code.co_argcount, code.co_nlocals,
+                          code.co_stacksize, code.co_flags, code.co_code,
+                          code.co_consts, code.co_names, code.co_varnames,
+                          code.co_filename, name, code.co_firstlineno,
+                          code.co_lnotab, code.co_freevars,
+                          code.co_cellvars)
+
+
+
+class PtpyLowering(object):
+    """Lowers a p_ast tree, optimized for the level optimize, to a
+    stdlib ast tree compiled for filename"""
+    def __init__(self, filename, optimize=0, stats=ptpystats.NO_STATS):
+        self.filename = filename
+        self.optimize = optimize
+        self.stats = stats
+        # the line of the statement being lowered, for the nodes with
+        # none of their own
+        self.lineno = 1
+        # lowering method by node class
+        self._cache = {}
+
+    def _dispatch(self, node):
+        try:
+            return self._cache[node.__class__]
+        except KeyError:
+            name = node.__class__.__name__
+            method = getattr(self, 'lower' + name, None)
+            if method is None:
+                raise NotImplementedError("can't lower %s nodes" % name)
+            self._cache[node.__class__] = method
+            return method
+
+    def _at(self, new, node):
+        # new, positioned as node
+        lineno = getattr(node, 'lineno', None)
+        new.lineno = lineno or self.lineno
+        new.col_offset = getattr(node, 'col_offset', None) or 0
+        return new
+
+    def expr(self, node):
+        return self._dispatch(node)(node)
+
+    def exprs(self, nodes):
+        return [self.expr(node) for node in nodes]
+
+    def stmts(self, node, stmts=None):
+        """The statements of node, a statement or a p_ast.Stmt, added
+        to stmts"""
+        if stmts is None:
+            stmts = []
+        if isinstance(node, ptpyast.Stmt):
+            for child in node.nodes:
+                self.stmts(child, stmts)
+            return stmts
+        outer = self.lineno
+        if node.lineno:
+            self.lineno = node.lineno
+        lowered = self._dispatch(node)(node)
+        self.lineno = outer
+        if isinstance(lowered, list):
+            stmts.extend(lowered)
+        else:
+            stmts.append(lowered)
+        return stmts
+
+    def suite(self, node):
+        # an ast body can't be empty
+        if node is None:
+            return []
+        return self.stmts(node) or [self._at(ast.Pass(), node)]
+
+    def compile(self, body):
+        """The code of the statements of body"""
+        module = ast.Module(self.suite(body))
+        self.stats.start('assemble')
+        try:
+            return compile(module, self.filename, 'exec', 0, True)
+        finally:
+            self.stats.stop()
+
+    # statements
+
+    def lowerModule(self, node):
+        stmts = []
+        if node.doc:
+            stmts.append(self._at(ast.Assign(
+                [self._at(ast.Name('__doc__', ast.Store()), node)],
+                self._at(ast.Num(node.doc), node)), node))
+        self.stmts(node.node, stmts)
+        return ast.Module(stmts)
+
+    def lowerCode(self, node):
+        # p_compiler imports this module
+        from ptpy.p_compiler import block_stub
+        self.stats.count('blocks')
+        if isinstance(node.code, ptpyast.Unparsed):
+            node.filename = self.filename
+            value = block_stub(node, self.optimize, 'ast')
+        elif node.lazy:
+            value = named(self.compile(node.code), node.name)
+        else:
+            value = None
+
+        stmts = []
+        if value is None:
+            body = self.suite(node.code)
+            body.append(self._at(ast.Return(self._at(ast.Call(
+                self._at(ast.Name('locals', ast.Load()), node), [], [],
+                None, None), node)), node))
+            stmts.append(self._at(ast.FunctionDef(
+                node.name, ast.arguments([], None, None, []), body, []),
+                node))
+        else:
+            stmts.append(self._at(ast.Assign(
+                [self._at(ast.Name(node.name, ast.Store()), node)],
+                self._at(ast.Num(value), node)), node))
+
+        if node.wrapper is not None:
+            call = self._at(ast.Call(
+                self.expr(node.wrapper),
+                [self._at(ast.Num(node.name), node),
+                 self._at(ast.Name(node.name, ast.Load()), node)],
+                [], None, None), node)
+            stmts.append(self._at(ast.Assign(
+                [self._at(ast.Name(node.name, ast.Store()), node)], call),
+                node))
+        return stmts
+
+    def lowerAssign(self, node):
+        return self._at(ast.Assign(self.exprs(node.nodes),
+                                   self.expr(node.expr)), node)
+
+    def lowerAugAssign(self, node):
+        target = self.expr(node.node)
+        target.ctx = ast.Store()
+        return self._at(ast.AugAssign(target, AUGMENTED_OPS[node.op](),
+                                      self.expr(node.expr)), node)
+
+    def lowerDiscard(self, node):
+        return self._at(ast.Expr(self.expr(node.expr)), node)
+
+    def lowerIf(self, node):
+        orelse = self.suite(node.else_)
+        for test, body in reversed(node.tests):
+            orelse = [self._at(ast.If(self.expr(test), self.suite(body),
+                                      orelse), test)]
+        return orelse[0]
+
+    def lowerWhile(self, node):
+        return self._at(ast.While(self.expr(node.test),
+                                  self.suite(node.body),
+                                  self.suite(node.else_)), node)
+
+    def lowerFor(self, node):
+        return self._at(ast.For(self.expr(node.assign),
+                                self.expr(node.list),
+                                self.suite(node.body),
+                                self.suite(node.else_)), node)
+
+    def lowerExec(self, node):
+        # pycodegen takes node.locals for the globals, and node.globals
+        # for the locals, which run in the current globals if not given
+        globals = locals = None
+        if node.locals is not None:
+            globals = self.expr(node.locals)
+        if node.globals is not None:
+            locals = self.expr(node.globals)
+            if globals is None:
+                globals = self._at(ast.Call(
+                    self._at(ast.Name('globals', ast.Load()), node), [], [],
+                    None, None), node)
+        return self._at(ast.Exec(self.expr(node.expr), globals, locals),
+                        node)
+
+    def lowerAssert(self, node):
+        msg = None
+        if node.fail is not None:
+            msg = self.expr(node.fail)
+        return self._at(ast.Assert(self.expr(node.test), msg), node)
+
+    def lowerPass(self, node):
+        return self._at(ast.Pass(), node)
+
+    def lowerBreak(self, node):
+        return self._at(ast.Break(), node)
+
+    def lowerContinue(self, node):
+        return self._at(ast.Continue(), node)
+
+    # assignment targets
+
+    def lowerAssName(self, node):
+        return self._at(ast.Name(node.name, ast.Store()), node)
+
+    def lowerAssAttr(self, node):
+        return self._at(ast.Attribute(self.expr(node.expr), node.attrname,
+                                      ast.Store()), node)
+
+    def lowerAssTuple(self, node):
+        return self._at(ast.Tuple(self.exprs(node.nodes), ast.Store()),
+                        node)
+
+    def lowerAssList(self, node):
+        return self._at(ast.List(self.exprs(node.nodes), ast.Store()), node)
+
+    # expressions
+
+    def lowerConst(self, node):
+        return self._at(ast.Num(node.value), node)
+
+    def lowerName(self, node):
+        return self._at(ast.Name(node.name, ast.Load()), node)
+
+    def lowerGetattr(self, node):
+        return self._at(ast.Attribute(self.expr(node.expr), node.attrname,
+                                      ast.Load()), node)
+
+    def lowerCallFunc(self, node):
+        args = []
+        keywords = []
+        for arg in node.args:
+            if isinstance(arg, ptpyast.Keyword):
+                keywords.append(ast.keyword(arg.name, self.expr(arg.expr)))
+            else:
+                args.append(self.expr(arg))
+        starargs = kwargs = None
+        if node.star_args is not None:
+            starargs = self.expr(node.star_args)
+        if node.dstar_args is not None:
+            kwargs = self.expr(node.dstar_args)
+        return self._at(ast.Call(self.expr(node.node), args, keywords,
+                                 starargs, kwargs), node)
+
+    def lowerBinary(self, node):
+        return self._at(ast.BinOp(self.expr(node.left),
+                                  BINARY_OPS[node.__class__](),
+                                  self.expr(node.right)), node)
+
+    lowerAdd = lowerSub = lowerMul = lowerDiv = lowerFloorDiv = lowerMod = \
+        lowerPower = lowerLeftShift = lowerRightShift = lowerBinary
+
+    def lowerBitwise(self, node):
+        op = BITWISE_OPS[node.__class__]
+        nodes = self.exprs(node.nodes)
+        left = nodes[0]
+        for right in nodes[1:]:
+            left = self._at(ast.BinOp(left, op(), right), node)
+        return left
+
+    lowerBitand = lowerBitor = lowerBitxor = lowerBitwise
+
+    def lowerUnary(self, node):
+        return self._at(ast.UnaryOp(UNARY_OPS[node.__class__](),
+                                    self.expr(node.expr)), node)
+
+    lowerUnaryAdd = lowerUnarySub = lowerInvert = lowerNot = lowerUnary
+
+    def lowerAnd(self, node):
+        return self._at(ast.BoolOp(ast.And(), self.exprs(node.nodes)), node)
+
+    def lowerOr(self, node):
+        return self._at(ast.BoolOp(ast.Or(), self.exprs(node.nodes)), node)
+
+    def lowerCompare(self, node):
+        ops = [COMPARISONS[op]() for op, right in node.ops]
+        comparators = [self.expr(right) for op, right in node.ops]
+        return self._at(ast.Compare(self.expr(node.expr), ops, comparators),
+                        node)
+
+    def lowerIfExp(self, node):
+        return self._at(ast.IfExp(self.expr(node.test), self.expr(node.then),
+                                  self.expr(node.else_)), node)
+
+    def lowerTuple(self, node):
+        return self._at(ast.Tuple(self.exprs(node.nodes), ast.Load()), node)
+
+    def lowerList(self, node):
+        return self._at(ast.List(self.exprs(node.nodes), ast.Load()), node)
+
+    def lowerDict(self, node):
+        keys = [self.expr(key) for key, value in node.items]
+        values = [self.expr(value) for key, value in node.items]
+        return self._at(ast.Dict(keys, values), node)
+
+
+
+def lower(tree, filename, optimize=0, stats=ptpystats.NO_STATS):
+    """The stdlib ast.Module of the p_ast.Module tree. The code of the
+    lazy blocks in it is compiled on the way."""
+    return PtpyLowering(filename, optimize, stats).lowerModule(tree)
+
+
+def generate(tree, filename, optimize=0, stats=ptpystats.NO_STATS):
+    """The code of the p_ast.Module tree, optimized for the level
+    optimize, compiled for filename"""
+    stats.start('codegen')
+    try:
+        module = lower(tree, filename, optimize, stats)
+    finally:
+        stats.stop()
+    stats.start('assemble')
+    try:
+        return compile(module, filename, 'exec', 0, True)
+    finally:
+        stats.stop()
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Optimisations on the p_ast tree, run by PtpyCompiler before code
+# generation. At level 1 and above:
+#
+# - arithmetic, comparisons and boolean operators on constants are
+#   computed at compile time, unless that raises or makes a huge value
+# - membership tests against literal lists and tuples of constants test
+#   against a tuple constant instead of building one on every run
+# - se/ouse/senao branches with a constant condition and enquanto loops
+#   whose condition is a false constant are resolved, leaving only the
+#   code that can run
+# - statements after sair and continuar in the same block are dropped
+#
+# Folded nodes keep the position of the nodes they replace.
+
+import operator
+
+import ptpy.p_ast as ptpyast
+
+
+BINARY = {
+    ptpyast.Add: operator.add,
+    ptpyast.Sub: operator.sub,
+    ptpyast.Mul: operator.mul,
+    ptpyast.Div: operator.div,
+    ptpyast.Mod: operator.mod,
+    ptpyast.Power: operator.pow,
+    ptpyast.LeftShift: operator.lshift,
+    ptpyast.RightShift: operator.rshift,
+}
+
+BITWISE = {
+    ptpyast.Bitand: operator.and_,
+    ptpyast.Bitor: operator.or_,
+    ptpyast.Bitxor: operator.xor,
+}
+
+UNARY = {
+    ptpyast.UnaryAdd: operator.pos,
+    ptpyast.UnarySub: operator.neg,
+    ptpyast.Invert: operator.invert,
+    ptpyast.Not: operator.not_,
+}
+
+# 'is' is left alone, the identity of constants being up to the
+# interpreter
+COMPARISONS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+    'in': lambda left, right: left in right,
+    'not in': lambda left, right: left not in right,
+}
+
+CONSTANT_TYPES = (bool, int, long, float, str, unicode, tuple, type(None))
+
+# Largest folded sequence and integer, in items and bits. Bigger values
+# are left to be computed when the code runs
+MAX_SIZE = 20
+MAX_BITS = 4096
+
+
+def _like(node, other):
+    # position node where other is
+    node.lineno = getattr(other, 'lineno', None)
+    node.col_offset = getattr(other, 'col_offset', None)
+    return node
+
+
+def _constant(node):
+    return isinstance(node, ptpyast.Const)
+
+
+def _too_big(function, left, right):
+    # whether function(left, right) might make a value too big to fold
+    if isinstance(left, (int, long)) and isinstance(right, (int, long)):
+        if function is operator.pow:
+            return right > 0 and left.bit_length() * right > MAX_BITS
+        if function is operator.lshift:
+            return left.bit_length() + right > MAX_BITS
+        return False
+    if function is operator.mul:
+        for sequence, count in (left, right), (right, left):
+            if isinstance(sequence, (str, unicode, tuple)) and \
+                    isinstance(count, (int, long)):
+                return len(sequence) * count > MAX_SIZE
+    return False
+
+
+def _folded(value):
+    # whether value can stand in a Const. Float zeros can't, as the
+    # compiler package takes 0.0 and -0.0 for the same constant
+    if not isinstance(value, CONSTANT_TYPES):
+        return False
+    if isinstance(value, float) and value == 0:
+        return False
+    if isinstance(value, (int, long)) and value.bit_length() > MAX_BITS:
+        return False
+    return True
+
+
+def _apply(function, *args):
+    # the Const of function(*args), or None if it can't be folded
+    try:
+        value = function(*args)
+    except Exception:
+        return None
+    if not _folded(value):
+        return None
+    return ptpyast.Const(value)
+
+
+
+class ConstantFolder(object):
+    """Rewrites a tree bottom up. Each node's children are folded
+    first, then the node by the method named fold plus its class name,
+    if there is one, which returns the node to put in its place. A
+    statement can be replaced by a Stmt of statements, or by None to
+    drop it."""
+
+    def __init__(self, level=1):
+        self.level = level
+
+    def fold(self, node):
+        if isinstance(node, ptpyast.Const):
+            return node
+        for name, value in node.__dict__.items():
+            if isinstance(value, (ptpyast.Node, list, tuple)):
+                setattr(node, name, self.fold_value(value))
+        method = getattr(self, 'fold' + node.__class__.__name__, None)
+        if method is None:
+            return node
+        return method(node)
+
+    def fold_value(self, value):
+        if isinstance(value, ptpyast.Node):
+            return self.fold(value)
+        if isinstance(value, list):
+            return [self.fold_value(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple([self.fold_value(item) for item in value])
+        return value
+
+    # expressions
+    def foldBinary(self, node):
+        if _constant(node.left) and _constant(node.right):
+            function = BINARY[node.__class__]
+            left, right = node.left.value, node.right.value
+            if not _too_big(function, left, right):
+                const = _apply(function, left, right)
+                if const is not None:
+                    return _like(const, node)
+        return node
+
+    foldAdd = foldSub = foldMul = foldDiv = foldMod = foldPower = \
+        foldLeftShift = foldRightShift = foldBinary
+
+    def foldBitwise(self, node):
+        if not [child for child in node.nodes if not _constant(child)]:
+            const = _apply(reduce, BITWISE[node.__class__],
+                           [child.value for child in node.nodes])
+            if const is not None:
+                return _like(const, node)
+        return node
+
+    foldBitand = foldBitor = foldBitxor = foldBitwise
+
+    def foldUnary(self, node):
+        if _constant(node.expr):
+            const = _apply(UNARY[node.__class__], node.expr.value)
+            if const is not None:
+                return _like(const, node)
+        return node
+
+    foldUnaryAdd = foldUnarySub = foldInvert = foldNot = foldUnary
+
+    def foldAnd(self, node):
+        # the first false operand, or the last one
+        nodes = list(node.nodes)
+        while len(nodes) > 1 and _constant(nodes[0]):
+            if not nodes[0].value:
+                return nodes[0]
+            nodes.pop(0)
+        if len(nodes) == 1:
+            return nodes[0]
+        node.nodes = nodes
+        return node
+
+    def foldOr(self, node):
+        # the first true operand, or the last one
+        nodes = list(node.nodes)
+        while len(nodes) > 1 and _constant(nodes[0]):
+            if nodes[0].value:
+                return nodes[0]
+            nodes.pop(0)
+        if len(nodes) == 1:
+            return nodes[0]
+        node.nodes = nodes
+        return node
+
+    def foldIfExp(self, node):
+        if _constant(node.test):
+            if node.test.value:
+                return node.then
+            return node.else_
+        return node
+
+    def foldCompare(self, node):
+        ops = []
+        for op, right in node.ops:
+            if op in ('in', 'not in') and \
+                    isinstance(right, (ptpyast.List, ptpyast.Tuple)) and \
+                    not [item for item in right.nodes
+                         if not _constant(item)]:
+                right = _like(ptpyast.Const(tuple([item.value for item
+                                                   in right.nodes])),
+                              right)
+            ops.append((op, right))
+        node.ops = ops
+
+        if len(ops) == 1 and _constant(node.expr) and _constant(ops[0][1]):
+            op, right = ops[0]
+            if op in COMPARISONS:
+                const = _apply(COMPARISONS[op], node.expr.value, right.value)
+                if const is not None:
+                    return _like(const, node)
+        return node
+
+    # statements
+    def foldStmt(self, node):
+        nodes = []
+        for child in node.nodes:
+            if child is None:
+                continue
+            if isinstance(child, ptpyast.Stmt):
+                nodes.extend(child.nodes)
+            else:
+                nodes.append(child)
+        # nothing after sair or continuar runs
+        for i, child in enumerate(nodes):
+            if isinstance(child, (ptpyast.Break, ptpyast.Continue)):
+                del nodes[i+1:]
+                break
+        node.nodes = nodes
+        return node
+
+    def foldIf(self, node):
+        tests = []
+        else_ = node.else_
+        for test, body in node.tests:
+            if _constant(test):
+                if not test.value:
+                    continue
+                # always taken, the branches after it never are
+                else_ = body
+                break
+            tests.append((test, body))
+        if tests:
+            node.tests = tests
+            node.else_ = else_
+            return node
+        return else_
+
+    def foldWhile(self, node):
+        if _constant(node.test) and not node.test.value:
+            return node.else_
+        return node
+
+
+
+def optimize(tree, level=1):
+    """Optimize tree in place for level, returning it. Level 0 leaves
+    it as it is."""
+    if level < 1:
+        return tree
+    return ConstantFolder(level).fold(tree)
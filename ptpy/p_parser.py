@@ -1,6 +1,13 @@
 
 
 
+import copy
+import multiprocessing
+import re
+import sys
+import threading
+
+import ply.lex as lex
 import ply.yacc as yacc
 
 from compiler import ast
@@ -8,11 +15,16 @@ from compiler.consts import *
 
 import p_lexer
 import p_ast
+import p_pratt
+import p_tokens
 
 
 
 tokens = p_lexer.tokens
 
+# Pre-generated parser table shipped with the package, see p_tables
+PARSETAB = 'ptpy.parsetab'
+
 
 # AST
 class Node(object):
@@ -68,6 +80,16 @@ binary_ops = {
 }
 
 
+# the comparisons spelled with keywords, by their tokens, as each
+# dialect has its own words for them
+keyword_comparisons = {
+    "IS": "is",
+    "IS BNOT": "is not",
+    "IN": "in",
+    "BNOT IN": "not in",
+}
+
+
 unary_ops = {
     "+": p_ast.UnaryAdd,
     "-": p_ast.UnarySub,
@@ -115,11 +137,12 @@ def p_file_input(p):
                   | NEWLINE
                   | stmt
                   """
+    # statement lists grow in place, left to right, so a module parses
+    # in linear time whatever its length
     if len(p) == 3:
-        if isinstance(p[2], basestring):
-            p[0] = p[1]
-        else:
-            p[0] = p[1] + p[2]
+        p[0] = p[1]
+        if not isinstance(p[2], basestring):
+            p[0].extend(p[2])
     else:
         if isinstance(p[1], basestring):
             p[0] = []
@@ -164,7 +187,8 @@ def p_small_stmts(p):
                    | small_stmt
                    """
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[0] = p[1]
+        p[0].append(p[3])
     else:
         p[0] = [p[1]]
 
@@ -239,28 +263,44 @@ def p_expr_stmt(p):
         # expressions, not assigned anywhere
         p[0] = p_ast.Discard(p[1])
     else:
-        left, right = p[1], p[3]
-        # make sure assignment to literal fails
-        if isinstance(left, p_ast.Const):
-            raise SyntaxError("Cannot assign to literal")
-        
-        # simple assignment
-        if isinstance(left, p_ast.Name):
-            p[0] = p_ast.Assign([p_ast.AssName(left.name, OP_ASSIGN)], right)
+        p[0] = assignment(p[1], p[3])
 
-        # attribute assignment
-        elif isinstance(left, p_ast.Getattr):
-            var, attr = left.asList()
-            p[0] = p_ast.Assign([p_ast.AssAttr(var, attr, OP_ASSIGN)], right)
 
-        else:
-            raise NotImplementedError("only single assignments: %r"%left)
+class _ParseError(Exception):
+    # Raised by a grammar action for an error in the source. PLY takes
+    # a SyntaxError raised there as a cue to recover, dropping tokens
+    # until it can go on, so the actions raise this instead, which
+    # PtpyParser.parse turns back into the SyntaxError it holds
+    def __init__(self, error):
+        Exception.__init__(self, error)
+        self.error = error
+
+
+def assignment(left, right):
+    """The Assign node of left = right"""
+    # make sure assignment to literal fails
+    if isinstance(left, p_ast.Const):
+        raise _ParseError(SyntaxError("Cannot assign to literal"))
+
+    # simple assignment
+    if isinstance(left, p_ast.Name):
+        return p_ast.Assign([p_ast.AssName(left.name, OP_ASSIGN)], right)
+
+    # attribute assignment
+    elif isinstance(left, p_ast.Getattr):
+        var, attr = left.asList()
+        return p_ast.Assign([p_ast.AssAttr(var, attr, OP_ASSIGN)], right)
+
+    else:
+        raise NotImplementedError("only single assignments: %r"%left)
 
         
 
 def p_def_code_stmt(p):
-    """define_stmt : DEFINE NAME COLON suite
-                   | DEFINE expr NAME COLON suite
+    """define_stmt : DEF NAME COLON suite
+                   | DEF expr NAME COLON suite
+                   | DEF NAME COLON block
+                   | DEF expr NAME COLON block
                    """
 
     if len(p) == 5:
@@ -317,7 +357,8 @@ def p_conds(p):
     if len(p) == 2:
         p[0] = p[1]
     elif len(p) == 3:
-        p[0] = p[1]+p[2]
+        p[0] = p[1]
+        p[0].extend(p[2])
 
 
 def p_else_stmt(p):
@@ -331,7 +372,8 @@ def p_elif_conds(p):
                   | elif_cond
                   """
     if len(p) == 3:
-        p[0] = p[1] + p[2]
+        p[0] = p[1]
+        p[0].extend(p[2])
     else:
         p[0] = p[1]
 
@@ -346,6 +388,13 @@ def p_if_cond(p):
     """
     p[0] = [(p[2], p[4])]
 
+# a body left for later by PtpyParser(lazy_blocks=True)
+def p_block(p):
+    """block : BLOCK
+    """
+    p[0] = p_ast.Unparsed(p[1], p.lexer.dialect, p.lineno(1))
+
+
 # suite: simple_stmt | NEWLINE INDENT stmt+ DEDENT
 def p_suite(p):
     """suite : simple_stmt
@@ -363,7 +412,8 @@ def p_stmts(p):
              | stmt
              """
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[0] = p[1]
+        p[0].extend(p[2])
     else:
         p[0] = p[1]
 
@@ -420,9 +470,10 @@ def p_comparison(p):
                   | expr
                """
     if len(p) == 4:
-        p[0] = binary_ops[p[2]]((p[1], p[3]))
+        op = keyword_comparisons.get(p.slice[2].type, p[2])
+        p[0] = binary_ops[op]((p[1], p[3]))
     elif len(p) == 5:
-        op = p[2] + ' ' + p[3]
+        op = keyword_comparisons[p.slice[2].type + ' ' + p.slice[3].type]
         p[0] = binary_ops[op]((p[1], p[4]))
         
     else:
@@ -578,9 +629,15 @@ def p_atom_string(p):
     p[0] = p_ast.Const(p[1])#FIXME
 
 def p_atom_list(p):
-    """atom : LBRACKET testlist RBRACKET
+    """atom : LBRACKET test RBRACKET
+            | LBRACKET test COMMA RBRACKET
+            | LBRACKET tests RBRACKET
+            | LBRACKET tests COMMA RBRACKET
     """
-    p[0] = p_ast.List(p[2].nodes)
+    if isinstance(p[2], list):
+        p[0] = p_ast.List(p[2])
+    else:
+        p[0] = p_ast.List([p[2]])
 
 # tuple
 def p_atom_tuple(p):
@@ -592,16 +649,20 @@ def p_atom_dict(p):
     p[0] = p_ast.Dict(p[2])
 
 def p_keyvaluelist(p):
-    """keyvaluelist : keyvalue COMMA keyvaluelist
-                    | keyvalue COMMA
-                    | keyvalue
+    """keyvaluelist : keyvalues
+                    | keyvalues COMMA
                     """
-    if len(p) in (2, 3):
-        p[0] = [p[1]]
-    elif len(p) == 4:
-        p[0] = [p[1]] + p[3]
+    p[0] = p[1]
+
+def p_keyvalues(p):
+    """keyvalues : keyvalues COMMA keyvalue
+                 | keyvalue
+                 """
+    if len(p) == 4:
+        p[0] = p[1]
+        p[0].append(p[3])
     else:
-        raise NotImplementedError
+        p[0] = [p[1]]
 
 def p_keyvalue(p):
     """keyvalue : SCONST COLON test
@@ -624,25 +685,32 @@ def p_trailer(p):
 
 
 # testlist: test (',' test)* [',']
-# FIXME: missing trailing comma
-# FIXED, but with shift/reduce conflict
 def p_testlist(p):
-    """testlist : test COMMA testlist
+    """testlist : test
                 | test COMMA
-                | test
+                | tests
+                | tests COMMA
                 """
-    
-    if len(p) == 2:
-        p[0] = p[1]
+    if isinstance(p[1], list):
+        p[0] = p_ast.Tuple(p[1])
     elif len(p) == 3:
         p[0] = p_ast.Tuple([p[1]])
-    elif len(p) == 4:
-        if isinstance(p[3], p_ast.Tuple):
-            p[0] = p_ast.Tuple((p[1],) + p[3].asList())
-        else:
-            p[0] = p_ast.Tuple((p[1], p[3]))
     else:
-        raise NotImplementedError(len(p))
+        p[0] = p[1]
+
+
+# The comma separated lists are left recursive and grow in place, so
+# any number of items parses in linear time and constant stack depth.
+# tests has two items at least, a single test is passed on as it is
+def p_tests(p):
+    """tests : tests COMMA test
+             | test COMMA test
+             """
+    if isinstance(p[1], list):
+        p[0] = p[1]
+        p[0].append(p[3])
+    else:
+        p[0] = [p[1], p[3]]
        
 
 # test: or_test ['if' or_test 'else' test] | lambdef
@@ -661,21 +729,20 @@ def p_test(p):
 #                         |'**' test)
 def p_arglist(p):
     # FIXME: no *args **kwds support
-    """arglist : argument COMMA arglist
-               | argument COMMA
-               | argument
+    """arglist : arguments
+               | arguments COMMA
                """
-    if len(p) == 2:
+    p[0] = p[1]
+
+def p_arguments(p):
+    """arguments : arguments COMMA argument
+                 | argument
+                 """
+    if len(p) == 4:
         p[0] = p[1]
-    elif len(p) == 3:
-        p[0] = [p[1]]
-    elif len(p) == 4:
-        if isinstance(p[3], list):
-            p[0] = [p[1]] + p[3]
-        else:
-            p[0] = [p[1], p[3]]
+        p[0].append(p[3])
     else:
-        raise NotImplementedError(len(p))
+        p[0] = [p[1]]
 
         
 
@@ -690,25 +757,331 @@ def p_argument(p):
 
 def p_error(t):
     if t is None:
-        raise SyntaxError('End of file reached: %r'%yacc.parser.symstack)
-    else:
-        raise SyntaxError('Syntax Error: %r'%t)
+        raise SyntaxError('invalid syntax: unexpected end of file')
+    raise syntax_error(t.type, t.value, t.lineno, t.lexpos,
+                       getattr(t.lexer, 'line_index', None))
+
+
+def syntax_error(type, value, lineno, lexpos, line_index=None):
+    """The SyntaxError for an unexpected token"""
+    unexpected = type
+    if value is not None:
+        unexpected += ' %r' % (value,)
+    if lexpos < 0 or line_index is None:
+        # INDENT and DEDENT have no column
+        return SyntaxError('invalid syntax at line %i: unexpected %s'
+                           % (lineno, unexpected))
+    return SyntaxError('invalid syntax at line %i, column %i: unexpected %s'
+                       % (lineno, line_index.column(lineno, lexpos),
+                          unexpected))
     
 
 
+# Process-wide PLY parser holding the LALR tables; each PtpyParser
+# works on a shallow copy sharing them. PLY keeps the state of a parse
+# on the parser object, so copies can run at once in different threads.
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser(tabmodule=PARSETAB, optimize=0):
+    """Return the process-wide PLY parser.
+
+    The tables are read from tabmodule when its signature matches the
+    grammar in this module (or unconditionally with optimize) and
+    generated in memory otherwise. Nothing is ever written to disk.
+    """
+    global _parser
+    if _parser is not None:
+        return _parser
+    _parser_lock.acquire()
+    try:
+        if _parser is None:
+            _parser = _make_parser(tabmodule, optimize)
+    finally:
+        _parser_lock.release()
+    return _parser
+
+
+def _make_parser(tabmodule, optimize):
+    parser = yacc.yacc(module=sys.modules[__name__],
+                       tabmodule=tabmodule,
+                       optimize=optimize,
+                       write_tables=0,
+                       debug=0,
+                       errorlog=yacc.NullLogger())
+    # Most reductions are chain rules passing their one child on,
+    # already positioned, so only the rest are wrapped. This is
+    # cheaper than PLY's own tracking, which touches every one
+    nonterminals = set(production.name
+                       for production in parser.productions)
+    for production in parser.productions:
+        rhs = production.str.split(' -> ')[1].split()
+        if production.callable is None or (
+                rhs[0] in nonterminals and production.len == 1 and
+                production.str not in _NODE_CHAIN_RULES):
+            continue
+        production.callable = _positioned(production.callable)
+    return parser
+
+
+def grammar_signature():
+    """Digest of the grammar rules in this module, the same PLY stores
+    in the pre-generated parsetab"""
+    pinfo = yacc.ParserReflect(dict(globals()), log=yacc.NullLogger())
+    pinfo.get_all()
+    return pinfo.signature().encode('hex')
+
+
+# Chain rules making a node of their child, or the child of one that
+# needs the position of its first token
+_NODE_CHAIN_RULES = (
+    'expr_stmt -> testlist',
+    'testlist -> tests',
+    'if_stmt -> conds',
+    'conds -> if_cond',
+    'suite -> simple_stmt',
+)
+
+
+def _symbol_position(sym, line_index):
+    # (lineno, column) where grammar symbol sym starts: a token's own,
+    # the one recorded by _positioned, or for a symbol made by a chain
+    # rule the one of the node it passed on
+    if isinstance(sym, lex.LexToken):
+        if sym.lexpos < 0:
+            # INDENT and DEDENT have no column
+            return sym.lineno, None
+        return sym.lineno, line_index.column(sym.lineno, sym.lexpos)
+    position = getattr(sym, 'position', None)
+    if position is not None:
+        return position
+    value = sym.value
+    while isinstance(value, (list, tuple)) and value:
+        value = value[0]
+    if isinstance(value, ast.Node):
+        return value.lineno, getattr(value, 'col_offset', None)
+    return None, None
+
+
+def _set_position(node, lineno, column):
+    # Stamp node and the nodes under it made along with it, stopping
+    # at the ones made by earlier actions, which already have theirs
+    node.lineno = lineno
+    node.col_offset = column
+    for child in node.getChildNodes():
+        if getattr(child, 'lineno', None) is None:
+            _set_position(child, lineno, column)
+
+
+def _positioned(action):
+    """Wrap a grammar action so the nodes it makes get the line and
+    column of the first symbol of its rule."""
+    def positioned(p):
+        action(p)
+        lineno, column = _symbol_position(p.slice[1], p.lexer.line_index)
+        p.slice[0].position = lineno, column
+        result = p[0]
+        # a rule can also give a tuple holding new nodes, as keyvalue
+        # does. Lists only ever hold the nodes of earlier rules
+        if isinstance(result, tuple):
+            nodes = result
+        else:
+            nodes = (result,)
+        for node in nodes:
+            if isinstance(node, ast.Node) and \
+                    getattr(node, 'lineno', None) is None:
+                _set_position(node, lineno, column)
+    positioned.__name__ = action.__name__
+    positioned.__doc__ = action.__doc__
+    return positioned
+
+
 class PtpyParser(object):
-    def __init__(self, lexer=None):
+    """Parser making a p_ast tree of a ptpy source.
+
+    With lazy_blocks the bodies of definir blocks spanning more than
+    their header line are only skipped over, leaving p_ast.Unparsed
+    nodes holding their source. Syntax errors in them are only found
+    when the blocks are compiled.
+
+    With processes, sources of PARALLEL_MIN_SIZE bytes or more are
+    split between top-level statements and the pieces parsed by that
+    many processes at once, in pool, a multiprocessing.Pool, or else
+    in one the parser makes on the first parallel parse and keeps until
+    close. The tree is the same as a serial parse's. Splitting the
+    source and unpickling the trees of the pieces are still done here,
+    in about a tenth of the time of a serial parse, up to a quarter for
+    long expressions and deep nesting, which bounds the speedup however
+    many processes there are.
+
+    engine selects how the tokens are parsed: 'yacc' runs PLY's parser
+    over the tables of the grammar in this module, 'pratt' the
+    hand-written parser in p_pratt, faster on expressions. Both give
+    the same trees.
+    """
+    def __init__(self, lexer=None, lazy_blocks=False, processes=None,
+                 engine='yacc', pool=None):
+        if engine not in ('yacc', 'pratt'):
+            raise ValueError("unknown parser engine %r" % engine)
         if lexer is None:
             lexer = p_lexer.PtpyLexer()
         self._lexer = lexer
-        self._parser = yacc.yacc()
+        self.engine = engine
+        if engine == 'yacc':
+            self._parser = copy.copy(get_parser())
+        self.lazy_blocks = lazy_blocks
+        self.processes = processes
+        self._pool = pool
+        self._own_pool = pool is None
+
+    def close(self):
+        """Stop the processes of the pool the parser made, if any. A
+        pool given to the parser is left to its owner."""
+        if self._own_pool and self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
 
     def parse(self, code, add_endmarker=True):
-        code = code.strip()
-        self._lexer.input(code, add_endmarker=add_endmarker)
-        result = self._parser.parse(lexer=self._lexer)
+        """Parse code, a string, buffer, mmap or file object, or the
+        p_tokens.TokenBuffer made by PtpyLexer.tokenize_all"""
+        if self.processes and self.processes > 1 and add_endmarker and \
+                not isinstance(code, p_tokens.TokenBuffer):
+            code = p_lexer.read_source(code)[:]
+            if len(code) >= PARALLEL_MIN_SIZE:
+                module = self._parse_parallel(code)
+                if module is not None:
+                    return module
+
+        if isinstance(code, p_tokens.TokenBuffer):
+            if self.lazy_blocks:
+                raise ValueError("lazy_blocks needs the source, "
+                                 "not a TokenBuffer")
+            lexer = code.lexer()
+        else:
+            self._lexer.input(code, add_endmarker=add_endmarker,
+                              skip_blocks=self.lazy_blocks)
+            lexer = self._lexer
+        try:
+            if self.engine == 'pratt':
+                result = p_pratt.parse(lexer)
+            else:
+                result = self._parser.parse(lexer=lexer)
+        except _ParseError, e:
+            raise e.error
         module = p_ast.Module(None, result)
         return module
+
+    def _parse_parallel(self, source):
+        # None if the source can't be split, leaving it to a serial
+        # parse
+        lexer = self._lexer
+        pieces = split_statements(source, self.processes * 4, lexer.dialect)
+        if len(pieces) < 2:
+            return None
+
+        options = (lexer.reflags, lexer.engine, lexer.dialect,
+                   self.lazy_blocks, self.engine)
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes)
+        try:
+            # in order, so an error is the first one a serial parse
+            # would raise
+            results = self._pool.imap(_parse_piece,
+                                      [(options, lineno, text)
+                                       for lineno, text in pieces])
+            result = results.next()
+            for stmt in results:
+                result.nodes.extend(stmt.nodes)
+        except:
+            # don't leave our processes parsing the rest of the pieces
+            if self._own_pool:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+            raise
+        return p_ast.Module(None, result)
+
+
+# Smallest source PtpyParser splits between processes; below that
+# starting them takes longer than they save
+PARALLEL_MIN_SIZE = 1 << 20
+
+# Keywords starting a line at the top level that go on the statement
+# before them
+_CONTINUATIONS = ('ELIF', 'ELSE', 'EXCEPT', 'FINALLY')
+
+# What split_statements looks at, skipping everything else: strings,
+# open ones to the end of the source or line, comments and line
+# continuations, brackets, and newlines followed by a line starting on
+# the first column, which are the top-level statements outside brackets
+_SPLIT_SCAN = re.compile(r'(%s|"""[\s\S]*|\'\'\'[\s\S]*|["\'][^\n]*|'
+                         r'#[^\n]*|\\\r?\n)|([(\[{])|([)\]}])|\n(?=[^\s#])'
+                         % p_lexer.STRING)
+
+_FIRST_WORD = re.compile(r'[^\s:(#\\]*')
+
+
+def split_statements(source, count,
+                     dialect=p_lexer.p_dialects.DEFAULT_DIALECT):
+    """Split source, in dialect, into about count pieces of about the
+    same size, cut where a top-level statement starts. Returns a list
+    of (number of the first line, text) pairs.
+
+    Only strings, comments and brackets are scanned for, not tokens,
+    so an error in the source goes on the piece it's in."""
+    continuations = set(word for word, type
+                        in p_lexer.dialect_keywords(dialect).items()
+                        if type in _CONTINUATIONS)
+    first_word = _FIRST_WORD.match
+
+    size = len(source) // count + 1
+    cuts = [(0, 1)]
+    next_cut = size
+    depth = 0
+    # the first piece has to hold a statement, not just comments
+    started = source[:1] not in ' \t\r\n\f#'
+    for match in _SPLIT_SCAN.finditer(source):
+        group = match.lastindex
+        if group == 2:
+            depth += 1
+        elif group == 3:
+            if depth:
+                depth -= 1
+        elif group is None and not depth:
+            offset = match.end()
+            if not started:
+                started = True
+            elif offset >= next_cut and \
+                    first_word(source, offset).group() not in continuations:
+                start, lineno = cuts[-1]
+                cuts.append((offset,
+                             lineno + source.count('\n', start, offset)))
+                next_cut = offset + size
+    cuts.append((len(source), None))
+    return [(lineno, source[start:end])
+            for (start, lineno), (end, _) in zip(cuts, cuts[1:])]
+
+
+# the parser of each process of PtpyParser's pool, by its options
+_piece_parsers = {}
+
+
+def _parse_piece((options, lineno, text)):
+    # Parse a piece of a source made by split_statements, starting at
+    # line lineno, and return its Stmt
+    try:
+        parser = _piece_parsers[options]
+    except KeyError:
+        reflags, engine, dialect, lazy_blocks, parser_engine = options
+        lexer = p_lexer.PtpyLexer(reflags=reflags, engine=engine,
+                                  dialect=dialect)
+        parser = _piece_parsers[options] = PtpyParser(
+            lexer, lazy_blocks, engine=parser_engine)
+    # blank lines before, so the lines and any error have the numbers
+    # they have in the whole source
+    return parser.parse("\n" * (lineno - 1) + text).node
               
 
 def traverse(node, level=""):
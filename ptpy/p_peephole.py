@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Peephole optimisations on the pyassem flow graph the code generators
+# build, run by them before the graph is assembled into a code object.
+# At level 1 and above:
+#
+# - constants loaded only to be popped aren't loaded, and jumps on a
+#   constant condition become a jump or nothing
+# - nao followed by a conditional jump becomes the opposite jump
+# - jumps to jumps and to empty blocks go straight to where they end
+#   up, always as absolute jumps, and a jump_if_*_or_pop to a jump on
+#   the same condition becomes the single jump
+# - code after a jump, return or sair in a block, and blocks nothing
+#   can reach, are dropped
+# - repeated SET_LINENO bookkeeping is dropped
+#
+# The graph is rewritten in place, keeping what pyassem relies on to
+# order the blocks: a block's next one is always emitted right after it.
+# A PtpyFlowGraph so optimized then lays the blocks out in the order of
+# their lines, where pyassem takes them in any order, which keeps the
+# line number table whole, and drops the jumps to the code right after
+# them, such as the one ending an if without an else.
+
+import heapq
+import sys
+
+from compiler import pyassem
+
+
+UNCONDITIONAL_JUMPS = ('JUMP_ABSOLUTE', 'JUMP_FORWARD')
+
+# jumps that pop the condition, and the jump on the opposite condition
+POP_JUMPS = {
+    'POP_JUMP_IF_FALSE': 'POP_JUMP_IF_TRUE',
+    'POP_JUMP_IF_TRUE': 'POP_JUMP_IF_FALSE',
+}
+
+# jumps that keep the condition when taken, and the same jump popping it
+OR_POP_JUMPS = {
+    'JUMP_IF_FALSE_OR_POP': 'POP_JUMP_IF_FALSE',
+    'JUMP_IF_TRUE_OR_POP': 'POP_JUMP_IF_TRUE',
+}
+
+# instructions control never goes past
+TRANSFERS = ('RETURN_VALUE', 'RAISE_VARARGS', 'JUMP_ABSOLUTE',
+             'JUMP_FORWARD', 'CONTINUE_LOOP', 'BREAK_LOOP')
+
+
+def _constant(inst):
+    # whether inst loads a constant, and not the code of a block
+    return inst[0] == 'LOAD_CONST' and not hasattr(inst[1], 'getCode')
+
+
+def _first(block):
+    # the first instruction of block making code, or None
+    for inst in block.insts:
+        if inst[0] != 'SET_LINENO':
+            return inst
+    return None
+
+
+def _targets(block):
+    return [inst[1] for inst in block.insts
+            if len(inst) == 2 and isinstance(inst[1], pyassem.Block)]
+
+
+def _falls_through(block):
+    return not block.insts or block.insts[-1][0] not in TRANSFERS
+
+
+def _destination(block):
+    """The block where a jump to block ends up, past empty blocks and
+    unconditional jumps"""
+    seen = set()
+    while block not in seen:
+        seen.add(block)
+        inst = _first(block)
+        if inst is None:
+            if not block.next:
+                break
+            block = block.next[0]
+        elif inst[0] in UNCONDITIONAL_JUMPS:
+            block = inst[1]
+        else:
+            break
+    return block
+
+
+def simplify(insts):
+    """Return the instructions of a block with the constant loads, nao
+    jumps and repeated line numbers taken out, and without anything
+    after a transfer"""
+    result = []
+    line = None
+    for inst in insts:
+        op = inst[0]
+        last = result and result[-1] or ('',)
+
+        if op == 'POP_TOP' and _constant(last):
+            result.pop()
+            continue
+
+        if op in POP_JUMPS and _constant(last):
+            result.pop()
+            if bool(last[1]) == (op == 'POP_JUMP_IF_TRUE'):
+                result.append(('JUMP_ABSOLUTE', inst[1]))
+                break
+            continue
+
+        if op in POP_JUMPS and last[0] == 'UNARY_NOT':
+            result.pop()
+            inst = POP_JUMPS[op], inst[1]
+
+        if op == 'SET_LINENO':
+            if inst[1] == line:
+                continue
+            # the line of the code after both is the last one, unless
+            # it goes back, when pyassem keeps the first
+            if last[0] == 'SET_LINENO' and inst[1] >= last[1]:
+                result.pop()
+            line = inst[1]
+
+        result.append(inst)
+        if op in TRANSFERS:
+            break
+    return result
+
+
+def thread(block):
+    """Point the jumps in block to where they end up. Return whether
+    any changed."""
+    changed = False
+    for i, inst in enumerate(block.insts):
+        op = inst[0]
+        if op in UNCONDITIONAL_JUMPS or op in POP_JUMPS:
+            target = _destination(inst[1])
+        elif op in OR_POP_JUMPS:
+            target = _destination(inst[1])
+            seen = set()
+            while target not in seen:
+                seen.add(target)
+                first = _first(target)
+                if first is None:
+                    break
+                if first[0] == op:
+                    target = _destination(first[1])
+                elif first[0] == OR_POP_JUMPS[op]:
+                    # the condition is tested again and popped there
+                    op = first[0]
+                    target = _destination(first[1])
+                    break
+                else:
+                    break
+        else:
+            continue
+
+        if op == 'JUMP_FORWARD':
+            # the destination may end up before the jump
+            op = 'JUMP_ABSOLUTE'
+        if target is inst[1] and op == inst[0]:
+            continue
+        block.insts[i] = op, target
+        changed = True
+    return changed
+
+
+def drop_dead_blocks(graph):
+    """Take the blocks control can't reach out of graph. Return whether
+    any was."""
+    reached = set()
+    todo = [graph.entry]
+    while todo:
+        block = todo.pop()
+        if block in reached:
+            continue
+        reached.add(block)
+        todo.extend(_targets(block))
+        if _falls_through(block):
+            todo.append(block.next and block.next[0] or graph.exit)
+
+    changed = False
+    for block in graph.getBlocks():
+        if block in reached or block is graph.exit:
+            continue
+        # the blocks before and after it are still emitted in order
+        before = block.prev and block.prev[0] or None
+        after = block.next and block.next[0] or None
+        if before is not None:
+            before.next = after and [after] or []
+        if after is not None:
+            after.prev = before and [before] or []
+        block.prev, block.next = [], []
+        block.insts = []
+        block.outEdges = set()
+        graph.blocks.remove(block)
+        changed = True
+
+    for block in graph.getBlocks():
+        block.outEdges = set(_targets(block))
+    return changed
+
+
+def _lines(blocks, exit):
+    # {block: the first line of it and the blocks emitted after it}
+    lines = {exit: sys.maxint}
+    for block in blocks:
+        pending = []
+        while block not in lines:
+            pending.append(block)
+            if not block.next:
+                break
+            block = block.next[0]
+        line = lines.get(block, sys.maxint)
+        for block in reversed(pending):
+            for inst in block.insts:
+                if inst[0] == 'SET_LINENO':
+                    line = inst[1]
+                    break
+            lines[block] = line
+    return lines
+
+
+def order_blocks(entry, exit):
+    """The same as pyassem.order_blocks, but when any of many blocks
+    can be emitted next, it's the one for the earliest line, so the
+    line number table, which only goes forward, keeps all lines"""
+    remaining = set()
+    todo = [entry]
+    while todo:
+        block = todo.pop()
+        if block in remaining:
+            continue
+        remaining.add(block)
+        todo.extend([child for child in block.get_children()
+                     if child not in remaining])
+
+    # the blocks each block must be emitted before, and the number of
+    # blocks still to be emitted before each
+    dominated = dict([(block, set()) for block in remaining])
+    for block in remaining:
+        for follower in block.get_followers():
+            while 1:
+                dominated[block].add(follower)
+                if follower.prev and follower.prev[0] is not block:
+                    follower = follower.prev[0]
+                else:
+                    break
+    waiting = dict.fromkeys(remaining, 0)
+    for block in remaining:
+        for follower in dominated[block]:
+            if follower in waiting:
+                waiting[follower] += 1
+
+    lines = _lines(remaining, exit)
+    ready = [(lines[block], block.bid, block) for block in remaining
+             if not waiting[block]]
+    heapq.heapify(ready)
+
+    def find_next():
+        while ready:
+            block = heapq.heappop(ready)[2]
+            if block in remaining:
+                return block
+        assert 0, 'circular dependency, cannot find next block'
+
+    order = []
+    block = entry
+    while 1:
+        order.append(block)
+        if block in remaining:
+            remaining.discard(block)
+            for follower in dominated[block]:
+                if follower in waiting:
+                    waiting[follower] -= 1
+                    if not waiting[follower]:
+                        heapq.heappush(ready, (lines[follower],
+                                               follower.bid, follower))
+        if block.next:
+            block = block.next[0]
+            continue
+        elif block is not exit and not block.has_unconditional_transfer():
+            order.append(exit)
+        if not remaining:
+            break
+        block = find_next()
+    return order
+
+
+def drop_jumps(order):
+    """Drop the jumps ending a block in order to the code emitted right
+    after it"""
+    for i, block in enumerate(order):
+        if not block.insts or block.insts[-1][0] not in UNCONDITIONAL_JUMPS:
+            continue
+        target = block.insts[-1][1]
+        for j in xrange(i + 1, len(order)):
+            if order[j] is target:
+                block.insts.pop()
+                break
+            if _first(order[j]) is not None:
+                break
+
+
+
+class PtpyFlowGraph(pyassem.PyFlowGraph):
+    """A PyFlowGraph that, once through optimize, lays its blocks out
+    with order_blocks and drop_jumps"""
+    optimized = False
+
+    def getBlocksInOrder(self):
+        if not self.optimized:
+            return pyassem.PyFlowGraph.getBlocksInOrder(self)
+        order = order_blocks(self.entry, self.exit)
+        drop_jumps(order)
+        return order
+
+
+
+def optimize(graph, level=1):
+    """Optimize the flow graph for level, in place. Level 0 leaves it
+    as it is."""
+    if level < 1:
+        return graph
+    changed = True
+    while changed:
+        changed = False
+        for block in graph.getBlocks():
+            insts = simplify(block.insts)
+            if insts != block.insts:
+                block.insts = insts
+                changed = True
+        for block in graph.getBlocks():
+            changed = thread(block) or changed
+        changed = drop_dead_blocks(graph) or changed
+    graph.optimized = True
+    return graph
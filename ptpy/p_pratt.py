@@ -0,0 +1,492 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Hand-written engine for PtpyParser(engine='pratt'): recursive descent
+# for the statements and precedence climbing for the binary operators,
+# over the grammar in p_parser. It makes the same trees, with the same
+# positions, and raises the same syntax errors as the PLY tables, but a
+# lone atom is a few calls away from its statement instead of a dozen
+# reductions through PLY's loop.
+#
+# Positions follow p_parser._positioned: a node gets the position of
+# the first symbol of its rule, which is its first token, or for the
+# operators the position of their left operand. A parenthesized atom
+# keeps its own, except as the function of a call.
+#
+# Being recursive, it takes about 80 levels of nested parentheses under
+# Python's default recursion limit, where the PLY parser takes any.
+
+from compiler.consts import OP_ASSIGN
+
+import p_ast
+import p_parser
+import p_tokens
+
+
+# binding power of the binary operators under the comparisons, all
+# left associative
+BINARY = {
+    'OR': 1,
+    'XOR': 2,
+    'AND': 3,
+    'LSHIFT': 4, 'RSHIFT': 4,
+    'PLUS': 5, 'MINUS': 5,
+    'MULT': 6, 'DIV': 6, 'MOD': 6,
+}
+
+COMPARISONS = frozenset(['LT', 'LE', 'GT', 'GE', 'NE', 'EQ', 'IS', 'IN',
+                         'BNOT'])
+
+AUGMENTED = frozenset(['IPLUS', 'IMINUS', 'IDIV', 'IMUL', 'IMOD', 'IPOW',
+                       'ILSHIFT', 'IRSHIFT', 'IAND', 'IOR', 'INOT', 'IXOR'])
+
+FLOW = {
+    'BREAK': p_ast.Break,
+    'CONTINUE': p_ast.Continue,
+    'PASS': p_ast.Pass,
+}
+
+ATOMS = {
+    'NAME': p_ast.Name,
+    'ICONST': lambda value: p_ast.Const(int(value)),
+    'FCONST': lambda value: p_ast.Const(float(value)),
+    'SCONST': p_ast.Const,
+}
+
+# tokens a test can start with
+TEST_START = frozenset(['NAME', 'ICONST', 'FCONST', 'SCONST', 'LBRACKET',
+                        'LPAREN', 'LBRACE', 'PLUS', 'MINUS', 'NOT',
+                        'BNOT'])
+
+# tokens that can go on a test after an atom. An atom followed by any
+# other is a whole test
+ATOM_FOLLOW = frozenset(['LPAREN', 'DOT', 'POW', 'BAND', 'BOR', 'IF']) | \
+    frozenset(BINARY) | COMPARISONS
+
+
+def _like(node, other):
+    # position node where other is
+    node.lineno = other.lineno
+    node.col_offset = other.col_offset
+    return node
+
+
+def read_tokens(lexer):
+    """Return the types, values, lines and offsets of the tokens of
+    lexer, and the error it raised after them, if any"""
+    if isinstance(lexer, p_tokens.TokenBufferLexer):
+        # straight from the buffer's arrays
+        tokbuf = lexer.buffer
+        return (map(tokbuf.names.__getitem__, tokbuf.types), tokbuf.values,
+                tokbuf.lines, tokbuf.starts, None)
+
+    types, values, lines, starts = [], [], [], []
+    add_type, add_value = types.append, values.append
+    add_line, add_start = lines.append, starts.append
+    error = None
+    try:
+        for tok in iter(lexer.token, None):
+            add_type(tok.type)
+            add_value(tok.value)
+            add_line(tok.lineno)
+            add_start(tok.lexpos)
+    except SyntaxError, e:
+        # raised when the parser gets to it, as the PLY engine does
+        error = e
+    return types, values, lines, starts, error
+
+
+def parse(lexer):
+    """Parse the tokens of lexer, a PtpyLexer given its input or a
+    p_tokens.TokenBufferLexer, returning the module's Stmt"""
+    types, values, lines, starts, error = read_tokens(lexer)
+    return PrattParser(types, values, lines, starts,
+                       getattr(lexer, 'line_index', None),
+                       getattr(lexer, 'dialect', None), error).file_input()
+
+
+
+class PrattParser(object):
+    """Parser over the tokens in the parallel lists types, values,
+    lines and starts, lexpos offsets in the source. error is raised
+    when the parser gets past the last token; without it, that's the
+    end of the file.
+
+    Each method parses the nonterminal of the same name in p_parser,
+    starting at token self.i and leaving it past its last token.
+    """
+
+    def __init__(self, types, values, lines, starts, line_index=None,
+                 dialect=None, error=None):
+        self.size = len(types)
+        # two past the end, so the parser can look ahead without
+        # checking for it
+        self.types = list(types) + [None, None]
+        self.values = values
+        self.lines = lines
+        self.starts = starts
+        self.line_index = line_index
+        self.dialect = dialect
+        self.exception = error
+        self.i = 0
+
+    def error(self, i):
+        """Raise the error for an unexpected token i"""
+        if i >= self.size:
+            if self.exception is not None:
+                raise self.exception
+            raise SyntaxError('invalid syntax: unexpected end of file')
+        raise p_parser.syntax_error(self.types[i], self.values[i],
+                                    self.lines[i], self.starts[i],
+                                    self.line_index)
+
+    def expect(self, type):
+        """Take a token of the given type and return its index"""
+        i = self.i
+        if self.types[i] != type:
+            self.error(i)
+        self.i = i + 1
+        return i
+
+    def position(self, i):
+        """(lineno, column) of token i"""
+        lineno = self.lines[i]
+        start = self.starts[i]
+        if start < 0:
+            # INDENT and DEDENT have no column
+            return lineno, None
+        return lineno, start - self.line_index.starts[lineno-1]
+
+    def at(self, node, i):
+        """Position node at token i"""
+        node.lineno, node.col_offset = self.position(i)
+        return node
+
+    # statements
+    def file_input(self):
+        types = self.types
+        first = self.i
+        if types[first] == 'ENDMARKER':
+            self.error(first)
+        stmts = []
+        while types[self.i] != 'ENDMARKER':
+            if types[self.i] == 'NEWLINE':
+                self.i += 1
+            else:
+                stmts.extend(self.stmt())
+        self.i += 1
+        if self.i < self.size or self.exception is not None:
+            self.error(self.i)
+
+        if types[first] == 'NEWLINE':
+            return self.at(p_ast.Stmt(stmts), first)
+        return _like(p_ast.Stmt(stmts), stmts[0])
+
+    def stmt(self):
+        """A list of statements, the small ones of a line or a
+        compound one"""
+        type = self.types[self.i]
+        if type == 'IF':
+            return [self.if_stmt()]
+        if type == 'WHILE':
+            return [self.while_stmt()]
+        if type == 'FOR':
+            return [self.for_stmt()]
+        if type == 'DEF':
+            return [self.define_stmt()]
+        return self.simple_stmt()
+
+    def simple_stmt(self):
+        types = self.types
+        stmts = [self.small_stmt()]
+        while types[self.i] == 'SEMICOLON':
+            self.i += 1
+            if types[self.i] == 'NEWLINE':
+                break
+            stmts.append(self.small_stmt())
+        self.expect('NEWLINE')
+        return stmts
+
+    def small_stmt(self):
+        i = self.i
+        type = self.types[i]
+        if type in FLOW:
+            self.i = i + 1
+            return self.at(FLOW[type](None), i)
+        if type == 'ASSERT':
+            self.i = i + 1
+            test = self.test()
+            fail = None
+            if self.types[self.i] == 'COMMA':
+                self.i += 1
+                fail = self.test()
+            return self.at(p_ast.Assert(test, fail), i)
+        if type == 'EXEC':
+            self.i = i + 1
+            name = self.values[self.expect('NAME')]
+            self.expect('IN')
+            test = self.test()
+            self.end_small_stmt()
+            node = p_ast.Exec(name, None, test)
+            p_parser._set_position(node, *self.position(i))
+            return node
+        return self.expr_stmt()
+
+    def expr_stmt(self):
+        left = self.testlist()
+        type = self.types[self.i]
+        if type == 'ASSIGN':
+            self.i += 1
+            right = self.testlist()
+            self.end_small_stmt()
+            node = p_parser.assignment(left, right)
+        elif type in AUGMENTED:
+            op = self.values[self.i]
+            self.i += 1
+            node = p_ast.AugAssign(left, op, self.testlist())
+        else:
+            node = p_ast.Discard(left)
+        p_parser._set_position(node, left.lineno, left.col_offset)
+        return node
+
+    def end_small_stmt(self):
+        # a syntax error after a small statement comes before any error
+        # making its node, as PLY checks the next token before reducing
+        if self.types[self.i] not in ('NEWLINE', 'SEMICOLON'):
+            self.error(self.i)
+
+    def if_stmt(self):
+        i = self.expect('IF')
+        types = self.types
+        tests = [(self.test(), self.colon_suite())]
+        while types[self.i] == 'ELIF':
+            self.i += 1
+            tests.append((self.test(), self.colon_suite()))
+        return self.at(p_ast.If(tests, self.else_stmt()), i)
+
+    def while_stmt(self):
+        i = self.expect('WHILE')
+        test = self.test()
+        body = self.colon_suite()
+        return self.at(p_ast.While(test, body, self.else_stmt()), i)
+
+    def for_stmt(self):
+        i = self.expect('FOR')
+        assign = p_ast.AssName(self.values[self.expect('NAME')], OP_ASSIGN)
+        self.expect('IN')
+        test = self.test()
+        body = self.colon_suite()
+        node = p_ast.For(assign, test, body, self.else_stmt())
+        p_parser._set_position(node, *self.position(i))
+        return node
+
+    def define_stmt(self):
+        i = self.expect('DEF')
+        types = self.types
+        if types[i+1] == 'NAME' and types[i+2] == 'COLON':
+            wrapper = None
+            self.i = i + 2
+            name = self.values[i+1]
+        else:
+            wrapper = self.expr()
+            name = self.values[self.expect('NAME')]
+        self.expect('COLON')
+        if types[self.i] == 'BLOCK':
+            j = self.i
+            self.i += 1
+            body = p_ast.Unparsed(self.values[j], self.dialect,
+                                  self.lines[j])
+        else:
+            body = self.suite()
+        if wrapper is None:
+            node = p_ast.Code(name, body, lazy=True)
+        else:
+            node = p_ast.Code(name, body, wrapper=wrapper, lazy=True)
+        return self.at(node, i)
+
+    def else_stmt(self):
+        if self.types[self.i] != 'ELSE':
+            return None
+        self.i += 1
+        return self.colon_suite()
+
+    def colon_suite(self):
+        self.expect('COLON')
+        return self.suite()
+
+    def suite(self):
+        i = self.i
+        types = self.types
+        if types[i] != 'NEWLINE':
+            stmts = self.simple_stmt()
+            return _like(p_ast.Stmt(stmts), stmts[0])
+        self.i = i + 1
+        self.expect('INDENT')
+        stmts = self.stmt()
+        while types[self.i] != 'DEDENT':
+            stmts.extend(self.stmt())
+        self.i += 1
+        return self.at(p_ast.Stmt(stmts), i)
+
+    # expressions
+    def testlist(self):
+        first = self.test()
+        if self.types[self.i] != 'COMMA':
+            return first
+        return _like(p_ast.Tuple(self.tests(first)), first)
+
+    def tests(self, first):
+        """first and the tests after it, each after a comma, and a
+        trailing comma"""
+        types = self.types
+        tests = [first]
+        while types[self.i] == 'COMMA':
+            self.i += 1
+            if types[self.i] not in TEST_START:
+                break
+            tests.append(self.test())
+        return tests
+
+    def test(self):
+        i = self.i
+        types = self.types
+        if types[i] in ATOMS and types[i+1] not in ATOM_FOLLOW:
+            self.i = i + 1
+            return self.at(ATOMS[types[i]](self.values[i]), i)
+
+        node = self.or_test()
+        if types[self.i] == 'IF':
+            self.i += 1
+            test = self.or_test()
+            self.expect('ELSE')
+            node = _like(p_ast.IfExp(test, node, self.test()), node)
+        return node
+
+    def or_test(self):
+        types = self.types
+        node = self.and_test()
+        while types[self.i] == 'BOR':
+            self.i += 1
+            node = _like(p_ast.Or((node, self.and_test())), node)
+        return node
+
+    def and_test(self):
+        types = self.types
+        node = self.not_test()
+        while types[self.i] == 'BAND':
+            self.i += 1
+            node = _like(p_ast.And((node, self.not_test())), node)
+        return node
+
+    def not_test(self):
+        i = self.i
+        if self.types[i] == 'BNOT':
+            self.i = i + 1
+            return self.at(p_ast.Not(self.not_test()), i)
+        return self.comparison()
+
+    def comparison(self):
+        left = self.expr()
+        i = self.i
+        types = self.types
+        type = types[i]
+        if type not in COMPARISONS:
+            return left
+        if type == 'BNOT' or (type == 'IS' and types[i+1] == 'BNOT'):
+            if type == 'BNOT' and types[i+1] != 'IN':
+                self.error(i + 1)
+            op = p_parser.keyword_comparisons[type + ' ' + types[i+1]]
+            self.i = i + 2
+        else:
+            op = p_parser.keyword_comparisons.get(type, self.values[i])
+            self.i = i + 1
+        return _like(p_parser.binary_ops[op]((left, self.expr())), left)
+
+    def expr(self, bound=1):
+        """The binary operators binding at least as tight as bound,
+        climbing to the tighter ones for their right operands"""
+        types = self.types
+        left = self.factor()
+        while True:
+            i = self.i
+            power = BINARY.get(types[i])
+            if power is None or power < bound:
+                return left
+            self.i = i + 1
+            right = self.expr(power + 1)
+            left = _like(p_parser.binary_ops[self.values[i]]((left, right)),
+                         left)
+
+    def factor(self):
+        i = self.i
+        if self.types[i] in ('PLUS', 'MINUS', 'NOT'):
+            self.i = i + 1
+            operand = self.factor()
+            return self.at(p_parser.unary_ops[self.values[i]](operand), i)
+        return self.power()
+
+    def power(self):
+        types = self.types
+        node = self.atom_attr()
+        while types[self.i] == 'POW':
+            self.i += 1
+            node = _like(p_ast.Power((node, self.atom_attr())), node)
+        return node
+
+    def atom_attr(self):
+        types = self.types
+        node = self.atom_call()
+        while types[self.i] == 'DOT':
+            self.i += 1
+            node = _like(p_ast.Getattr(node, self.atom_call().name), node)
+        return node
+
+    def atom_call(self):
+        i = self.i
+        node = self.atom()
+        if self.types[self.i] != 'LPAREN':
+            return node
+        self.i += 1
+        if self.types[self.i] == 'RPAREN':
+            args = []
+        else:
+            args = self.tests(self.test())
+        self.expect('RPAREN')
+        return self.at(p_ast.CallFunc(node, args, None, None), i)
+
+    def atom(self):
+        i = self.i
+        type = self.types[i]
+        if type in ATOMS:
+            self.i = i + 1
+            return self.at(ATOMS[type](self.values[i]), i)
+        self.i = i + 1
+        if type == 'LPAREN':
+            node = self.testlist()
+            self.expect('RPAREN')
+            return node
+        if type == 'LBRACKET':
+            items = self.tests(self.test())
+            self.expect('RBRACKET')
+            return self.at(p_ast.List(items), i)
+        if type == 'LBRACE':
+            items = [self.keyvalue()]
+            while self.types[self.i] == 'COMMA':
+                self.i += 1
+                if self.types[self.i] != 'SCONST':
+                    break
+                items.append(self.keyvalue())
+            self.expect('RBRACE')
+            return self.at(p_ast.Dict(items), i)
+        self.error(i)
+
+    def keyvalue(self):
+        i = self.expect('SCONST')
+        self.expect('COLON')
+        return self.at(p_ast.Const(self.values[i]), i), self.test()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Instrumentation of the compile pipeline. A PtpyCompiler given a
+# CompileStats marks where each phase starts and stops and counts what
+# it goes through:
+#
+#     stats = CompileStats()
+#     stats.add_hook(debug_printer())     # scope dumps to stderr
+#     PtpyCompiler(stats=stats).compile(source)
+#     stats.report()
+#
+# Phases nest, such as the peephole pass of each block running while
+# the module is assembled; each phase is only charged for the time not
+# spent in the ones nested in it.
+#
+# Allocations are the objects the garbage collector tracks made and
+# not freed during a phase, as counted by the collector. To keep the
+# count, the collector is turned off from begin to end of a measured
+# compile, for the whole process: other threads don't collect either
+# while it runs. Allocations leave out strings and numbers and are
+# approximate when other threads run at the same time.
+#
+# Hooks are called as hook(event, name, value):
+#
+#     'start', phase, None
+#     'stop', phase, (wall, cpu, allocations), the phase's own and of
+#                    the ones nested in it
+#     'count', counter, number added
+#     'debug', topic, text
+
+import gc
+import os
+import sys
+import time
+
+
+PHASES = ['lex', 'parse', 'optimize', 'analysis', 'codegen', 'peephole',
+          'assemble']
+
+COUNTERS = ['compiles', 'tokens', 'nodes', 'blocks', 'instructions']
+
+if sys.platform == 'win32':
+    # time.clock is wall time there
+    def cpu_time():
+        return sum(os.times()[:2])
+else:
+    cpu_time = time.clock
+
+
+def _now():
+    return time.time(), cpu_time(), gc.get_count()[0]
+
+
+
+class CompileStats(object):
+    """Times and counters of the compiles measured with it, kept in
+    wall, cpu and allocations, by phase, and counters, by name. Measures
+    one compile at a time."""
+    enabled = True
+
+    def __init__(self):
+        self.hooks = []
+        self.reset()
+
+    def reset(self):
+        self.wall = dict.fromkeys(PHASES, 0.0)
+        self.cpu = dict.fromkeys(PHASES, 0.0)
+        self.allocations = dict.fromkeys(PHASES, 0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        # (phase, when it started), innermost last
+        self._stack = []
+        self._mark = None
+        self._gc_enabled = None
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def _call(self, event, name, value):
+        for hook in self.hooks:
+            hook(event, name, value)
+
+    def _charge(self, now):
+        # charge the innermost phase for the time since the mark
+        if self._stack:
+            phase = self._stack[-1][0]
+            self.wall[phase] = self.wall.get(phase, 0.0) + now[0] - \
+                self._mark[0]
+            self.cpu[phase] = self.cpu.get(phase, 0.0) + now[1] - \
+                self._mark[1]
+            self.allocations[phase] = self.allocations.get(phase, 0) + \
+                now[2] - self._mark[2]
+        self._mark = now
+
+    def begin(self):
+        """Start measuring a compile, with the collector off until
+        end"""
+        self._gc_enabled = gc.isenabled()
+        gc.disable()
+        self.count('compiles')
+
+    def end(self):
+        """Stop measuring a compile, stopping the phases it left open"""
+        while self._stack:
+            self.stop()
+        if self._gc_enabled:
+            gc.enable()
+        self._gc_enabled = None
+
+    def start(self, phase):
+        now = _now()
+        self._charge(now)
+        self._stack.append((phase, now))
+        self._call('start', phase, None)
+
+    def stop(self):
+        now = _now()
+        self._charge(now)
+        phase, started = self._stack.pop()
+        self._call('stop', phase, (now[0] - started[0], now[1] - started[1],
+                                   now[2] - started[2]))
+
+    def count(self, counter, number=1):
+        self.counters[counter] = self.counters.get(counter, 0) + number
+        self._call('count', counter, number)
+
+    def debug(self, topic, text):
+        self._call('debug', topic, text)
+
+    def total(self):
+        """Wall time of every phase"""
+        return sum(self.wall.values())
+
+    def report(self, out=sys.stdout):
+        out.write("%-10s %9s %9s %11s\n" % ("phase", "wall s", "cpu s",
+                                             "allocations"))
+        phases = PHASES + sorted(set(self.wall) - set(PHASES))
+        for phase in phases:
+            out.write("%-10s %9.4f %9.4f %11i\n" % (
+                phase, self.wall[phase], self.cpu[phase],
+                self.allocations[phase]))
+        out.write("%-10s %9.4f\n" % ("total", self.total()))
+        for counter in COUNTERS + sorted(set(self.counters) - set(COUNTERS)):
+            out.write("%-12s %i\n" % (counter, self.counters[counter]))
+
+
+
+class NoStats(object):
+    """Stands for CompileStats when nothing is measured"""
+    enabled = False
+
+    def begin(self):
+        pass
+
+    def end(self):
+        pass
+
+    def start(self, phase):
+        pass
+
+    def stop(self):
+        pass
+
+    def count(self, counter, number=1):
+        pass
+
+    def debug(self, topic, text):
+        pass
+
+
+NO_STATS = NoStats()
+
+
+def debug_printer(out=sys.stderr):
+    """A hook writing the debug output to out"""
+    def hook(event, name, value):
+        if event == 'debug':
+            out.write(value)
+    return hook
+
+
+def describe_scope(scope):
+    """The text compiler.symbols' Scope.DEBUG prints for scope"""
+    return "%s %s\n\tglobals:  %s\n\tcells:  %s\n\tdefs:  %s\n" \
+        "\tuses:  %s\n\tfrees: %s\n" % (
+            scope.name, scope.nested and "nested" or "", scope.globals,
+            scope.cells, scope.defs, scope.uses, scope.frees)
+
+
+def count_nodes(tree):
+    """Number of nodes in the tree"""
+    count = 0
+    todo = [tree]
+    while todo:
+        node = todo.pop()
+        count += 1
+        todo.extend(node.getChildNodes())
+    return count
@@ -7,14 +7,31 @@ __author__ = "Pedro Werneck (pjwerneck@gmail.com)"
 __date__ = "Sat Sep 29 00:23:11 2012"
 
 
-from compiler import misc, syntax, pycodegen, visitor, symbols
+from compiler import ast, future, misc, syntax, pycodegen, visitor, symbols
 
 from compiler.consts import *
 
+import ptpy.p_ast as ptpyast
+
+# Python 2.7 split SC_GLOBAL in two, implicit being the old meaning
+try:
+    SC_GLOBAL
+except NameError:
+    SC_GLOBAL = SC_GLOBAL_IMPLICIT
+
 
 class CodeScope(symbols.Scope):
+    # what check_name answers for each name, made by resolve_scopes
+    table = None
 
     def check_name(self, name):
+        if self.table is not None:
+            try:
+                return self.table[name]
+            except KeyError:
+                if self.nested:
+                    return SC_UNKNOWN
+                return SC_GLOBAL
         if self.globals.has_key(name):
             return SC_GLOBAL
         if self.cells.has_key(name):
@@ -29,28 +46,21 @@ class CodeScope(symbols.Scope):
         else:
             return SC_GLOBAL
 
-    def add_frees(self, names):
-        child_globals = []
-        for name in names:
-            sc = self.check_name(name)
-            if self.nested:
-                if sc == SC_UNKNOWN or sc == SC_FREE:# or isinstance(self, CodeScope):
-                    self.frees[name] = 1
-                elif sc == SC_GLOBAL:
-                    child_globals.append(name)
-                #elif isinstance(self, CodeScope) and sc == SC_LOCAL:
-                #    self.cells[name] = 1
-                elif sc != SC_CELL:
-                    child_globals.append(name)
-            else:
-                if sc == SC_LOCAL:
-                    self.cells[name] = 1
-                elif sc != SC_CELL:
-                    child_globals.append(name)
+    def get_free_vars(self):
+        if self.table is None:
+            return symbols.Scope.get_free_vars(self)
+        return self.free_vars
 
-        
-        return child_globals
-        
+    def make_table(self, free):
+        """Fill the table, free being the free names"""
+        table = self.table = dict.fromkeys(self.defs, SC_LOCAL)
+        table.update(dict.fromkeys(free, SC_FREE))
+        table.update(dict.fromkeys(self.cells, SC_CELL))
+        table.update(dict.fromkeys(self.globals, SC_GLOBAL))
+        if self.nested:
+            self.free_vars = list(free)
+        else:
+            self.free_vars = ()
 
 
 #    __super_init = symbols.Scope.__init__
@@ -59,6 +69,63 @@ class CodeScope(symbols.Scope):
 #        self.__super_init(name, module)
 
 
+
+def resolve_scopes(module):
+    """Resolve the names free in the blocks in module, a ModuleScope,
+    filling their frees, cells and globals and their tables.
+
+    A name used in a nested block and not bound there is free in it
+    and in the blocks up to the one binding it, if that's the
+    outermost block. Bound by a block in between, declared global, or
+    not bound at all, it's global in them. The names each block leaves
+    unbound are found going up the blocks, and which of them are free
+    going down, a set at a time.
+    """
+    # (block, the one it's in), each after the one it's in
+    order = []
+    todo = [(scope, None) for scope in reversed(module.get_children())]
+    while todo:
+        scope, parent = todo.pop()
+        order.append((scope, parent))
+        todo.extend([(child, scope)
+                     for child in reversed(scope.get_children())])
+
+    # {nested block: (names it leaves unbound, the ones of them its
+    # blocks leave unbound)}
+    unbound = {}
+    for scope, parent in reversed(order):
+        inner = set()
+        for child in scope.get_children():
+            inner.update(unbound[child][0])
+        if not scope.nested:
+            local = set(scope.defs).difference(scope.globals)
+            scope.cells.update(dict.fromkeys(inner & local, 1))
+            continue
+        inner.difference_update(scope.defs)
+        inner.difference_update(scope.globals)
+        names = inner.union(scope.uses)
+        names.difference_update(scope.defs)
+        names.difference_update(scope.globals)
+        unbound[scope] = names, inner
+
+    # {nested block: names free in it}
+    free = {}
+    for scope, parent in order:
+        if not scope.nested:
+            scope.make_table(())
+            continue
+        names, inner = unbound.pop(scope)
+        if parent.nested:
+            names_free = names & free[parent]
+        else:
+            names_free = names.intersection(parent.defs).difference(
+                parent.globals)
+        free[scope] = names_free
+        scope.frees.update(dict.fromkeys(inner & names_free, 1))
+        scope.globals.update(dict.fromkeys(names - names_free, 1))
+        scope.make_table(names_free)
+
+
 class PtpySymbolVisitor(symbols.SymbolVisitor):
     def visitCode(self, node, parent):
         parent.add_def(node.name)
@@ -75,5 +142,137 @@ class PtpySymbolVisitor(symbols.SymbolVisitor):
         #self.klass = node.name
         self.visit(node.code, scope)
         #self.klass = prev
-        self.handle_free_vars(scope, parent)
+        parent.add_child(scope)
+
+    def visitModule(self, node):
+        symbols.SymbolVisitor.visitModule(self, node)
+        resolve_scopes(self.module)
         
+
+
+
+class PtpyAnalysis(PtpySymbolVisitor):
+    """The analysis the code generators need of a tree, made in one
+    walk over it instead of one each: it sets the filename of the
+    nodes, as misc.set_filename, finds and checks the futures, as
+    future.find_futures, and finds the scopes, as PtpySymbolVisitor,
+    and the local names of each, as the code generators' NameFinder.
+
+    syntax.check has nothing to check in this Python, so nothing is
+    done for it.
+    """
+    def __init__(self, filename):
+        PtpySymbolVisitor.__init__(self)
+        self.filename = filename
+        self.futures = ()
+        self.visit = self.dispatch
+        self._methods = {}
+        # {scope: (names bound in it, names declared global in it)}
+        self._names = {}
+        # Dict nodes the walk is in, where NameFinder doesn't look
+        self._dicts = 0
+
+    def local_names(self, scope):
+        """The local names of scope, as NameFinder.getLocals"""
+        names, globals = self._names.get(scope, ((), ()))
+        result = misc.Set()
+        for name in names:
+            if name not in globals:
+                result.add(name)
+        return result
+
+    def dispatch(self, node, *args):
+        node.filename = self.filename
+        klass = node.__class__
+        try:
+            method = self._methods[klass]
+        except KeyError:
+            method = self._methods[klass] = getattr(
+                self, 'visit' + klass.__name__, self.default)
+        return method(node, *args)
+
+    def default(self, node, *args):
+        for child in node.getChildNodes():
+            self.dispatch(child, *args)
+
+    def _bind(self, scope, name):
+        if not self._dicts:
+            self._names.setdefault(scope, (set(), set()))[0].add(name)
+
+    def visitModule(self, node):
+        parser = future.FutureParser()
+        parser.visitModule(node)
+        self.futures = parser.get_features()
+        PtpySymbolVisitor.visitModule(self, node)
+
+    def visitCode(self, node, parent):
+        self._bind(parent, node.name)
+        PtpySymbolVisitor.visitCode(self, node, parent)
+
+    def visitIf(self, node, scope):
+        # the branches skipped for a false constant still get their
+        # filename, and NameFinder still finds the names bound there
+        for test, body in node.tests:
+            if isinstance(test, ast.Const) and \
+                    type(test.value) in self._const_types and \
+                    not test.value:
+                self._skipped(test, scope)
+                self._skipped(body, scope)
+        PtpySymbolVisitor.visitIf(self, node, scope)
+
+    def _skipped(self, tree, scope):
+        # set the filename and bind the names in a branch the symbol
+        # visitor doesn't go into
+        # (node, whether NameFinder doesn't look in it)
+        todo = [(tree, bool(self._dicts))]
+        while todo:
+            node, hidden = todo.pop()
+            node.filename = self.filename
+            if not hidden:
+                if isinstance(node, (ast.AssName, ptpyast.Code)):
+                    self._bind(scope, node.name)
+                elif isinstance(node, (ast.Import, ast.From)):
+                    for name, asname in node.names:
+                        self._bind(scope, asname or name)
+                elif isinstance(node, ast.Global):
+                    self._names.setdefault(scope, (set(), set()))[1].update(
+                        node.names)
+            hidden = hidden or isinstance(node, (ptpyast.Code, ast.Dict))
+            todo.extend([(child, hidden) for child in node.getChildNodes()])
+
+    def visitDict(self, node, *args):
+        self._dicts += 1
+        try:
+            self.default(node, *args)
+        finally:
+            self._dicts -= 1
+
+    def visitAssName(self, node, scope, assign=1):
+        self._bind(scope, node.name)
+        PtpySymbolVisitor.visitAssName(self, node, scope, assign)
+
+    def visitFrom(self, node, scope):
+        if node.modname == '__future__' and \
+                not hasattr(node, 'valid_future'):
+            raise SyntaxError, "invalid future statement " + repr(node)
+        for name, asname in node.names:
+            self._bind(scope, asname or name)
+        PtpySymbolVisitor.visitFrom(self, node, scope)
+
+    def visitImport(self, node, scope):
+        for name, asname in node.names:
+            self._bind(scope, asname or name)
+        PtpySymbolVisitor.visitImport(self, node, scope)
+
+    def visitGlobal(self, node, scope):
+        self._names.setdefault(scope, (set(), set()))[1].update(node.names)
+        PtpySymbolVisitor.visitGlobal(self, node, scope)
+
+
+
+def analyze(tree, filename):
+    """Return the PtpyAnalysis of tree, a p_ast Module, whose source is
+    filename"""
+    analysis = PtpyAnalysis(filename)
+    analysis.dispatch(tree)
+    return analysis
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:23:11 2012"
+
+
+# Generates the lexer and parser tables shipped with the package. Run
+# this after changing any token rule in p_lexer or grammar rule in
+# p_parser and commit the regenerated lextab.py and parsetab.py:
+#
+#     python -m ptpy.p_tables
+#
+# At runtime the tables are only read, never written.
+
+import os
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+import ptpy.p_lexer as ptpylexer
+import ptpy.p_parser as ptpyparser
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _table_filename(tabmodule, outputdir):
+    return os.path.join(outputdir, tabmodule.split('.')[-1] + '.py')
+
+
+def write_lextab(outputdir=PACKAGE_DIR, reflags=0):
+    lexer = lex.lex(module=ptpylexer, reflags=reflags)
+    lexer.writetab(ptpylexer.LEXTAB, outputdir)
+
+    # PLY doesn't sign lexer tables, so we append our own signature
+    # for get_lexer to check
+    f = open(_table_filename(ptpylexer.LEXTAB, outputdir), 'a')
+    try:
+        f.write("_signature    = %r\n" % ptpylexer.lexer_signature(reflags))
+    finally:
+        f.close()
+
+
+def write_parsetab(outputdir=PACKAGE_DIR):
+    # yacc only writes when the current table doesn't match the grammar
+    yacc.yacc(module=ptpyparser,
+              tabmodule=ptpyparser.PARSETAB,
+              outputdir=outputdir,
+              write_tables=1,
+              debug=0)
+
+
+def main():
+    # relative, so the path PLY records in the table header doesn't
+    # depend on the machine the tables were built on
+    outputdir = os.path.relpath(PACKAGE_DIR)
+    write_lextab(outputdir)
+    write_parsetab(outputdir)
+
+
+if __name__ == '__main__':
+    main()
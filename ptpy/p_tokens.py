@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# contributor : Pedro Werneck
+# name : Python file template .... :
+
+__author__ = "Pedro Werneck (pjwerneck@gmail.com)"
+__date__ = "Sat Sep 29 00:21:50 2012"
+
+
+from array import array
+from bisect import bisect_right
+
+import ply.lex as lex
+
+
+
+class TokenBuffer(object):
+    """All the tokens of a source, stored as parallel arrays.
+
+    Token i has type names[types[i]], value values[i], line lines[i]
+    and spans starts[i]:ends[i] in the source. Synthesized tokens
+    (INDENT, DEDENT, ENDMARKER) have an empty span. Repeated values
+    such as names, keywords and operators are stored once.
+    """
+
+    def __init__(self, names, line_index=None):
+        self.names = list(names)
+        self.line_index = line_index
+        self.codes = dict((name, code) for code, name in enumerate(self.names))
+
+        self.types = array('B')
+        self.starts = array('l')
+        self.ends = array('l')
+        self.lines = array('l')
+        self.values = []
+
+        self.append = self._appender()
+
+    def _appender(self):
+        # The token factory for p_lexer.fused_scan, called once per
+        # token, so everything it touches is bound up front
+        codes = self.codes
+        types = self.types.append
+        starts = self.starts.append
+        ends = self.ends.append
+        lines = self.lines.append
+        values = self.values.append
+        interned = {}.setdefault
+        literals = ('SCONST', 'FCONST', 'ICONST')
+
+        def append(type, value, lineno, lexpos, size=0):
+            if value is not None and type not in literals:
+                value = interned(value, value)
+            types(codes[type])
+            starts(lexpos)
+            ends(lexpos + size)
+            lines(lineno)
+            values(value)
+
+        return append
+
+    def __len__(self):
+        return len(self.types)
+
+    def type(self, i):
+        return self.names[self.types[i]]
+
+    def __getitem__(self, i):
+        tok = lex.LexToken()
+        tok.type = self.names[self.types[i]]
+        tok.value = self.values[i]
+        tok.lineno = self.lines[i]
+        tok.lexpos = self.starts[i]
+        return tok
+
+    def __iter__(self):
+        for i in xrange(len(self.types)):
+            yield self[i]
+
+    def lexer(self):
+        """Return an object feeding these tokens to a PLY parser"""
+        return TokenBufferLexer(self)
+
+
+
+class TokenBufferLexer(object):
+    """Adapter giving a TokenBuffer the token() method PLY's parser
+    calls, making each LexToken only when the parser asks for it"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.line_index = buffer.line_index
+        self.index = 0
+
+    def token(self):
+        i = self.index
+        if i >= len(self.buffer.types):
+            return None
+        self.index = i + 1
+        return self.buffer[i]
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+
+
+class LineIndex(object):
+    """Offsets where the lines of a source start, filled in by the
+    lexer as it goes. Lines are counted from 1 and columns from 0."""
+
+    def __init__(self):
+        self.starts = array('l', [0])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def position(self, offset):
+        """Return the (lineno, column) of offset"""
+        lineno = bisect_right(self.starts, offset)
+        return lineno, offset - self.starts[lineno-1]
+
+    def column(self, lineno, offset):
+        """Column of offset, known to be on line lineno"""
+        return offset - self.starts[lineno-1]
@@ -0,0 +1,163 @@
+
+# ptpy/parsetab.py
+# This file is automatically generated. Do not edit.
+_tabversion = '3.2'
+
+_lr_method = 'LALR'
+
+_lr_signature = '\xcb\x87t\x92\xd7\xee\xdcP\xa8\x8e[\xc1\x18\x11v\x19'
+    
+_lr_action_items = {'IAND':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,65,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'INOT':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,68,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'ELIF':([56,121,124,125,188,190,199,211,220,224,],[123,-8,123,-54,-9,-53,-58,-56,-55,-59,]),'ENDMARKER':([4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,124,125,188,190,198,199,200,201,203,207,211,215,216,218,220,223,224,226,],[-4,-6,-10,-48,-7,-5,112,-13,-12,-11,-50,-49,-2,-3,-8,-51,-54,-9,-53,-39,-58,-41,-57,-52,-43,-56,-40,-42,-44,-55,-45,-59,-46,]),'BOR':([6,7,15,17,18,23,24,29,30,32,36,37,38,40,43,46,48,52,55,59,60,92,107,111,126,129,130,146,147,148,149,150,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,184,185,191,192,195,196,208,],[-94,-82,-90,80,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-63,-107,-106,-96,-95,-66,-97,-104,-109,-111,-83,-93,-92,-91,-62,80,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-64,-113,-110,-112,-75,-77,-120,]),'IN':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,63,88,99,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,89,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,132,158,167,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'IMUL':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,70,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'IOR':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,72,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'ASSERT':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,122,124,125,162,164,174,186,188,190,198,199,200,201,202,203,207,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[44,-4,-6,-10,-48,-7,-5,44,-13,-12,-11,-50,-49,-2,-3,-8,44,-51,-54,44,44,44,44,-9,-53,-39,-58,-41,-57,44,-52,-43,-56,44,44,-40,-42,44,-44,-55,44,-61,-45,-59,-60,-46,]),'WHILE':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,124,125,188,190,198,199,200,201,203,207,211,214,215,216,218,220,221,222,223,224,225,226,],[35,-4,-6,-10,-48,-7,-5,35,-13,-12,-11,-50,-49,-2,-3,-8,-51,-54,-9,-53,-39,-58,-41,-57,-52,-43,-56,35,-40,-42,-44,-55,35,-61,-45,-59,-60,-46,]),'BNOT':([0,2,4,6,7,10,15,16,18,19,22,23,24,26,28,29,32,35,36,37,38,40,41,44,45,46,49,50,51,52,53,55,56,59,60,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,83,95,107,110,111,113,114,117,118,121,122,123,124,125,126,127,128,129,130,132,146,147,148,161,162,164,165,166,167,168,169,171,172,173,174,175,178,181,182,185,186,188,190,191,192,194,198,199,200,201,202,203,207,208,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[19,19,-4,-94,-82,-6,-90,-10,88,19,-48,-102,-84,-7,-5,-80,-87,19,-108,-100,-103,-105,19,19,-13,-98,19,19,-12,-107,-11,-106,-50,-96,-95,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,152,-49,-97,19,-104,-2,-3,19,19,-8,19,19,-51,-54,-109,19,19,-111,-83,19,-93,-92,-91,-79,19,19,-86,-85,19,-81,-114,19,-88,-89,19,-101,-121,19,-99,-113,19,-9,-53,-110,-112,19,-39,-58,-41,-57,19,-52,-43,-120,19,-56,19,19,-40,-42,19,-44,-55,19,-61,-45,-59,-60,-46,]),'LSHIFT':([6,15,23,24,32,36,37,38,40,46,52,55,59,60,93,107,111,126,129,130,146,147,148,165,166,169,172,173,175,178,182,185,191,192,208,],[-94,-90,-102,98,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,-97,-104,-109,-111,98,-93,-92,-91,-86,-85,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'IPOW':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,74,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'RSHIFT':([6,15,23,24,32,36,37,38,40,46,52,55,59,60,93,107,111,126,129,130,146,147,148,165,166,169,172,173,175,178,182,185,191,192,208,],[-94,-90,-102,97,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,-97,-104,-109,-111,97,-93,-92,-91,-86,-85,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'ILSHIFT':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,75,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'MINUS':([0,2,3,4,5,6,10,15,16,19,20,22,23,26,28,32,34,35,36,37,38,40,41,44,45,46,49,50,51,52,53,55,56,59,60,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,93,95,97,98,100,105,106,107,110,111,113,114,117,118,121,122,123,124,125,126,127,128,129,132,146,147,148,152,158,162,164,165,166,167,169,171,172,173,174,175,178,181,182,185,186,188,190,191,192,194,198,199,200,201,202,203,207,208,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[3,3,3,-4,3,-94,-6,-90,-10,3,3,-48,-102,-7,-5,106,3,3,-108,-100,-103,-105,3,3,-13,-98,3,3,-12,-107,-11,-106,-50,-96,-95,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,-105,-49,3,3,3,3,3,-97,3,-104,-2,-3,3,3,-8,3,3,-51,-54,-109,3,3,-111,3,-93,-92,-91,3,3,3,3,106,106,3,-114,3,-88,-89,3,-101,-121,3,-99,-113,3,-9,-53,-110,-112,3,-39,-58,-41,-57,3,-52,-43,-120,3,-56,3,3,-40,-42,3,-44,-55,3,-61,-45,-59,-60,-46,]),'DEF':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,124,125,188,190,198,199,200,201,203,207,211,214,215,216,218,220,221,222,223,224,225,226,],[20,-4,-6,-10,-48,-7,-5,20,-13,-12,-11,-50,-49,-2,-3,-8,-51,-54,-9,-53,-39,-58,-41,-57,-52,-43,-56,20,-40,-42,-44,-55,20,-61,-45,-59,-60,-46,]),'IPLUS':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,64,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'LE':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,82,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'RPAREN':([6,7,8,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,110,111,117,119,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,176,177,178,179,180,182,183,184,185,191,192,195,196,208,209,213,219,],[-94,-82,-124,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,178,-104,-123,185,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-133,208,-121,-130,-134,-99,-127,-64,-113,-110,-112,-75,-77,-120,-131,-129,-132,]),'FCONST':([0,2,3,4,5,10,16,19,20,22,26,28,34,35,41,44,45,49,50,51,53,56,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,95,97,98,100,105,106,109,110,113,114,116,117,118,121,122,123,124,125,127,128,132,152,158,162,164,167,171,174,181,186,188,190,194,198,199,200,201,202,203,207,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[52,52,52,-4,52,-6,-10,52,52,-48,-7,-5,52,52,52,52,-13,52,52,-12,-11,-50,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,-49,52,52,52,52,52,52,52,-2,-3,52,52,52,-8,52,52,-51,-54,52,52,52,52,52,52,52,52,52,52,52,52,-9,-53,52,-39,-58,-41,-57,52,-52,-43,52,-56,52,52,-40,-42,52,-44,-55,52,-61,-45,-59,-60,-46,]),'SEMICOLON':([1,6,7,8,11,12,13,14,15,17,18,21,23,24,25,29,30,32,33,36,37,38,40,42,43,46,47,48,52,54,55,59,60,62,92,107,111,115,117,126,129,130,131,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,187,191,192,193,195,196,208,210,213,],[-15,-94,-82,-124,-38,-17,-22,-16,-90,-128,-78,-18,-102,-84,-19,-80,-67,-87,-21,-108,-100,-103,-105,-20,-65,-98,-122,-63,-107,122,-106,-96,-95,-125,-66,-97,-104,-23,-123,-109,-111,-83,-126,-25,-33,-36,-29,-35,-37,-28,-27,-34,-32,-30,-31,-26,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-14,-110,-112,-47,-75,-77,-120,-24,-129,]),'POW':([23,36,37,38,40,46,52,55,93,111,126,129,169,175,178,182,185,191,192,208,],[-102,-108,-100,-103,-105,116,-107,-106,-105,-104,-109,-111,-114,-101,-121,-99,-113,-110,-112,-120,]),'DEDENT':([10,16,22,26,45,51,53,56,95,121,124,125,188,190,198,199,200,201,203,207,211,215,216,218,220,221,222,223,224,225,226,],[-6,-10,-48,-7,-13,-12,-11,-50,-49,-8,-51,-54,-9,-53,-39,-58,-41,-57,-52,-43,-56,-40,-42,-44,-55,224,-61,-45,-59,-60,-46,]),'NEWLINE':([0,1,4,6,7,8,10,11,12,13,14,15,16,17,18,21,22,23,24,25,26,28,29,30,32,33,36,37,38,40,41,42,43,45,46,47,48,51,52,53,54,55,56,59,60,62,92,95,107,111,113,114,115,117,121,122,124,125,126,129,130,131,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,151,153,154,155,156,157,159,160,161,162,164,165,166,168,169,172,173,174,175,178,182,183,184,185,186,187,188,190,191,192,193,195,196,198,199,200,201,202,203,207,208,210,211,212,213,215,216,217,218,220,223,224,226,],[4,-15,-4,-94,-82,-124,-6,-38,-17,-22,-16,-90,-10,-128,-78,-18,-48,-102,-84,-19,-7,-5,-80,-67,-87,-21,-108,-100,-103,-105,113,-20,-65,-13,-98,-122,-63,-12,-107,-11,121,-106,-50,-96,-95,-125,-66,-49,-97,-104,-2,-3,-23,-123,-8,188,-51,-54,-109,-111,-83,-126,-25,-33,-36,-29,-35,-37,-28,-27,-34,-32,-30,-31,-26,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,197,197,-86,-85,-81,-114,-88,-89,197,-101,-121,-99,-127,-64,-113,197,-14,-9,-53,-110,-112,-47,-75,-77,-39,-58,-41,-57,197,-52,-43,-120,-24,-56,197,-129,-40,-42,197,-44,-55,-45,-59,-46,]),'NE':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,85,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'SCONST':([0,2,3,4,5,10,16,19,20,22,26,28,31,34,35,41,44,45,49,50,51,53,56,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,95,97,98,100,105,106,109,110,113,114,116,117,118,121,122,123,124,125,127,128,132,152,158,162,164,167,170,171,174,181,186,188,190,194,198,199,200,201,202,203,207,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[36,36,36,-4,36,-6,-10,36,36,-48,-7,-5,104,36,36,36,36,-13,36,36,-12,-11,-50,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,-49,36,36,36,36,36,36,36,-2,-3,36,36,36,-8,36,36,-51,-54,36,36,36,36,36,36,36,36,104,36,36,36,36,-9,-53,36,-39,-58,-41,-57,36,-52,-43,36,-56,36,36,-40,-42,36,-44,-55,36,-61,-45,-59,-60,-46,]),'LT':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,86,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'PLUS':([0,2,3,4,5,6,10,15,16,19,20,22,23,26,28,32,34,35,36,37,38,40,41,44,45,46,49,50,51,52,53,55,56,59,60,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,93,95,97,98,100,105,106,107,110,111,113,114,117,118,121,122,123,124,125,126,127,128,129,132,146,147,148,152,158,162,164,165,166,167,169,171,172,173,174,175,178,181,182,185,186,188,190,191,192,194,198,199,200,201,202,203,207,208,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[5,5,5,-4,5,-94,-6,-90,-10,5,5,-48,-102,-7,-5,105,5,5,-108,-100,-103,-105,5,5,-13,-98,5,5,-12,-107,-11,-106,-50,-96,-95,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,5,-105,-49,5,5,5,5,5,-97,5,-104,-2,-3,5,5,-8,5,5,-51,-54,-109,5,5,-111,5,-93,-92,-91,5,5,5,5,105,105,5,-114,5,-88,-89,5,-101,-121,5,-99,-113,5,-9,-53,-110,-112,5,-39,-58,-41,-57,5,-52,-43,-120,5,-56,5,5,-40,-42,5,-44,-55,5,-61,-45,-59,-60,-46,]),'MULT':([6,15,23,36,37,38,40,46,52,55,59,60,93,107,111,126,129,146,147,148,169,172,173,175,178,182,185,191,192,208,],[-94,79,-102,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,-97,-104,-109,-111,-93,-92,-91,-114,79,79,-101,-121,-99,-113,-110,-112,-120,]),'COLON':([6,7,15,17,18,23,24,29,30,32,36,37,38,40,43,46,48,52,55,59,60,92,93,96,104,107,108,111,120,126,129,130,146,147,148,149,151,153,154,155,156,157,159,160,161,163,165,166,168,169,172,173,175,178,182,184,185,189,191,192,195,196,204,208,213,],[-94,-82,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-63,-107,-106,-96,-95,-66,162,164,171,-97,174,-104,186,-109,-111,-83,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,202,-86,-85,-81,-114,-88,-89,-101,-121,-99,-64,-113,212,-110,-112,-75,-77,217,-120,-129,]),'IDIV':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,71,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'ASSIGN':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,69,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'BLOCK':([162,202,],[201,201,]),'$end':([39,112,],[0,-1,]),'GT':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,87,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'XOR':([6,7,15,23,24,29,32,36,37,38,40,46,52,55,59,60,93,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,-102,-84,100,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,-97,-104,-109,-111,-83,-93,-92,-91,100,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'RBRACE':([6,7,15,17,18,23,24,29,30,32,36,37,38,40,43,46,48,52,55,59,60,92,101,102,103,107,111,126,129,130,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,170,172,173,175,178,182,184,185,191,192,195,196,205,206,208,213,],[-94,-82,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-63,-107,-106,-96,-95,-66,169,-115,-118,-97,-104,-109,-111,-83,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-116,-88,-89,-101,-121,-99,-64,-113,-110,-112,-75,-77,-117,-119,-120,-129,]),'FOR':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,124,125,188,190,198,199,200,201,203,207,211,214,215,216,218,220,221,222,223,224,225,226,],[27,-4,-6,-10,-48,-7,-5,27,-13,-12,-11,-50,-49,-2,-3,-8,-51,-54,-9,-53,-39,-58,-41,-57,-52,-43,-56,27,-40,-42,-44,-55,27,-61,-45,-59,-60,-46,]),'EXEC':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,122,124,125,162,164,174,186,188,190,198,199,200,201,202,203,207,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[9,-4,-6,-10,-48,-7,-5,9,-13,-12,-11,-50,-49,-2,-3,-8,9,-51,-54,9,9,9,9,-9,-53,-39,-58,-41,-57,9,-52,-43,-56,9,9,-40,-42,9,-44,-55,9,-61,-45,-59,-60,-46,]),'IS':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,83,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'ELSE':([6,7,15,18,22,23,24,29,30,32,36,37,38,40,43,46,48,52,55,56,59,60,92,107,111,121,124,125,126,129,130,146,147,148,149,150,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,184,185,188,190,191,192,195,196,199,207,208,211,220,223,224,],[-94,-82,-90,-78,96,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-63,-107,-106,-50,-96,-95,-66,-97,-104,-8,-51,-54,-109,-111,-83,-93,-92,-91,-62,194,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-64,-113,-9,-53,-110,-112,-75,-77,-58,96,-120,-56,-55,96,-59,]),'BAND':([6,7,15,18,23,24,29,30,32,36,37,38,40,43,46,48,52,55,59,60,92,107,111,126,129,130,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,184,185,191,192,195,196,208,],[-94,-82,-90,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,118,-107,-106,-96,-95,-66,-97,-104,-109,-111,-83,-93,-92,-91,118,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-64,-113,-110,-112,-75,-77,-120,]),'GE':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,84,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'ICONST':([0,2,3,4,5,10,16,19,20,22,26,28,34,35,41,44,45,49,50,51,53,56,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,95,97,98,100,105,106,109,110,113,114,116,117,118,121,122,123,124,125,127,128,132,152,158,162,164,167,171,174,181,186,188,190,194,198,199,200,201,202,203,207,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[55,55,55,-4,55,-6,-10,55,55,-48,-7,-5,55,55,55,55,-13,55,55,-12,-11,-50,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,55,-49,55,55,55,55,55,55,55,-2,-3,55,55,55,-8,55,55,-51,-54,55,55,55,55,55,55,55,55,55,55,55,55,-9,-53,55,-39,-58,-41,-57,55,-52,-43,55,-56,55,55,-40,-42,55,-44,-55,55,-61,-45,-59,-60,-46,]),'LPAREN':([0,2,3,4,5,10,16,19,20,22,26,28,34,35,36,38,40,41,44,45,49,50,51,52,53,55,56,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,93,95,97,98,100,105,106,109,110,113,114,116,117,118,121,122,123,124,125,126,127,128,129,132,152,158,162,164,167,169,171,174,181,185,186,188,190,191,192,194,198,199,200,201,202,203,207,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[49,49,49,-4,49,-6,-10,49,49,-48,-7,-5,49,49,-108,110,-105,49,49,-13,49,49,-12,-107,-11,-106,-50,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,49,-105,-49,49,49,49,49,49,49,49,-2,-3,49,49,49,-8,49,49,-51,-54,-109,49,49,-111,49,49,49,49,49,49,-114,49,49,49,-113,49,-9,-53,-110,-112,49,-39,-58,-41,-57,49,-52,-43,49,-56,49,49,-40,-42,49,-44,-55,49,-61,-45,-59,-60,-46,]),'PASS':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,122,124,125,162,164,174,186,188,190,198,199,200,201,202,203,207,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[13,-4,-6,-10,-48,-7,-5,13,-13,-12,-11,-50,-49,-2,-3,-8,13,-51,-54,13,13,13,13,-9,-53,-39,-58,-41,-57,13,-52,-43,-56,13,13,-40,-42,13,-44,-55,13,-61,-45,-59,-60,-46,]),'DOT':([23,36,37,38,40,52,55,93,111,126,129,169,175,178,182,185,191,192,208,],[-102,-108,109,-103,-105,-107,-106,-105,-104,-109,-111,-114,-101,-121,109,-113,-110,-112,-120,]),'EQ':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,107,111,126,129,130,146,147,148,161,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,-82,-90,90,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-97,-104,-109,-111,-83,-93,-92,-91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'IMINUS':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,76,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'IF':([0,4,6,7,10,15,16,17,18,22,23,24,26,28,29,30,32,36,37,38,40,41,43,45,46,48,51,52,53,55,56,59,60,92,95,107,111,113,114,121,124,125,126,129,130,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,184,185,188,190,191,192,195,196,198,199,200,201,203,207,208,211,214,215,216,218,220,221,222,223,224,225,226,],[50,-4,-94,-82,-6,-90,-10,81,-78,-48,-102,-84,-7,-5,-80,-67,-87,-108,-100,-103,-105,50,-65,-13,-98,-63,-12,-107,-11,-106,-50,-96,-95,-66,-49,-97,-104,-2,-3,-8,-51,-54,-109,-111,-83,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-64,-113,-9,-53,-110,-112,-75,-77,-39,-58,-41,-57,-52,-43,-120,-56,50,-40,-42,-44,-55,50,-61,-45,-59,-60,-46,]),'AND':([6,7,15,23,24,32,36,37,38,40,46,52,55,59,60,93,107,111,126,129,130,146,147,148,165,166,168,169,172,173,175,178,182,185,191,192,208,],[-94,61,-90,-102,-84,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,-97,-104,-109,-111,-83,-93,-92,-91,-86,-85,61,-114,-88,-89,-101,-121,-99,-113,-110,-112,-120,]),'LBRACKET':([0,2,3,4,5,10,16,19,20,22,26,28,34,35,41,44,45,49,50,51,53,56,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,95,97,98,100,105,106,109,110,113,114,116,117,118,121,122,123,124,125,127,128,132,152,158,162,164,167,171,174,181,186,188,190,194,198,199,200,201,202,203,207,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[2,2,2,-4,2,-6,-10,2,2,-48,-7,-5,2,2,2,2,-13,2,2,-12,-11,-50,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,-49,2,2,2,2,2,2,2,-2,-3,2,2,2,-8,2,2,-51,-54,2,2,2,2,2,2,2,2,2,2,2,2,-9,-53,2,-39,-58,-41,-57,2,-52,-43,2,-56,2,2,-40,-42,2,-44,-55,2,-61,-45,-59,-60,-46,]),'LBRACE':([0,2,3,4,5,10,16,19,20,22,26,28,34,35,41,44,45,49,50,51,53,56,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,95,97,98,100,105,106,109,110,113,114,116,117,118,121,122,123,124,125,127,128,132,152,158,162,164,167,171,174,181,186,188,190,194,198,199,200,201,202,203,207,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[31,31,31,-4,31,-6,-10,31,31,-48,-7,-5,31,31,31,31,-13,31,31,-12,-11,-50,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,-49,31,31,31,31,31,31,31,-2,-3,31,31,31,-8,31,31,-51,-54,31,31,31,31,31,31,31,31,31,31,31,31,-9,-53,31,-39,-58,-41,-57,31,-52,-43,31,-56,31,31,-40,-42,31,-44,-55,31,-61,-45,-59,-60,-46,]),'INDENT':([197,],[214,]),'NAME':([0,2,3,4,5,6,7,9,10,15,16,19,20,22,23,24,26,27,28,29,32,34,35,36,37,38,40,41,44,45,46,49,50,51,52,53,55,56,59,60,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,93,94,95,97,98,100,105,106,107,109,110,111,113,114,116,117,118,121,122,123,124,125,126,127,128,129,130,132,146,147,148,152,158,161,162,164,165,166,167,168,169,171,172,173,174,175,178,181,182,185,186,188,190,191,192,194,198,199,200,201,202,203,207,208,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[40,40,40,-4,40,-94,-82,63,-6,-90,-10,40,93,-48,-102,-84,-7,99,-5,-80,-87,40,40,-108,-100,-103,-105,40,40,-13,-98,40,40,-12,-107,-11,-106,-50,-96,-95,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,-105,163,-49,40,40,40,40,40,-97,40,40,-104,-2,-3,40,40,40,-8,40,40,-51,-54,-109,40,40,-111,-83,40,-93,-92,-91,40,40,-79,40,40,-86,-85,40,-81,-114,40,-88,-89,40,-101,-121,40,-99,-113,40,-9,-53,-110,-112,40,-39,-58,-41,-57,40,-52,-43,-120,40,-56,40,40,-40,-42,40,-44,-55,40,-61,-45,-59,-60,-46,]),'IMOD':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,67,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'IXOR':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,66,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'BREAK':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,122,124,125,162,164,174,186,188,190,198,199,200,201,202,203,207,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[42,-4,-6,-10,-48,-7,-5,42,-13,-12,-11,-50,-49,-2,-3,-8,42,-51,-54,42,42,42,42,-9,-53,-39,-58,-41,-57,42,-52,-43,-56,42,42,-40,-42,42,-44,-55,42,-61,-45,-59,-60,-46,]),'CONTINUE':([0,4,10,16,22,26,28,41,45,51,53,56,95,113,114,121,122,124,125,162,164,174,186,188,190,198,199,200,201,202,203,207,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[33,-4,-6,-10,-48,-7,-5,33,-13,-12,-11,-50,-49,-2,-3,-8,33,-51,-54,33,33,33,33,-9,-53,-39,-58,-41,-57,33,-52,-43,-56,33,33,-40,-42,33,-44,-55,33,-61,-45,-59,-60,-46,]),'NOT':([0,2,3,4,5,10,16,19,20,22,26,28,34,35,41,44,45,49,50,51,53,56,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,95,97,98,100,105,106,110,113,114,117,118,121,122,123,124,125,127,128,132,152,158,162,164,167,171,174,181,186,188,190,194,198,199,200,201,202,203,207,209,211,212,214,215,216,217,218,220,221,222,223,224,225,226,],[34,34,34,-4,34,-6,-10,34,34,-48,-7,-5,34,34,34,34,-13,34,34,-12,-11,-50,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,-49,34,34,34,34,34,34,-2,-3,34,34,-8,34,34,-51,-54,34,34,34,34,34,34,34,34,34,34,34,34,-9,-53,34,-39,-58,-41,-57,34,-52,-43,34,-56,34,34,-40,-42,34,-44,-55,34,-61,-45,-59,-60,-46,]),'IRSHIFT':([6,7,8,11,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,59,60,62,92,107,111,117,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-124,73,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-122,-63,-107,-106,-96,-95,-125,-66,-97,-104,-123,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'RBRACKET':([6,7,15,17,18,23,24,29,30,32,36,37,38,40,43,46,48,52,55,57,58,59,60,92,107,111,126,127,128,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,183,184,185,191,192,195,196,208,213,],[-94,-82,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,-63,-107,-106,126,129,-96,-95,-66,-97,-104,-109,191,192,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-127,-64,-113,-110,-112,-75,-77,-120,-129,]),'COMMA':([6,7,8,15,17,18,23,24,29,30,32,36,37,38,40,43,46,47,48,52,55,57,58,59,60,92,102,103,107,111,115,126,129,130,131,146,147,148,149,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,176,178,179,180,182,183,184,185,191,192,195,196,205,206,208,213,219,],[-94,-82,62,-90,-128,-78,-102,-84,-80,-67,-87,-108,-100,-103,-105,-65,-98,117,-63,-107,-106,127,128,-96,-95,-66,170,-118,-97,-104,181,-109,-111,-83,-126,-93,-92,-91,-62,-69,-74,-71,-72,-68,-70,-76,-73,-79,-86,-85,-81,-114,-88,-89,-101,-133,-121,209,-134,-99,-127,-64,-113,-110,-112,-75,-77,-117,-119,-120,-129,-132,]),'OR':([6,7,15,18,23,24,29,32,36,37,38,40,46,52,55,59,60,93,94,107,111,126,129,130,146,147,148,151,153,154,155,156,157,159,160,161,165,166,168,169,172,173,175,178,182,185,191,192,195,196,208,],[-94,-82,-90,91,-102,-84,-80,-87,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,91,-97,-104,-109,-111,-83,-93,-92,-91,91,91,91,91,91,91,91,91,-79,-86,-85,-81,-114,-88,-89,-101,-121,-99,-113,-110,-112,91,91,-120,]),'DIV':([6,15,23,36,37,38,40,46,52,55,59,60,93,107,111,126,129,146,147,148,169,172,173,175,178,182,185,191,192,208,],[-94,78,-102,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,-97,-104,-109,-111,-93,-92,-91,-114,78,78,-101,-121,-99,-113,-110,-112,-120,]),'MOD':([6,15,23,36,37,38,40,46,52,55,59,60,93,107,111,126,129,146,147,148,169,172,173,175,178,182,185,191,192,208,],[-94,77,-102,-108,-100,-103,-105,-98,-107,-106,-96,-95,-105,-97,-104,-109,-111,-93,-92,-91,-114,77,77,-101,-121,-99,-113,-110,-112,-120,]),}
+
+_lr_action = { }
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = { }
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'block':([162,202,],[200,216,]),'small_stmt':([0,41,122,162,164,174,186,202,212,214,217,221,],[1,1,187,1,1,1,1,1,1,1,1,1,]),'atom_attr':([0,2,3,5,19,20,34,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,97,98,100,105,106,110,116,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,182,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,]),'keyvalues':([31,],[102,]),'not_test':([0,2,19,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,110,117,118,122,123,127,128,132,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[43,43,92,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,184,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'arglist':([110,],[177,]),'else_stmt':([22,207,223,],[95,218,226,]),'flow_stmt':([0,41,122,162,164,174,186,202,212,214,217,221,],[21,21,21,21,21,21,21,21,21,21,21,21,]),'file_input_end':([0,],[39,]),'conds':([0,41,214,221,],[22,22,22,22,]),'stmts':([214,],[221,]),'arguments':([110,],[179,]),'atom_call':([0,2,3,5,19,20,34,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,97,98,100,105,106,109,110,116,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,175,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,]),'shift_expr':([0,2,19,20,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,82,83,84,85,86,87,89,90,91,100,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[24,24,24,24,24,24,24,24,24,130,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,]),'define_stmt':([0,41,214,221,],[45,45,45,45,]),'keyvaluelist':([31,],[101,]),'exec_stmt':([0,41,122,162,164,174,186,202,212,214,217,221,],[25,25,25,25,25,25,25,25,25,25,25,25,]),'factor':([0,2,3,5,19,20,34,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,97,98,100,105,106,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[6,6,59,60,6,6,107,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,146,147,148,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,]),'test':([0,2,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,110,117,122,123,127,128,132,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[47,57,108,47,115,47,120,131,47,47,47,47,47,47,47,47,47,47,47,47,47,180,183,47,189,183,131,193,47,47,204,206,47,210,47,213,47,180,47,47,47,47,]),'suite':([162,164,174,186,202,212,217,],[198,203,207,211,215,220,223,]),'compound_stmt':([0,41,214,221,],[26,26,26,26,]),'and_expr':([0,2,19,20,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,82,83,84,85,86,87,89,90,91,100,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,168,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,]),'tests':([0,2,41,49,64,65,66,67,68,69,70,71,72,73,74,75,76,122,162,164,174,186,202,212,214,217,221,],[8,58,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,8,]),'power':([0,2,3,5,19,20,34,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,97,98,100,105,106,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,]),'simple_stmt':([0,41,162,164,174,186,202,212,214,217,221,],[10,10,199,199,199,199,199,199,10,199,10,]),'testlist':([0,41,49,64,65,66,67,68,69,70,71,72,73,74,75,76,122,162,164,174,186,202,212,214,217,221,],[11,11,119,133,134,135,136,137,138,139,140,141,142,143,144,145,11,11,11,11,11,11,11,11,11,11,]),'stmt':([0,41,214,221,],[28,114,222,225,]),'argument':([110,209,],[176,219,]),'assert_stmt':([0,41,122,162,164,174,186,202,212,214,217,221,],[12,12,12,12,12,12,12,12,12,12,12,12,]),'for_stmt':([0,41,214,221,],[51,51,51,51,]),'and_test':([0,2,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,110,117,122,123,127,128,132,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,149,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,]),'atom':([0,2,3,5,19,20,34,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,89,90,91,97,98,100,105,106,109,110,116,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,]),'expr_stmt':([0,41,122,162,164,174,186,202,212,214,217,221,],[14,14,14,14,14,14,14,14,14,14,14,14,]),'comparison':([0,2,19,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,110,117,118,122,123,127,128,132,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,]),'term':([0,2,19,20,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,82,83,84,85,86,87,89,90,91,97,98,100,105,106,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,172,173,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,]),'if_stmt':([0,41,214,221,],[16,16,16,16,]),'arith_expr':([0,2,19,20,35,41,44,49,50,61,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,82,83,84,85,86,87,89,90,91,97,98,100,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,165,166,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,]),'file_input':([0,],[41,]),'elif_conds':([56,],[124,]),'or_test':([0,2,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,81,110,117,122,123,127,128,132,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,150,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,]),'while_stmt':([0,41,214,221,],[53,53,53,53,]),'keyvalue':([31,170,],[103,205,]),'trailer':([38,],[111,]),'expr':([0,2,19,20,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,82,83,84,85,86,87,89,90,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[18,18,18,94,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,151,153,154,155,156,157,159,160,18,18,18,18,18,18,18,18,195,196,18,18,18,18,18,18,18,18,18,18,18,18,18,18,]),'elif_cond':([56,124,],[125,190,]),'xor_expr':([0,2,19,20,35,41,44,49,50,62,64,65,66,67,68,69,70,71,72,73,74,75,76,80,81,82,83,84,85,86,87,89,90,91,110,117,118,122,123,127,128,132,152,158,162,164,167,171,174,181,186,194,202,209,212,214,217,221,],[29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,161,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,]),'small_stmts':([0,41,162,164,174,186,202,212,214,217,221,],[54,54,54,54,54,54,54,54,54,54,54,]),'if_cond':([0,41,214,221,],[56,56,56,56,]),}
+
+_lr_goto = { }
+for _k, _v in _lr_goto_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = { }
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> file_input_end","S'",1,None,None,None),
+  ('file_input_end -> file_input ENDMARKER','file_input_end',2,'p_file_input_end','ptpy/p_parser.py',116),
+  ('file_input -> file_input NEWLINE','file_input',2,'p_file_input','ptpy/p_parser.py',122),
+  ('file_input -> file_input stmt','file_input',2,'p_file_input','ptpy/p_parser.py',123),
+  ('file_input -> NEWLINE','file_input',1,'p_file_input','ptpy/p_parser.py',124),
+  ('file_input -> stmt','file_input',1,'p_file_input','ptpy/p_parser.py',125),
+  ('stmt -> simple_stmt','stmt',1,'p_stmt_simple','ptpy/p_parser.py',142),
+  ('stmt -> compound_stmt','stmt',1,'p_stmt_compound','ptpy/p_parser.py',148),
+  ('simple_stmt -> small_stmts NEWLINE','simple_stmt',2,'p_simple_stmt','ptpy/p_parser.py',155),
+  ('simple_stmt -> small_stmts SEMICOLON NEWLINE','simple_stmt',3,'p_simple_stmt','ptpy/p_parser.py',156),
+  ('compound_stmt -> if_stmt','compound_stmt',1,'p_compound_stmt','ptpy/p_parser.py',164),
+  ('compound_stmt -> while_stmt','compound_stmt',1,'p_compound_stmt','ptpy/p_parser.py',165),
+  ('compound_stmt -> for_stmt','compound_stmt',1,'p_compound_stmt','ptpy/p_parser.py',166),
+  ('compound_stmt -> define_stmt','compound_stmt',1,'p_compound_stmt','ptpy/p_parser.py',167),
+  ('small_stmts -> small_stmts SEMICOLON small_stmt','small_stmts',3,'p_small_stmts','ptpy/p_parser.py',173),
+  ('small_stmts -> small_stmt','small_stmts',1,'p_small_stmts','ptpy/p_parser.py',174),
+  ('small_stmt -> expr_stmt','small_stmt',1,'p_small_stmt','ptpy/p_parser.py',186),
+  ('small_stmt -> assert_stmt','small_stmt',1,'p_small_stmt','ptpy/p_parser.py',187),
+  ('small_stmt -> flow_stmt','small_stmt',1,'p_small_stmt','ptpy/p_parser.py',188),
+  ('small_stmt -> exec_stmt','small_stmt',1,'p_small_stmt','ptpy/p_parser.py',189),
+  ('flow_stmt -> BREAK','flow_stmt',1,'p_break','ptpy/p_parser.py',195),
+  ('flow_stmt -> CONTINUE','flow_stmt',1,'p_continue','ptpy/p_parser.py',201),
+  ('flow_stmt -> PASS','flow_stmt',1,'p_pass','ptpy/p_parser.py',206),
+  ('assert_stmt -> ASSERT test','assert_stmt',2,'p_assert','ptpy/p_parser.py',212),
+  ('assert_stmt -> ASSERT test COMMA test','assert_stmt',4,'p_assert','ptpy/p_parser.py',213),
+  ('expr_stmt -> testlist IPLUS testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',229),
+  ('expr_stmt -> testlist IMINUS testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',230),
+  ('expr_stmt -> testlist IDIV testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',231),
+  ('expr_stmt -> testlist IMUL testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',232),
+  ('expr_stmt -> testlist IMOD testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',233),
+  ('expr_stmt -> testlist IPOW testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',234),
+  ('expr_stmt -> testlist ILSHIFT testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',235),
+  ('expr_stmt -> testlist IRSHIFT testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',236),
+  ('expr_stmt -> testlist IAND testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',237),
+  ('expr_stmt -> testlist IOR testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',238),
+  ('expr_stmt -> testlist INOT testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',239),
+  ('expr_stmt -> testlist IXOR testlist','expr_stmt',3,'p_aug_assign','ptpy/p_parser.py',240),
+  ('expr_stmt -> testlist ASSIGN testlist','expr_stmt',3,'p_expr_stmt','ptpy/p_parser.py',246),
+  ('expr_stmt -> testlist','expr_stmt',1,'p_expr_stmt','ptpy/p_parser.py',247),
+  ('define_stmt -> DEF NAME COLON suite','define_stmt',4,'p_def_code_stmt','ptpy/p_parser.py',273),
+  ('define_stmt -> DEF expr NAME COLON suite','define_stmt',5,'p_def_code_stmt','ptpy/p_parser.py',274),
+  ('define_stmt -> DEF NAME COLON block','define_stmt',4,'p_def_code_stmt','ptpy/p_parser.py',275),
+  ('define_stmt -> DEF expr NAME COLON block','define_stmt',5,'p_def_code_stmt','ptpy/p_parser.py',276),
+  ('while_stmt -> WHILE test COLON suite','while_stmt',4,'p_while_stmt','ptpy/p_parser.py',289),
+  ('while_stmt -> WHILE test COLON suite else_stmt','while_stmt',5,'p_while_stmt','ptpy/p_parser.py',290),
+  ('for_stmt -> FOR NAME IN test COLON suite','for_stmt',6,'p_for_stmt','ptpy/p_parser.py',299),
+  ('for_stmt -> FOR NAME IN test COLON suite else_stmt','for_stmt',7,'p_for_stmt','ptpy/p_parser.py',300),
+  ('exec_stmt -> EXEC NAME IN test','exec_stmt',4,'p_exec_stmt','ptpy/p_parser.py',310),
+  ('if_stmt -> conds','if_stmt',1,'p_if_stmt','ptpy/p_parser.py',317),
+  ('if_stmt -> conds else_stmt','if_stmt',2,'p_if_stmt','ptpy/p_parser.py',318),
+  ('conds -> if_cond','conds',1,'p_conds','ptpy/p_parser.py',327),
+  ('conds -> if_cond elif_conds','conds',2,'p_conds','ptpy/p_parser.py',328),
+  ('else_stmt -> ELSE COLON suite','else_stmt',3,'p_else_stmt','ptpy/p_parser.py',338),
+  ('elif_conds -> elif_conds elif_cond','elif_conds',2,'p_elif_conds','ptpy/p_parser.py',344),
+  ('elif_conds -> elif_cond','elif_conds',1,'p_elif_conds','ptpy/p_parser.py',345),
+  ('elif_cond -> ELIF test COLON suite','elif_cond',4,'p_elif_cond','ptpy/p_parser.py',354),
+  ('if_cond -> IF test COLON suite','if_cond',4,'p_if_cond','ptpy/p_parser.py',360),
+  ('block -> BLOCK','block',1,'p_block','ptpy/p_parser.py',366),
+  ('suite -> simple_stmt','suite',1,'p_suite','ptpy/p_parser.py',373),
+  ('suite -> NEWLINE INDENT stmts DEDENT','suite',4,'p_suite','ptpy/p_parser.py',374),
+  ('stmts -> stmts stmt','stmts',2,'p_stmts','ptpy/p_parser.py',384),
+  ('stmts -> stmt','stmts',1,'p_stmts','ptpy/p_parser.py',385),
+  ('or_test -> or_test BOR and_test','or_test',3,'p_or_test','ptpy/p_parser.py',398),
+  ('or_test -> and_test','or_test',1,'p_or_test','ptpy/p_parser.py',399),
+  ('and_test -> and_test BAND not_test','and_test',3,'p_and_test','ptpy/p_parser.py',409),
+  ('and_test -> not_test','and_test',1,'p_and_test','ptpy/p_parser.py',410),
+  ('not_test -> BNOT not_test','not_test',2,'p_not_test','ptpy/p_parser.py',420),
+  ('not_test -> comparison','not_test',1,'p_not_test','ptpy/p_parser.py',421),
+  ('comparison -> expr LT expr','comparison',3,'p_comparison','ptpy/p_parser.py',433),
+  ('comparison -> expr LE expr','comparison',3,'p_comparison','ptpy/p_parser.py',434),
+  ('comparison -> expr GT expr','comparison',3,'p_comparison','ptpy/p_parser.py',435),
+  ('comparison -> expr GE expr','comparison',3,'p_comparison','ptpy/p_parser.py',436),
+  ('comparison -> expr NE expr','comparison',3,'p_comparison','ptpy/p_parser.py',437),
+  ('comparison -> expr EQ expr','comparison',3,'p_comparison','ptpy/p_parser.py',438),
+  ('comparison -> expr IS expr','comparison',3,'p_comparison','ptpy/p_parser.py',439),
+  ('comparison -> expr IS BNOT expr','comparison',4,'p_comparison','ptpy/p_parser.py',440),
+  ('comparison -> expr IN expr','comparison',3,'p_comparison','ptpy/p_parser.py',441),
+  ('comparison -> expr BNOT IN expr','comparison',4,'p_comparison','ptpy/p_parser.py',442),
+  ('comparison -> expr','comparison',1,'p_comparison','ptpy/p_parser.py',443),
+  ('expr -> expr OR xor_expr','expr',3,'p_expr','ptpy/p_parser.py',457),
+  ('expr -> xor_expr','expr',1,'p_expr','ptpy/p_parser.py',458),
+  ('xor_expr -> xor_expr XOR and_expr','xor_expr',3,'p_xor_expr','ptpy/p_parser.py',468),
+  ('xor_expr -> and_expr','xor_expr',1,'p_xor_expr','ptpy/p_parser.py',469),
+  ('and_expr -> and_expr AND shift_expr','and_expr',3,'p_and_expr','ptpy/p_parser.py',479),
+  ('and_expr -> shift_expr','and_expr',1,'p_and_expr','ptpy/p_parser.py',480),
+  ('shift_expr -> shift_expr LSHIFT arith_expr','shift_expr',3,'p_shift_expr','ptpy/p_parser.py',490),
+  ('shift_expr -> shift_expr RSHIFT arith_expr','shift_expr',3,'p_shift_expr','ptpy/p_parser.py',491),
+  ('shift_expr -> arith_expr','shift_expr',1,'p_shift_expr','ptpy/p_parser.py',492),
+  ('arith_expr -> arith_expr PLUS term','arith_expr',3,'p_arith_expr','ptpy/p_parser.py',502),
+  ('arith_expr -> arith_expr MINUS term','arith_expr',3,'p_arith_expr','ptpy/p_parser.py',503),
+  ('arith_expr -> term','arith_expr',1,'p_arith_expr','ptpy/p_parser.py',504),
+  ('term -> term MULT factor','term',3,'p_term','ptpy/p_parser.py',514),
+  ('term -> term DIV factor','term',3,'p_term','ptpy/p_parser.py',515),
+  ('term -> term MOD factor','term',3,'p_term','ptpy/p_parser.py',516),
+  ('term -> factor','term',1,'p_term','ptpy/p_parser.py',517),
+  ('factor -> PLUS factor','factor',2,'p_factor','ptpy/p_parser.py',528),
+  ('factor -> MINUS factor','factor',2,'p_factor','ptpy/p_parser.py',529),
+  ('factor -> NOT factor','factor',2,'p_factor','ptpy/p_parser.py',530),
+  ('factor -> power','factor',1,'p_factor','ptpy/p_parser.py',531),
+  ('power -> power POW atom_attr','power',3,'p_power','ptpy/p_parser.py',543),
+  ('power -> atom_attr','power',1,'p_power','ptpy/p_parser.py',544),
+  ('atom_attr -> atom_attr DOT atom_call','atom_attr',3,'p_atom_attr','ptpy/p_parser.py',553),
+  ('atom_attr -> atom_call','atom_attr',1,'p_atom_attr','ptpy/p_parser.py',554),
+  ('atom_call -> atom','atom_call',1,'p_atom_call','ptpy/p_parser.py',568),
+  ('atom_call -> atom trailer','atom_call',2,'p_atom_call','ptpy/p_parser.py',569),
+  ('atom -> NAME','atom',1,'p_atom_name','ptpy/p_parser.py',584),
+  ('atom -> ICONST','atom',1,'p_atom_int','ptpy/p_parser.py',589),
+  ('atom -> FCONST','atom',1,'p_atom_float','ptpy/p_parser.py',594),
+  ('atom -> SCONST','atom',1,'p_atom_string','ptpy/p_parser.py',599),
+  ('atom -> LBRACKET test RBRACKET','atom',3,'p_atom_list','ptpy/p_parser.py',604),
+  ('atom -> LBRACKET test COMMA RBRACKET','atom',4,'p_atom_list','ptpy/p_parser.py',605),
+  ('atom -> LBRACKET tests RBRACKET','atom',3,'p_atom_list','ptpy/p_parser.py',606),
+  ('atom -> LBRACKET tests COMMA RBRACKET','atom',4,'p_atom_list','ptpy/p_parser.py',607),
+  ('atom -> LPAREN testlist RPAREN','atom',3,'p_atom_tuple','ptpy/p_parser.py',616),
+  ('atom -> LBRACE keyvaluelist RBRACE','atom',3,'p_atom_dict','ptpy/p_parser.py',620),
+  ('keyvaluelist -> keyvalues','keyvaluelist',1,'p_keyvaluelist','ptpy/p_parser.py',624),
+  ('keyvaluelist -> keyvalues COMMA','keyvaluelist',2,'p_keyvaluelist','ptpy/p_parser.py',625),
+  ('keyvalues -> keyvalues COMMA keyvalue','keyvalues',3,'p_keyvalues','ptpy/p_parser.py',630),
+  ('keyvalues -> keyvalue','keyvalues',1,'p_keyvalues','ptpy/p_parser.py',631),
+  ('keyvalue -> SCONST COLON test','keyvalue',3,'p_keyvalue','ptpy/p_parser.py',640),
+  ('trailer -> LPAREN arglist RPAREN','trailer',3,'p_trailer','ptpy/p_parser.py',646),
+  ('trailer -> LPAREN RPAREN','trailer',2,'p_trailer','ptpy/p_parser.py',647),
+  ('testlist -> test','testlist',1,'p_testlist','ptpy/p_parser.py',661),
+  ('testlist -> test COMMA','testlist',2,'p_testlist','ptpy/p_parser.py',662),
+  ('testlist -> tests','testlist',1,'p_testlist','ptpy/p_parser.py',663),
+  ('testlist -> tests COMMA','testlist',2,'p_testlist','ptpy/p_parser.py',664),
+  ('tests -> tests COMMA test','tests',3,'p_tests','ptpy/p_parser.py',678),
+  ('tests -> test COMMA test','tests',3,'p_tests','ptpy/p_parser.py',679),
+  ('test -> or_test','test',1,'p_test','ptpy/p_parser.py',690),
+  ('test -> or_test IF or_test ELSE test','test',5,'p_test','ptpy/p_parser.py',691),
+  ('arglist -> arguments','arglist',1,'p_arglist','ptpy/p_parser.py',703),
+  ('arglist -> arguments COMMA','arglist',2,'p_arglist','ptpy/p_parser.py',704),
+  ('arguments -> arguments COMMA argument','arguments',3,'p_arguments','ptpy/p_parser.py',710),
+  ('arguments -> argument','arguments',1,'p_arguments','ptpy/p_parser.py',711),
+  ('argument -> test','argument',1,'p_argument','ptpy/p_parser.py',724),
+]
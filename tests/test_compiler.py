@@ -1,25 +1,47 @@
 
 
 
+import dis
+import gc
+import marshal
+import os
 import ply.yacc as yacc
+import shutil
+import StringIO
+import sys
+import tempfile
+import threading
+import traceback
+import types
 import unittest
 from compiler import ast
 
-from compiler import misc, syntax, pycodegen
+from compiler import misc, syntax, pycodegen, visitor
 from compiler.consts import *
 
-from test_ptpyparser import BaseTest
+import ptpy.p_ast as ptpyast
+import ptpy.p_builtins
+import ptpy.p_cache as ptpycache
+import ptpy.p_compileall as ptpycompileall
+import ptpy.p_compiler as ptpycompiler
+import ptpy.p_import as ptpyimport
+import ptpy.p_intern as ptpyintern
+import ptpy.p_lower as ptpylower
+import ptpy.p_stats as ptpystats
+import ptpy.p_symbols as ptpysymbols
+from test_parser import BaseTest
 
-from ptpyparser import PtpyParser
-from ptpycompiler import PtpyCompiler
+from ptpy.p_parser import PtpyParser
+from ptpy.p_compiler import PtpyCompiler, PtpyCompilerPool, compile_file
+from ptpy.p_compiler import PtpyModuleCodeGenerator, PtpyNameFinder
 
-import ptpybuiltins
+import ptpy.p_builtins as ptpybuiltins
 
 
 
 class TestCompiledCode(BaseTest):
     def setUp(self):
-        self.compiler = PtpyCompiler()
+        self.compiler = PtpyCompiler(dialect='en')
 
     def run_code(self, code, namespace):
         bcode = self.compiler.compile(code)
@@ -27,6 +49,15 @@ class TestCompiledCode(BaseTest):
         ptpyglobals.update(ptpybuiltins.__dict__)
         exec bcode in ptpyglobals, namespace
 
+    def run_block(self, block):
+        # the namespace block leaves, with the blocks defined in it run
+        namespace = {}
+        exec block in globals(), namespace
+        for name, value in namespace.items():
+            if isinstance(value, types.CodeType):
+                namespace[name] = self.run_block(value)
+        return namespace
+
     def test_single_assignment(self):
         """Test a single assignment
 
@@ -372,7 +403,7 @@ class TestCompiledCode(BaseTest):
     def test_single_let(self):
         """Test single let 
 
-        let n:
+        def n:
             a = 1
             b = 2
             c = a + b
@@ -382,16 +413,17 @@ class TestCompiledCode(BaseTest):
         code = self.get_string(self.test_single_let)
         namespace = {}
         self.run_code(code, namespace)
-        self.assertEqual(namespace['n'], {'a':1, 'b':2, 'c':3, 'd':[1, 2, 3]})
+        self.assertEqual(self.run_block(namespace['n']),
+                         {'a':1, 'b':2, 'c':3, 'd':[1, 2, 3]})
 
     def test_multiple_let(self):
         """Test if multiple let don't mess each other
 
-        let m:
+        def m:
             a = 1
             b = 2
 
-        let n:
+        def n:
             a = 3
             b = 4
 
@@ -399,34 +431,35 @@ class TestCompiledCode(BaseTest):
         code = self.get_string(self.test_multiple_let)
         namespace = {}
         self.run_code(code, namespace)
-        self.assertEqual(namespace['m'], {'a':1, 'b':2})
-        self.assertEqual(namespace['n'], {'a':3, 'b':4})
+        self.assertEqual(self.run_block(namespace['m']), {'a':1, 'b':2})
+        self.assertEqual(self.run_block(namespace['n']), {'a':3, 'b':4})
         
     def test_nested_let(self):
         """Test if nested let don't mess each other
 
-        let m:
+        def m:
             a = 1
 
-            let n:
+            def n:
                 a = 2
 
         """
         code = self.get_string(self.test_nested_let)
         namespace = {}
         self.run_code(code, namespace)
-        self.assertEqual(namespace['m'], {'a':1, 'n':{'a':2}})
+        self.assertEqual(self.run_block(namespace['m']),
+                         {'a':1, 'n':{'a':2}})
 
     def test_multiple_nested_let(self):
         """Test if multiple nested let work
 
-        let m:
+        def m:
             a = 1
 
-            let n:
+            def n:
                 b = 2
 
-                let o:
+                def o:
                     c = 3
 
         """
@@ -434,12 +467,13 @@ class TestCompiledCode(BaseTest):
         namespace = {}
         self.run_code(code, namespace)
         
-        self.assertEqual(namespace['m'], {'a':1, 'n':{'b':2, 'o':{'c':3}}})
+        self.assertEqual(self.run_block(namespace['m']),
+                         {'a':1, 'n':{'b':2, 'o':{'c':3}}})
 
     def test_define(self):
         """Test define 
 
-        define m:
+        def m:
             a = 1
             b = 2
             
@@ -454,11 +488,11 @@ class TestCompiledCode(BaseTest):
     def test_multiple_define(self):
         """Test if multiple define work
 
-        define m:
+        def m:
             a = 1
             b = 2
 
-        define n:
+        def n:
             a = 3
             b = 4
             
@@ -477,11 +511,11 @@ class TestCompiledCode(BaseTest):
     def test_nested_define(self):
         """Test if nested define work
 
-        define m:
+        def m:
             a = 1
             b = 2
 
-            define n:
+            def n:
                 a = 3
                 b = 4
 
@@ -501,11 +535,11 @@ class TestCompiledCode(BaseTest):
         """Test if let closures resolve properly 
 
         a = 1
-        let m:
+        def m:
             b = 2
-            let n:
+            def n:
                 c = 3
-                let o:
+                def o:
                     d = a + b + c
 
         """
@@ -516,7 +550,7 @@ class TestCompiledCode(BaseTest):
     def test_let_with_wrapper(self):
         """Test let statement with namespace wrapper
 
-        let namespace m:
+        def namespace m:
             a = 1
             b = 2
             c = "3"
@@ -528,15 +562,16 @@ class TestCompiledCode(BaseTest):
 
         m = namespace['m']
         self.assertEqual(type(m), ptpybuiltins.namespace)
-        self.assertEqual(m.a, 1)
-        self.assertEqual(m.b, 2)
-        self.assertEqual(m.c, "3")
-        self.assertEqual(m.d, [1, 2, 3, 4])
+        body = self.run_block(m.__body__)
+        self.assertEqual(body['a'], 1)
+        self.assertEqual(body['b'], 2)
+        self.assertEqual(body['c'], "3")
+        self.assertEqual(body['d'], [1, 2, 3, 4])
        
     def test_define_with_wrapper(self):
         """Test define statement with function wrapper
 
-        define function f:
+        def function f:
             a = 1
             b = 2
             c = "3"
@@ -555,8 +590,999 @@ class TestCompiledCode(BaseTest):
         #c = f.__code__
         #for n in dir(c):
         #    print n, getattr(c, n)
-        
-    
+
+
+
+class TestLazyBlocks(BaseTest):
+    def setUp(self):
+        self.compiler = PtpyCompiler(lazy_blocks=True)
+
+    def run_block(self, code, name):
+        namespace, block = {}, {}
+        exec self.compiler.compile(code, "<lazy>") in {}, namespace
+        exec namespace[name] in {}, block
+        return block
+
+    def test_lazy_block(self):
+        """Test a block body compiled when first run
+
+        definir m:
+            a = 1
+
+            # comment
+            se a == 1:
+                b = '''one
+        two'''
+            definir n:
+                c = 3
+        d = 4
+        """
+        code = self.get_string(self.test_lazy_block)
+        tree = self.compiler.parser.parse(code)
+        self.assertTrue(isinstance(tree.node.nodes[0].code, ptpyast.Unparsed))
+
+        m = self.run_block(code, 'm')
+        self.assertEqual(m['a'], 1)
+        self.assertEqual(m['b'], 'one\ntwo')
+        n = {}
+        exec m['n'] in {}, n
+        self.assertEqual(n, {'c': 3})
+
+    def test_errors_when_run(self):
+        """Test errors in a block body show up when it runs
+
+        definir m:
+            a = 1
+            b = c
+        definir n:
+            a = (1,
+        """
+        code = self.get_string(self.test_errors_when_run)
+        try:
+            self.run_block(code, 'm')
+        except NameError:
+            filename, lineno, name = traceback.extract_tb(
+                sys.exc_info()[2])[-1][:3]
+            self.assertEqual((filename, lineno, name), ("<lazy>", 3, 'm'))
+        else:
+            self.fail("NameError not raised")
+        self.assertRaises(SyntaxError, self.run_block, code, 'n')
+
+    def test_compiled_once(self):
+        """Test block bodies are kept compiled, up to BLOCK_CACHE_SIZE"""
+        dialect = self.compiler.dialect
+        args = ('m', "    a = 1\n", "<lazy>", 2, dialect)
+        code = ptpycompiler.compile_block(*args)
+        self.assertTrue(ptpycompiler.compile_block(*args) is code)
+
+        size = ptpycompiler._blocks.max_entries
+        for i in range(size):
+            ptpycompiler.compile_block('m', "    b = %i\n" % i, "<lazy>", 2,
+                                       dialect)
+        self.assertEqual(len(ptpycompiler._blocks), size)
+        self.assertFalse(ptpycompiler.compile_block(*args) is code)
+
+
+
+class TestOptimize(BaseTest):
+    def setUp(self):
+        self.compiler = PtpyCompiler()
+
+    def run_code(self, code, optimize=1):
+        namespace = {}
+        compiler = PtpyCompiler(optimize=optimize)
+        exec compiler.compile(code) in {}, namespace
+        return namespace
+
+    def test_same_values(self):
+        """Test folded expressions give what they give unfolded
+
+        a = 1 + 2 * 3 - 4 / 2
+        b = 2 ** 10 % 7 << 3
+        c = -5 & 12 | 3 ^ 1
+        d = nao 1 < 2
+        k = 0 ou 3 e 4
+        f = 'ab' * 3 + 'c'
+        g = -0.0
+        h = 2 em [1, 2, 3]
+        i = 4 nao em (1, 2, 3)
+        """
+        code = self.get_string(self.test_same_values)
+        self.assertEqual(self.run_code(code), self.run_code(code, 0))
+        self.assertEqual(repr(self.run_code(code)['g']), '-0.0')
+
+    def test_constants(self):
+        """Test folded values end up as constants of the code
+
+        a = 2 * 3 + 1
+        b = 'a' + 'b'
+        c = x em [1, 2, 3]
+        """
+        code = self.compiler.compile(self.get_string(self.test_constants))
+        self.assertTrue(7 in code.co_consts)
+        self.assertTrue('ab' in code.co_consts)
+        self.assertTrue((1, 2, 3) in code.co_consts)
+        self.assertFalse(2 in code.co_consts)
+
+    def test_not_folded(self):
+        """Test errors and huge values are left for when the code runs
+
+        a = 2 ** 100000
+        b = 'ab' * 1000
+        c = 1 / 0
+        """
+        code = self.compiler.compile(self.get_string(self.test_not_folded))
+        self.assertTrue(100000 in code.co_consts)
+        self.assertTrue(1000 in code.co_consts)
+        namespace = {}
+        self.assertRaises(ZeroDivisionError, eval, code, {}, namespace)
+        self.assertEqual(len(namespace['b']), 2000)
+
+    def test_dead_code(self):
+        """Test branches and statements that can't run are dropped
+
+        se 0:
+            a = 'se'
+        ouse 1 > 2:
+            a = 'ouse'
+        senao:
+            a = 'senao'
+        enquanto 0:
+            b = 'enquanto'
+        para i em [1, 2]:
+            c = i
+            sair
+            d = 'sair'
+        """
+        code = self.compiler.compile(self.get_string(self.test_dead_code))
+        for name in ['se', 'ouse', 'enquanto', 'sair']:
+            self.assertFalse(name in code.co_consts)
+        self.assertEqual(self.run_code(self.get_string(self.test_dead_code)),
+                         {'a': 'senao', 'c': 1, 'i': 1})
+
+    def test_level_zero(self):
+        """Test level 0 leaves the tree as it is"""
+        code = PtpyCompiler(optimize=0).compile(
+            "a = 2 * 3\nenquanto 0:\n    b = 4\n")
+        self.assertFalse(6 in code.co_consts)
+        self.assertTrue(4 in code.co_consts)
+
+
+
+class TestUnoptimized(TestCompiledCode):
+    def setUp(self):
+        self.compiler = PtpyCompiler(dialect='en', optimize=0)
+
+
+
+class TestAstBackend(TestCompiledCode):
+    def setUp(self):
+        self.compiler = PtpyCompiler(dialect='en', backend='ast')
+
+    def run_both(self, code):
+        # the namespaces code leaves with each backend
+        namespaces = []
+        for backend in ['compiler', 'ast']:
+            namespace = dict(ptpybuiltins.__dict__)
+            exec PtpyCompiler(backend=backend).compile(code) in namespace
+            namespaces.append(dict([(name, value) for name, value
+                                    in namespace.items()
+                                    if name not in ptpybuiltins.__dict__ and
+                                    name != '__builtins__']))
+        return namespaces
+
+    def test_same_namespace(self):
+        """Test both backends leave the same names
+
+        "texto"
+        a = 7
+        b = (a + 1) * 2 % 5 ** 2
+        c = [a, (1, 2), {'k': a}]
+        d = a > 1 e nao a == 3 ou 0
+        g = 1 | 2 & 3 ^ 4
+        se a < 0:
+            f = 'se'
+        ouse a > 5:
+            f = 'ouse'
+        senao:
+            f = 'senao'
+        enquanto a:
+            a -= 1
+        para i em range(3):
+            b += i
+        """
+        old, new = self.run_both(self.get_string(self.test_same_namespace))
+        self.assertEqual(new, old)
+        self.assertFalse('__doc__' in new)
+
+    def test_block(self):
+        """Test a block is the named code of its body
+
+        a = 1
+        definir m:
+            b = a + 1
+            definir n:
+                c = 3
+        """
+        old, new = self.run_both(self.get_string(self.test_block))
+        for namespace in old, new:
+            m = {}
+            exec namespace['m'] in {'a': 1}, m
+            n = {}
+            exec m['n'] in {}, n
+            self.assertEqual((m['b'], n), (2, {'c': 3}))
+        self.assertEqual((new['m'].co_name, new['m'].co_firstlineno),
+                         (old['m'].co_name, old['m'].co_firstlineno))
+
+    def test_wrapper(self):
+        """Test a block with a wrapper
+
+        definir slice m:
+            a = 1
+        """
+        old, new = self.run_both(self.get_string(self.test_wrapper))
+        self.assertEqual(new['m'].start, 'm')
+        self.assertEqual(new['m'].stop.co_name, 'm')
+
+    def test_eager_block(self):
+        """Test an eager block is a function returning its locals
+
+        definir m:
+            a = 1
+            definir n:
+                b = a
+        """
+        tree = PtpyParser().parse(self.get_string(self.test_eager_block))
+        tree.node.nodes[0].lazy = False
+        namespace = {}
+        exec ptpylower.generate(tree, "<eager>") in namespace
+        m = namespace['m']()
+        self.assertEqual(m['a'], 1)
+        self.assertEqual(m['n'].co_name, 'n')
+
+    def test_lazy_blocks(self):
+        """Test a block compiled when first run
+
+        definir m:
+            a = 1
+            b = c
+        """
+        compiler = PtpyCompiler(lazy_blocks=True, backend='ast')
+        namespace = {}
+        exec compiler.compile(self.get_string(self.test_lazy_blocks),
+                              "<lazy>") in namespace
+        try:
+            exec namespace['m'] in {}, {}
+        except NameError:
+            self.assertEqual(traceback.extract_tb(sys.exc_info()[2])[-1][:3],
+                             ("<lazy>", 3, 'm'))
+        else:
+            self.fail("NameError not raised")
+
+    def test_stats(self):
+        """Test the ast backend's phases"""
+        stats = ptpystats.CompileStats()
+        PtpyCompiler(stats=stats, backend='ast').compile(
+            "definir m:\n    a = 1\n")
+        self.assertEqual(stats.counters['blocks'], 1)
+        self.assertEqual(stats.wall['peephole'], 0.0)
+
+    def test_options(self):
+        self.assertNotEqual(self.compiler.options(),
+                            PtpyCompiler(dialect='en').options())
+        self.assertRaises(ValueError, PtpyCompiler, backend='spam')
+
+
+
+class TestInterning(BaseTest):
+    source = ("a = 'padrao'\n"
+              "definir m:\n"
+              "    b = 'padrao'\n"
+              "    c = (1, 2.5)\n"
+              "definir n:\n"
+              "    b = 'padrao'\n"
+              "    c = (1, 2.5)\n"
+              "definir o:\n"
+              "    b = -0.0\n"
+              "    c = 0.0\n")
+
+    def compile(self, backend='compiler'):
+        return PtpyCompiler(backend=backend, interning=True).compile(
+            self.source)
+
+    def run_code(self, code):
+        namespace = {}
+        exec code in namespace
+        blocks = {}
+        for name in 'mno':
+            blocks[name] = {}
+            exec namespace[name] in {}, blocks[name]
+        return namespace['a'], blocks
+
+    def test_same_blocks(self):
+        """Test blocks with the same body share their code"""
+        for backend in ['compiler', 'ast']:
+            code = self.compile(backend)
+            namespace = {}
+            exec code in namespace
+            self.assertTrue(namespace['m'] is namespace['n'])
+            self.assertFalse(namespace['m'] is namespace['o'])
+            self.assertEqual(self.run_code(code), self.run_code(
+                PtpyCompiler(backend=backend).compile(self.source)))
+
+    def test_constants(self):
+        """Test the constants of the blocks are shared"""
+        code = self.compile()
+        m = [const for const in code.co_consts
+             if isinstance(const, type(code)) and const.co_name == 'm'][0]
+        self.assertTrue('padrao' in m.co_consts)
+        for const in code.co_consts:
+            if const == 'padrao':
+                self.assertTrue(const is intern('padrao'))
+        o = self.run_code(code)[1]['o']
+        self.assertEqual(repr((o['b'], o['c'])), '(-0.0, 0.0)')
+
+    def test_interner(self):
+        interner = ptpyintern.CodeInterner()
+        first = interner.intern(compile("a = (1, u'b')", "<i>", "exec"))
+        second = interner.intern(compile("b = (1, u'b')", "<i>", "exec"))
+        self.assertEqual(first.co_consts, second.co_consts)
+        for const, other in zip(first.co_consts, second.co_consts):
+            self.assertTrue(const is other)
+        # 1 and None are shared already
+        self.assertEqual(interner.shared, 2)
+
+    def test_smaller(self):
+        """Test the marshalled code is smaller"""
+        self.assertTrue(len(marshal.dumps(self.compile())) <
+                        len(marshal.dumps(PtpyCompiler().compile(
+                            self.source))))
+
+    def test_options(self):
+        stats = ptpystats.CompileStats()
+        compiler = PtpyCompiler(interning=True, stats=stats)
+        compiler.compile(self.source)
+        self.assertNotEqual(compiler.options(), PtpyCompiler().options())
+        self.assertTrue(stats.counters['shared'] > 0)
+        self.assertTrue('intern' in stats.wall)
+
+
+
+class TestPeephole(BaseTest):
+    def setUp(self):
+        self.compiler = PtpyCompiler()
+
+    def opnames(self, code):
+        names = []
+        i = 0
+        while i < len(code.co_code):
+            op = ord(code.co_code[i])
+            names.append(dis.opname[op])
+            i += op >= dis.HAVE_ARGUMENT and 3 or 1
+        return names
+
+    def test_jump_threading(self):
+        """Test jumps to jumps go straight to where they end up
+
+        se a e b:
+            c = 1
+            se c:
+                d = 1
+        senao:
+            c = 2
+        """
+        code = self.compiler.compile(self.get_string(self.test_jump_threading))
+        names = self.opnames(code)
+        self.assertFalse('JUMP_IF_FALSE_OR_POP' in names)
+        self.assertFalse('JUMP_FORWARD' in names)
+        self.assertEqual(names.count('JUMP_ABSOLUTE'), 1)
+        for a, b, c in [(1, 1, 1), (1, 0, 2), (0, 1, 2)]:
+            namespace = {}
+            exec code in {'a': a, 'b': b}, namespace
+            self.assertEqual(namespace['c'], c)
+
+    def test_constant_loads(self):
+        """Test constants loaded to be popped or tested aren't loaded
+
+        'texto'
+        a = 0
+        enquanto 1:
+            a += 1
+            se nao a < 3:
+                sair
+        """
+        code = self.compiler.compile(self.get_string(self.test_constant_loads))
+        names = self.opnames(code)
+        self.assertFalse('texto' in code.co_consts)
+        self.assertFalse('POP_TOP' in names)
+        self.assertFalse('UNARY_NOT' in names)
+        self.assertEqual(names.count('LOAD_CONST'), 4)
+        namespace = {}
+        exec code in {}, namespace
+        self.assertEqual(namespace, {'a': 3})
+
+    def test_dead_code(self):
+        """Test code nothing can reach is dropped
+
+        b = 0
+        para i em [1, 2, 3]:
+            se i == 2:
+                continuar
+            b += i
+        """
+        code = self.compiler.compile(self.get_string(self.test_dead_code))
+        names = self.opnames(code)
+        self.assertFalse('JUMP_FORWARD' in names)
+        self.assertEqual(names.count('JUMP_ABSOLUTE'), 2)
+        namespace = {}
+        exec code in {}, namespace
+        self.assertEqual(namespace['b'], 4)
+
+    def test_line_numbers(self):
+        """Test errors are reported on their lines
+
+        a = 0
+        enquanto a < 10:
+            a += 1
+            se a > 3:
+                sair
+            se a == 1:
+                b = 1
+            ouse a == 2:
+                b = 2
+        c = a + 'x'
+        """
+        code = self.compiler.compile(self.get_string(self.test_line_numbers),
+                                     "<lines>")
+        try:
+            exec code in {}, {}
+        except TypeError:
+            filename, lineno = traceback.extract_tb(
+                sys.exc_info()[2])[-1][:2]
+            self.assertEqual((filename, lineno), ("<lines>", 10))
+        else:
+            self.fail("TypeError not raised")
+
+    def test_level_zero(self):
+        """Test level 0 leaves the bytecode as the compiler package
+        makes it"""
+        code = PtpyCompiler(optimize=0).compile("se a e b:\n    c = 1\n")
+        names = self.opnames(code)
+        self.assertTrue('JUMP_IF_FALSE_OR_POP' in names)
+        self.assertTrue('JUMP_FORWARD' in names)
+
+
+
+class TestCodeCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ptpycache.CodeCache(os.path.join(self.directory, 'cache'))
+        self.filename = os.path.join(self.directory, 'm.ptpy')
+        self.write("a = 1\n", 1000)
+        self.compiled = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, source, mtime):
+        f = open(self.filename, 'w')
+        f.write(source)
+        f.close()
+        os.utime(self.filename, (mtime, mtime))
+
+    def compile(self, source):
+        self.compiled.append(source)
+        return PtpyCompiler().compile(source, self.filename)
+
+    def run_code(self, code):
+        namespace = {}
+        exec code in {}, namespace
+        return namespace
+
+    def test_reused(self):
+        """Test an unchanged source is compiled once"""
+        first = self.cache.get(self.filename, 'options', self.compile)
+        second = self.cache.get(self.filename, 'options', self.compile)
+        self.assertEqual(self.compiled, ["a = 1\n"])
+        self.assertEqual(first, second)
+        self.assertEqual(self.run_code(second), {'a': 1})
+
+    def test_changed(self):
+        """Test a changed source is compiled again"""
+        self.cache.get(self.filename, 'options', self.compile)
+        self.write("a = 2\n", 2000)
+        code = self.cache.get(self.filename, 'options', self.compile)
+        self.assertEqual(self.compiled, ["a = 1\n", "a = 2\n"])
+        self.assertEqual(self.run_code(code), {'a': 2})
+
+    def test_touched(self):
+        """Test a source with only a new time isn't compiled again, and
+        its entry is updated"""
+        self.cache.get(self.filename, 'options', self.compile)
+        self.write("a = 1\n", 2000)
+        self.cache.get(self.filename, 'options', self.compile)
+        path = self.cache.entry_path(self.filename, 'options')
+        self.assertEqual(self.cache.read(path)[0][ptpycache.H_MTIME], 2000)
+        self.assertEqual(len(self.compiled), 1)
+
+    def test_options(self):
+        """Test each options has its own entry"""
+        self.cache.get(self.filename, 0, self.compile)
+        self.cache.get(self.filename, 1, self.compile)
+        self.cache.get(self.filename, 0, self.compile)
+        self.assertEqual(len(self.compiled), 2)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 2)
+
+    def test_broken_entry(self):
+        """Test an entry that can't be read is replaced"""
+        self.cache.get(self.filename, 'options', self.compile)
+        path = self.cache.entry_path(self.filename, 'options')
+        for data in ["", "garbage", open(path, 'rb').read()[:-10]]:
+            open(path, 'wb').write(data)
+            code = self.cache.get(self.filename, 'options', self.compile)
+            self.assertEqual(self.run_code(code), {'a': 1})
+        self.assertEqual(len(self.compiled), 4)
+
+    def test_prune(self):
+        """Test pruning removes the entries of changed and removed
+        sources only"""
+        other = os.path.join(self.directory, 'n.ptpy')
+        open(other, 'w').write("b = 1\n")
+        for filename in self.filename, other:
+            self.cache.get(filename, 'options', self.compile)
+        self.cache.get(self.filename, 'other options', self.compile)
+        kept = self.cache.entry_path(self.filename, 'options')
+        self.write("a = 1\n", 2000)
+        self.cache.get(self.filename, 'options', self.compile)
+        self.write("a = 2\n", 3000)
+        self.cache.get(self.filename, 'options', self.compile)
+        os.remove(other)
+
+        stale = sorted([self.cache.entry_path(self.filename, 'other options'),
+                        self.cache.entry_path(other, 'options')])
+        self.assertEqual(self.cache.prune(dry_run=True), stale)
+        self.assertEqual(len(os.listdir(self.cache.directory)), 3)
+        self.assertEqual(self.cache.prune(), stale)
+        self.assertEqual(os.listdir(self.cache.directory),
+                         [os.path.basename(kept)])
+
+    def test_compile_file(self):
+        """Test compile_file through the cache and without it"""
+        directory = self.cache.directory
+        code = compile_file(self.filename, directory)
+        self.assertEqual(code.co_filename, self.filename)
+        self.assertEqual(self.run_code(code), {'a': 1})
+        self.assertEqual(compile_file(self.filename, directory), code)
+        self.assertEqual(len(os.listdir(directory)), 1)
+        compile_file(self.filename, directory, optimize=0)
+        self.assertEqual(len(os.listdir(directory)), 2)
+        self.assertEqual(compile_file(self.filename, False), code)
+        self.assertEqual(len(os.listdir(directory)), 2)
+
+
+
+class TestImporter(unittest.TestCase):
+    modules = ['ptspam', 'ptpkg', 'ptpkg.eggs', 'ptshadow', 'ptbroken']
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, 'ptpkg'))
+        for name, source in [
+                ('ptspam.ptpy', "a = 1\nb = function\n"),
+                ('ptpkg/__init__.ptpy', "a = 2\n"),
+                ('ptpkg/eggs.ptpy', "a = 3\n"),
+                ('ptshadow.py', "a = 4\n"),
+                ('ptshadow.ptpy', "a = 5\n"),
+                ('ptbroken.ptpy', "a = (\n")]:
+            f = open(os.path.join(self.directory, name), 'w')
+            f.write(source)
+            f.close()
+        sys.path.insert(0, self.directory)
+        self.importer = ptpyimport.install()
+
+    def tearDown(self):
+        ptpyimport.uninstall()
+        sys.path.remove(self.directory)
+        for name in self.modules:
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.directory)
+
+    def test_module(self):
+        """Test importing a module"""
+        import ptspam
+        self.assertEqual(ptspam.a, 1)
+        self.assertTrue(ptspam.b is ptpy.p_builtins.function)
+        self.assertEqual(ptspam.__file__,
+                         os.path.join(self.directory, 'ptspam.ptpy'))
+        self.assertTrue(isinstance(ptspam.__loader__, ptpyimport.PtpyLoader))
+        self.assertTrue(sys.modules['ptspam'] is ptspam)
+
+    def test_package(self):
+        """Test importing a package and a module in it"""
+        import ptpkg.eggs
+        self.assertEqual((ptpkg.a, ptpkg.eggs.a), (2, 3))
+        self.assertEqual(ptpkg.__path__,
+                         [os.path.join(self.directory, 'ptpkg')])
+        self.assertEqual(ptpkg.eggs.__package__, 'ptpkg')
+
+    def test_python_first(self):
+        """Test a Python module of the same name is imported instead"""
+        import ptshadow
+        self.assertEqual(ptshadow.a, 4)
+
+    def test_broken(self):
+        """Test a module that doesn't compile isn't left imported"""
+        self.assertRaises(SyntaxError, __import__, 'ptbroken')
+        self.assertFalse('ptbroken' in sys.modules)
+
+    def test_cache(self):
+        """Test compiled code is cached next to the source"""
+        import ptspam, ptpkg.eggs
+        cache = os.path.join(self.directory, ptpyimport.CACHE_DIRNAME)
+        self.assertEqual(len(os.listdir(cache)), 1)
+        self.assertEqual(len(os.listdir(os.path.join(
+            self.directory, 'ptpkg', ptpyimport.CACHE_DIRNAME))), 2)
+        ptspam.a = 0
+        reload(ptspam)
+        self.assertEqual(ptspam.a, 1)
+
+    def test_uninstall(self):
+        """Test uninstalling takes the hook and the builtins out"""
+        import __builtin__
+        self.assertTrue(__builtin__.function is ptpy.p_builtins.function)
+        ptpyimport.uninstall()
+        self.assertFalse(self.importer in sys.meta_path)
+        self.assertFalse(hasattr(__builtin__, 'function'))
+        self.assertRaises(ImportError, __import__, 'ptspam')
+
+
+
+class TestCompileCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ptpycache.CompileCache(max_entries=3)
+        self.compiler = PtpyCompiler(cache=self.cache)
+
+    def counters(self):
+        return self.cache.hits, self.cache.misses, self.cache.evictions
+
+    def test_hit(self):
+        """Test the same source and filename compile once"""
+        code = self.compiler.compile("a = 1\n", "f")
+        self.assertTrue(self.compiler.compile("a = 1\n", "f") is code)
+        self.assertTrue(self.compiler.compile("a = 1\n", "g") is not code)
+        self.assertEqual(self.counters(), (1, 2, 0))
+
+    def test_options(self):
+        """Test compilers with other options don't share code"""
+        code = self.compiler.compile("a = 1\n")
+        other = PtpyCompiler(optimize=0, cache=self.cache)
+        self.assertTrue(other.compile("a = 1\n") is not code)
+        self.assertTrue(PtpyCompiler(cache=self.cache).compile("a = 1\n")
+                        is code)
+
+    def test_max_entries(self):
+        """Test the least recently used entry is evicted"""
+        codes = [self.compiler.compile("a = %i\n" % i) for i in range(3)]
+        self.compiler.compile("a = 0\n")
+        self.compiler.compile("a = 3\n")
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.counters(), (1, 4, 1))
+        self.assertTrue(self.compiler.compile("a = 0\n") is codes[0])
+        self.assertTrue(self.compiler.compile("a = 1\n") is not codes[1])
+
+    def test_max_bytes(self):
+        """Test entries are evicted past max_bytes, and code bigger than
+        that isn't kept"""
+        size = len(marshal.dumps(PtpyCompiler().compile("a = 0\n")))
+        self.cache.max_entries = None
+        self.cache.max_bytes = size * 2
+        for i in range(3):
+            self.compiler.compile("a = %i\n" % i)
+        self.assertEqual((len(self.cache), self.cache.bytes), (2, size * 2))
+        self.compiler.compile("a = '%s'\n" % ('x' * size * 2))
+        self.assertEqual((len(self.cache), self.cache.evictions), (2, 1))
+
+    def test_not_strings(self):
+        """Test sources other than strings aren't cached"""
+        self.compiler.compile(buffer("a = 1\n"))
+        self.assertEqual((len(self.cache), self.counters()), (0, (0, 0, 0)))
+
+    def test_threads(self):
+        """Test threads compiling through compilers sharing a cache"""
+        errors = []
+        def work():
+            compiler = PtpyCompiler(cache=self.cache)
+            try:
+                for i in range(20):
+                    namespace = {}
+                    exec compiler.compile("a = %i\n" % (i % 5)) in namespace
+                    self.assertEqual(namespace['a'], i % 5)
+            except Exception, e:
+                errors.append(e)
+        threads = [threading.Thread(target=work) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.cache.hits + self.cache.misses, 80)
+        self.assertEqual(len(self.cache), 3)
+
+
+
+class TestCompileAll(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, 'sub'))
+        for name, source in [('a.ptpy', "a = 1\n"),
+                             ('sub/b.ptpy', "b = 2\n"),
+                             ('sub/c.ptpy', "c = (\n"),
+                             ('sub/d.py', "d = 4\n")]:
+            f = open(os.path.join(self.directory, name), 'w')
+            f.write(source)
+            f.close()
+        self.sources = ptpycompileall.find_sources([self.directory])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_find_sources(self):
+        """Test the sources are found in order, and not in caches"""
+        ptpycompileall.compile_all(self.sources, jobs=1)
+        self.assertEqual(ptpycompileall.find_sources([self.directory]),
+                         [self.path('a.ptpy'), self.path('sub/b.ptpy'),
+                          self.path('sub/c.ptpy')])
+
+    def check(self, jobs):
+        reported = []
+        skipped, failed = ptpycompileall.compile_all(
+            self.sources, jobs=jobs,
+            report=lambda *args: reported.append(args[0]))
+        self.assertEqual(skipped, 0)
+        self.assertEqual([filename for filename, error in failed],
+                         [self.path('sub/c.ptpy')])
+        self.assertTrue(failed[0][1].startswith('SyntaxError'))
+        self.assertEqual(sorted(reported), self.sources)
+
+        compiler = PtpyCompiler()
+        for name in 'a.ptpy', 'sub/b.ptpy':
+            self.assertTrue(compiler.is_cached(
+                self.path(name), ptpyimport.cache_directory(self.path(name))))
+
+        # only the failed one is compiled again
+        skipped, failed = ptpycompileall.compile_all(self.sources, jobs=jobs)
+        self.assertEqual((skipped, len(failed)), (2, 1))
+
+    def test_serial(self):
+        """Test compiling the sources in this process"""
+        self.check(1)
+
+    def test_processes(self):
+        """Test compiling the sources in a pool of processes"""
+        self.check(2)
+
+
+
+class TestCompileStats(unittest.TestCase):
+    source = ("a = 1\n"
+              "definir m:\n"
+              "    b = a + 1\n"
+              "    definir n:\n"
+              "        c = b\n")
+
+    def setUp(self):
+        self.stats = ptpystats.CompileStats()
+        self.events = []
+        self.stats.add_hook(lambda *args: self.events.append(args))
+
+    def test_phases(self):
+        """Test every phase is measured once, and the counters"""
+        code = PtpyCompiler(stats=self.stats).compile(self.source)
+        self.assertEqual(marshal.dumps(code),
+                         marshal.dumps(PtpyCompiler().compile(self.source)))
+        started = [name for event, name, value in self.events
+                   if event == 'start']
+        stopped = [name for event, name, value in self.events
+                   if event == 'stop']
+        self.assertEqual(sorted(set(started)), sorted(ptpystats.PHASES))
+        self.assertEqual(sorted(started), sorted(stopped))
+        # the module, m and n
+        self.assertEqual(started.count('peephole'), 3)
+        self.assertEqual(self.stats.counters['compiles'], 1)
+        self.assertEqual(self.stats.counters['tokens'], len(
+            PtpyCompiler().lexer.tokenize_all(self.source)))
+        self.assertEqual(self.stats.counters['blocks'], 2)
+        self.assertTrue(self.stats.counters['nodes'] > 10)
+        self.assertTrue(self.stats.counters['instructions'] > 10)
+        self.assertTrue(self.stats.total() > 0)
+
+    def test_lexer_engine(self):
+        """Test measured compiles lex with the compiler's lexer engine"""
+        compiler = PtpyCompiler(stats=self.stats)
+        lexer = compiler.lexer
+        lexer.input(self.source)
+        expected = [(tok.type, tok.value, tok.lineno, tok.lexpos)
+                    for tok in lexer]
+        self.assertEqual([(tok.type, tok.value, tok.lineno, tok.lexpos)
+                          for tok in lexer.buffer_tokens(self.source)],
+                         expected)
+
+        lexer.tokenize_all = None
+        compiler.compile(self.source)
+        self.assertEqual(self.stats.counters['tokens'], len(expected))
+
+    def test_debug(self):
+        """Test the scopes are only dumped through the hooks"""
+        stderr = sys.stderr
+        sys.stderr = StringIO.StringIO()
+        try:
+            PtpyCompiler().compile(self.source)
+            PtpyCompiler(stats=self.stats).compile(self.source)
+            self.assertEqual(sys.stderr.getvalue(), "")
+        finally:
+            sys.stderr = stderr
+        scopes = [value.split()[0] for event, name, value in self.events
+                  if event == 'debug' and name == 'scope']
+        self.assertEqual(scopes, ['n', 'm'])
+
+    def test_lazy_blocks(self):
+        """Test lazy blocks are lexed while parsing"""
+        PtpyCompiler(lazy_blocks=True, stats=self.stats).compile(self.source)
+        self.assertEqual(self.stats.counters['tokens'], 0)
+        self.assertEqual(self.stats.wall['lex'], 0)
+
+    def test_error(self):
+        """Test a compile that fails leaves the phases closed and the
+        garbage collector on"""
+        compiler = PtpyCompiler(stats=self.stats)
+        self.assertRaises(SyntaxError, compiler.compile, "a = (\n")
+        self.assertTrue(gc.isenabled())
+        compiler.compile(self.source)
+        self.assertEqual(self.stats.counters['compiles'], 2)
+        self.assertEqual(self.stats.counters['blocks'], 2)
+
+
+
+class TestAnalysis(unittest.TestCase):
+    source = ("a = 1\n"
+              "se 0:\n"
+              "    b = 2\n"
+              "    definir p:\n"
+              "        d = 4\n"
+              "x = {\"k\": 2}\n"
+              "definir m:\n"
+              "    b = a + 1\n"
+              "    definir n:\n"
+              "        c = b\n")
+
+    def parse(self):
+        tree = PtpyParser().parse(self.source)
+        return tree, ptpysymbols.analyze(tree, 'spam.ptpy')
+
+    def test_filename(self):
+        """Test every node gets the filename"""
+        tree, analysis = self.parse()
+        todo = [tree]
+        while todo:
+            node = todo.pop()
+            self.assertEqual(node.filename, 'spam.ptpy')
+            todo.extend(node.getChildNodes())
+
+    def test_scopes(self):
+        """Test the scopes and local names are the ones the separate
+        walks find"""
+        tree, analysis = self.parse()
+        symbols = ptpysymbols.PtpySymbolVisitor()
+        visitor.walk(tree, symbols)
+        self.assertEqual(set(analysis.scopes), set(symbols.scopes))
+        for node, scope in symbols.scopes.items():
+            other = analysis.scopes[node]
+            self.assertEqual((scope.defs, scope.uses, scope.frees,
+                              scope.cells, scope.globals),
+                             (other.defs, other.uses, other.frees,
+                              other.cells, other.globals))
+            if isinstance(node, ptpyast.Code):
+                body = node.code
+            else:
+                body = node.node
+            finder = visitor.walk(body, PtpyNameFinder())
+            self.assertEqual(sorted(analysis.local_names(other).elts),
+                             sorted(finder.getLocals().elts))
+        self.assertEqual(sorted(analysis.local_names(
+            analysis.scopes[tree]).elts), ['a', 'b', 'm', 'p', 'x'])
+        self.assertEqual(list(analysis.futures), [])
+
+    def test_resolve(self):
+        """Test the names free in nested blocks are resolved"""
+        tree = PtpyParser().parse("definir m:\n"
+                                  "    a = 1\n"
+                                  "    b = 2\n"
+                                  "    definir n:\n"
+                                  "        b = 3\n"
+                                  "        definir o:\n"
+                                  "            c = [a, b, d]\n")
+        scopes = dict([(scope.name, scope) for scope in
+                       ptpysymbols.analyze(tree, 'spam.ptpy').scopes.values()])
+        m, n, o = scopes['m'], scopes['n'], scopes['o']
+        self.assertEqual(m.get_cell_vars(), ['a'])
+        self.assertEqual(m.get_free_vars(), ())
+        self.assertEqual(n.get_free_vars(), ['a'])
+        self.assertEqual(o.get_free_vars(), ['a'])
+        self.assertEqual(n.frees, {'a': 1})
+        self.assertEqual([o.check_name(name) for name in 'abcd'],
+                         [SC_FREE, SC_GLOBAL_IMPLICIT, SC_LOCAL,
+                          SC_GLOBAL_IMPLICIT])
+        self.assertEqual([n.check_name(name) for name in 'abd'],
+                         [SC_FREE, SC_LOCAL, SC_GLOBAL_IMPLICIT])
+        self.assertEqual(m.check_name('a'), SC_CELL)
+        self.assertEqual(m.check_name('d'), SC_GLOBAL_IMPLICIT)
+
+    def test_code(self):
+        """Test the code is the same with the analysis given"""
+        tree, analysis = self.parse()
+        code = PtpyModuleCodeGenerator(tree, analysis=analysis).getCode()
+        ns = {}
+        exec code in ns
+        self.assertEqual(ns['a'], 1)
+        self.assertEqual(ns['x'], {'k': 2})
+        self.assertFalse('b' in ns or 'p' in ns)
+
+
+
+class TestCompilerPool(unittest.TestCase):
+    def source(self, i):
+        return "a = %i\nb = (a, %i, [a, %i])\nc = a * %i\n" % (i, i, i, i)
+
+    def check(self, code, i):
+        namespace = {}
+        exec code in {}, namespace
+        self.assertEqual(namespace, {'a': i, 'b': (i, i, [i, i]),
+                                     'c': i * i})
+
+    def test_threads(self):
+        """Threads compiling at once through one pool"""
+        pool = PtpyCompilerPool()
+        errors = []
+
+        def work(start):
+            try:
+                for i in range(start, start + 50):
+                    self.check(pool.compile(self.source(i)), i)
+            except Exception, e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(n * 50,))
+                   for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertTrue(1 <= pool.created <= 8)
+
+    def test_size(self):
+        """A sized pool never makes more compilers than its size"""
+        pool = PtpyCompilerPool(size=2)
+        first, second = pool.acquire(), pool.acquire()
+        self.assertTrue(first is not second)
+        result = []
+        waiting = threading.Thread(target=lambda: result.append(
+            pool.acquire()))
+        waiting.start()
+        pool.release(first)
+        waiting.join()
+        self.assertTrue(result[0] is first)
+        self.assertEqual(pool.created, 2)
+
+    def test_reuse_after_error(self):
+        """A compiler given back after a syntax error still works"""
+        pool = PtpyCompilerPool(size=1)
+        self.assertRaises(SyntaxError, pool.compile, "a = (1,\n")
+        self.check(pool.compile(self.source(3)), 3)
+
 
 
 if __name__ == '__main__':
@@ -8,10 +8,15 @@ __date__ = "Sat Sep 29 00:23:11 2012"
 
 
 
+import mmap
 import re
+import StringIO
+import tempfile
 import unittest
 
 import ply.lex as lex
+import ptpy.p_dialects as ptpydialects
+import ptpy.p_incremental as ptpyincremental
 import ptpy.p_lexer as ptpylexer
 
 
@@ -76,6 +81,51 @@ class TestTokens(unittest.TestCase):
         self.assertEqual(tok.value, 'variable', tok.value)
 
 
+    def test_strings(self):
+        """Test single, double, triple-quoted and raw strings"""
+        cases = [('"oi"', 'oi'),
+                 ("'oi'", 'oi'),
+                 ('"a \\"b\\"\\n"', 'a "b"\n'),
+                 ("'a \\'b\\''", "a 'b'"),
+                 ('"""a "b"\nc"""', 'a "b"\nc'),
+                 ("'''a\n'b'''", "a\n'b"),
+                 ('r"\\d+"', '\\d+'),
+                 ("R'''\\n'''", '\\n'),
+                 ('""', ''),
+                 ('""""""', '')]
+        for source, value in cases:
+            self.lexer.input(source)
+            tok = self.lexer.token()
+            self.assertEqual(tok.type, 'SCONST', source)
+            self.assertEqual(tok.value, value, source)
+            self.assertEqual(self.lexer.token().type, 'NEWLINE', source)
+
+    def test_multiline_string(self):
+        """A string token is on the line it starts"""
+        self.lexer.input('a = """x\ny\n"""\nb = 1\n')
+        tokens = [(t.type, t.lineno) for t in self.lexer]
+        self.assertEqual(tokens, [('NAME', 1), ('ASSIGN', 1), ('SCONST', 1),
+                                  ('NEWLINE', 3), ('NAME', 4), ('ASSIGN', 4),
+                                  ('ICONST', 4), ('NEWLINE', 4),
+                                  ('ENDMARKER', 4)])
+
+    def test_unterminated_string(self):
+        for source in ('"abc\n', '"abc\ndef"\n', '"""abc\n', "r'''a\n"):
+            self.lexer.input(source)
+            self.assertRaises(SyntaxError, list, self.lexer)
+
+    def test_short_strings_interned(self):
+        # build the literals at runtime, so they start as distinct
+        # string objects
+        short = '"%s"' % ('ab' * 4)
+        long = '"%s"' % ('ab' * ptpylexer.SHORT_STRING)
+        values = []
+        for source in (short, short, long, long):
+            self.lexer.input(source[:])
+            values.append(self.lexer.token().value)
+        self.assertTrue(values[0] is values[1])
+        self.assertEqual(values[2], values[3])
+
     def test_operators(self):
         """Test operators
 
@@ -458,7 +508,7 @@ class TestTokens(unittest.TestCase):
 
         tok = self.lexer.token()
         self.assertEqual(tok.type, 'NEWLINE', tok.type)
-        self.assertEqual(tok.value, '\n\n')
+        self.assertEqual(tok.value, '\n')
 
     def test_if_indent_dedent(self):
         """Test if statement with indent and dedent tokens
@@ -603,7 +653,7 @@ class TestTokens(unittest.TestCase):
         self.assertEqual(tok.value, ')')
         tok = self.lexer.token()
         self.assertEqual(tok.type, 'NEWLINE', tok.type)
-        self.assertEqual(tok.value, '\n\n')
+        self.assertEqual(tok.value, '\n')
 
         assert self.lexer.token().type == 'ENDMARKER'
         assert self.lexer.token() is None
@@ -675,7 +725,7 @@ class TestTokens(unittest.TestCase):
         self.assertEqual(tok.value, 'a')
         tok = self.lexer.token()
         self.assertEqual(tok.type, 'NEWLINE', tok.type)
-        self.assertEqual(tok.value, '\n\n')
+        self.assertEqual(tok.value, '\n')
         tok = self.lexer.token()
         self.assertEqual(tok.type, 'DEDENT', tok.type)
         self.assertEqual(tok.value, None)
@@ -684,6 +734,376 @@ class TestTokens(unittest.TestCase):
         assert self.lexer.token() is None
 
 
+class TestFusedTokens(TestTokens):
+    """Run all the token tests above against the fused engine"""
+    def setUp(self):
+        self.lexer = ptpylexer.PtpyLexer(reflags=re.UNICODE, engine='fused')
+
+    def test_same_stream_as_ply(self):
+        """Test both engines give the same tokens
+
+        se a < b:
+            c = (b +
+          1)   # comment
+
+            enquanto c:
+                d = [1, 2.5, "x\\n"]; c -= 1
+        senao:
+            c = d
+        """
+        string = self.get_string(self.test_same_stream_as_ply)
+        ply = ptpylexer.PtpyLexer(reflags=re.UNICODE, engine='ply')
+
+        ply.input(string)
+        self.lexer.input(string)
+        expected = [(t.type, t.value, t.lineno, t.lexpos) for t in ply]
+        got = [(t.type, t.value, t.lineno, t.lexpos) for t in self.lexer]
+        self.assertEqual(got, expected)
+
+    def test_illegal_character(self):
+        """Test both engines fail the same way on illegal characters"""
+        ply = ptpylexer.PtpyLexer(reflags=re.UNICODE, engine='ply')
+        for lexer in (ply, self.lexer):
+            lexer.input("a = 1\nb = $\n")
+            self.assertRaises(SyntaxError, list, lexer)
+
+    def test_line_index(self):
+        """Test both engines index the same line starts"""
+        source = 'a = (1,\n\n  2)\nb = """x\ny\n"""\n\nc = 1\n'
+        starts = [0] + [i + 1 for i, c in enumerate(source) if c == '\n']
+        ply = ptpylexer.PtpyLexer(reflags=re.UNICODE, engine='ply')
+        for lexer in (ply, self.lexer):
+            lexer.input(source)
+            tokens = list(lexer)
+            self.assertEqual(list(lexer.line_index.starts), starts)
+            for tok in tokens:
+                if tok.lexpos >= 0 and tok.type != 'ENDMARKER':
+                    lineno, column = lexer.line_index.position(tok.lexpos)
+                    self.assertEqual(lineno, tok.lineno)
+                    self.assertEqual(starts[lineno-1] + column, tok.lexpos)
+
+    def test_error_position(self):
+        """Test both engines report where a lexical error is"""
+        ply = ptpylexer.PtpyLexer(reflags=re.UNICODE, engine='ply')
+        for source, message in [
+                ("a = 1\nb = (1,\n  $)\n", "at line 3, column 2"),
+                ('a = """x\ny"""; $\n', "at line 2, column 6"),
+                ('a = 1\nb = """x\n', "at line 2, column 4")]:
+            for lexer in (ply, self.lexer):
+                lexer.input(source)
+                try:
+                    list(lexer)
+                except SyntaxError, e:
+                    self.assertTrue(str(e).endswith(message), str(e))
+                else:
+                    self.fail("no error in %r" % source)
+
+    def test_skip_blocks(self):
+        """Test both engines skip the same block bodies
+
+        definir m:
+            a = 1
+            se a:
+                b = 2
+
+        # after
+        definir function n:
+            c = 3
+        definir o: d = 4
+        """
+        string = self.get_string(self.test_skip_blocks)
+        ply = ptpylexer.PtpyLexer(reflags=re.UNICODE, engine='ply')
+        for lexer in (ply, self.lexer):
+            lexer.input(string, skip_blocks=True)
+            tokens = [(t.type, t.value) for t in lexer]
+            self.assertEqual(tokens, [
+                ('DEF', 'definir'), ('NAME', 'm'), ('COLON', ':'),
+                ('BLOCK', '    a = 1\n    se a:\n        b = 2\n\n'
+                          '# after\n'),
+                ('DEF', 'definir'), ('NAME', 'function'), ('NAME', 'n'),
+                ('COLON', ':'), ('BLOCK', '    c = 3\n'),
+                ('DEF', 'definir'), ('NAME', 'o'), ('COLON', ':'),
+                ('NAME', 'd'), ('ASSIGN', '='), ('ICONST', '4'),
+                ('NEWLINE', '\n'), ('ENDMARKER', None)])
+
+
+class TestDialects(unittest.TestCase):
+    def tokens(self, source, dialect, engine, **kwargs):
+        lexer = ptpylexer.PtpyLexer(reflags=re.UNICODE, engine=engine,
+                                    dialect=dialect, **kwargs)
+        lexer.input(source)
+        return [(t.type, t.value) for t in lexer]
+
+    def assertTokens(self, source, dialect, expected):
+        for engine in ('ply', 'fused'):
+            tokens = self.tokens(source, dialect, engine)
+            self.assertEqual(tokens[:len(expected)], expected)
+
+    def test_keywords(self):
+        self.assertTokens('se nao a:\n', 'pt-PT',
+                          [('IF', 'se'), ('BNOT', 'nao'), ('NAME', 'a')])
+        self.assertTokens('if not se:\n', 'en',
+                          [('IF', 'if'), ('BNOT', 'not'), ('NAME', 'se')])
+
+    def test_accented_keywords(self):
+        self.assertTokens('se n\xc3\xa3o senao:\n', 'pt-BR',
+                          [('IF', 'se'), ('BNOT', 'n\xc3\xa3o'),
+                           ('NAME', 'senao')])
+        self.assertTokens('sen\xc3\xa3o:\n', 'pt-BR',
+                          [('ELSE', 'sen\xc3\xa3o')])
+
+    def test_unicode_identifiers(self):
+        self.assertTokens('a\xc3\xa7\xc3\xa3o = ol\xc3\xa1\n', 'pt-BR',
+                          [('NAME', 'a\xc3\xa7\xc3\xa3o'), ('ASSIGN', '='),
+                           ('NAME', 'ol\xc3\xa1')])
+        for engine in ('ply', 'fused'):
+            # only the dialects with non-ASCII keywords take them
+            self.assertRaises(SyntaxError, self.tokens,
+                              'a\xc3\xa7\xc3\xa3o = 1\n', 'pt-PT', engine)
+            # the multiplication sign isn't a letter
+            try:
+                self.tokens('a = 1\nb\xc3\x97c = 1\n', 'pt-BR', engine)
+            except SyntaxError, e:
+                self.assertEqual(str(e), "invalid identifier 'b\\xc3\\x97c' "
+                                         "at line 2, column 0")
+            else:
+                self.fail("no error")
+
+    def test_chunks(self):
+        source = 'a = 1\n' * 5 + 'se n\xc3\xa3o a\xc3\xa7\xc3\xa3o:\n    b\n'
+        expected = self.tokens(source, 'pt-BR', 'ply')
+        self.assertEqual(self.tokens(StringIO.StringIO(source), 'pt-BR',
+                                     'fused', chunk_size=4), expected)
+
+    def test_unknown_dialect(self):
+        self.assertRaises(ValueError, ptpylexer.PtpyLexer, dialect='xx')
+        ptpydialects.register_dialect('test-unknown', {'se': 'SE'})
+        try:
+            self.assertRaises(ValueError, ptpylexer.PtpyLexer,
+                              dialect='test-unknown')
+        finally:
+            del ptpydialects.DIALECTS['test-unknown']
+
+
+class TestSources(unittest.TestCase):
+    """Test the lexer reads file objects and buffers like strings"""
+
+    source = ('se a < b:\n'
+              '    c = "um texto"  # comment\n'
+              '\n\n'
+              '    d = (1 +\n'
+              '         2)\n'
+              'senao:\n'
+              '    c = d\n')
+
+    def tokens(self, lexer, data):
+        lexer.input(data)
+        return [(t.type, t.value, t.lineno, t.lexpos) for t in lexer]
+
+    def setUp(self):
+        lexer = ptpylexer.PtpyLexer(engine='ply')
+        self.expected = self.tokens(lexer, self.source)
+
+    def test_file_object_in_chunks(self):
+        for chunk_size in (1, 2, 3, 7, 64):
+            lexer = ptpylexer.PtpyLexer(engine='fused', chunk_size=chunk_size)
+            got = self.tokens(lexer, StringIO.StringIO(self.source))
+            self.assertEqual(got, self.expected, chunk_size)
+
+    def test_buffers(self):
+        view = memoryview(self.source)
+        for engine in ('ply', 'fused'):
+            lexer = ptpylexer.PtpyLexer(engine=engine, chunk_size=5)
+            for data in (buffer(self.source), bytearray(self.source), view):
+                self.assertEqual(self.tokens(lexer, data), self.expected)
+
+    def test_mmap(self):
+        f = tempfile.TemporaryFile()
+        f.write(self.source)
+        f.flush()
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for engine in ('ply', 'fused'):
+            lexer = ptpylexer.PtpyLexer(engine=engine)
+            self.assertEqual(self.tokens(lexer, data), self.expected)
+        data.close()
+        f.close()
+
+    def test_string_across_chunks(self):
+        source = ('a = """um\n\n  texto\n"""\n'
+                  "b = r'''\nlongo\n''' + c\n")
+        lexer = ptpylexer.PtpyLexer(engine='ply')
+        expected = self.tokens(lexer, source)
+        for chunk_size in (1, 2, 3, 7, 64):
+            lexer = ptpylexer.PtpyLexer(engine='fused', chunk_size=chunk_size)
+            got = self.tokens(lexer, StringIO.StringIO(source))
+            self.assertEqual(got, expected, chunk_size)
+
+    def test_escaped_quotes_across_chunks(self):
+        source = 'a = """um\n\\"""\n\\"""\ntexto\n"""\nb = 1\n'
+        lexer = ptpylexer.PtpyLexer(engine='ply')
+        expected = self.tokens(lexer, source)
+        for chunk_size in (1, 2, 3, 7, 64):
+            lexer = ptpylexer.PtpyLexer(engine='fused', chunk_size=chunk_size)
+            got = self.tokens(lexer, StringIO.StringIO(source))
+            self.assertEqual(got, expected, chunk_size)
+
+    def test_open_string_across_chunks(self):
+        source = 'a = 1\nb = """' + 'texto\n' * 1000
+        lexer = ptpylexer.PtpyLexer(engine='fused', chunk_size=7)
+        try:
+            self.tokens(lexer, StringIO.StringIO(source))
+        except SyntaxError, e:
+            self.assertEqual(str(e), "EOF while scanning triple-quoted "
+                             "string at line 2, column 4")
+        else:
+            self.fail("SyntaxError not raised")
+
+    def test_no_trailing_newline(self):
+        """The last line gets a NEWLINE even if the source has none"""
+        for engine in ('ply', 'fused'):
+            lexer = ptpylexer.PtpyLexer(engine=engine)
+            got = self.tokens(lexer, self.source.rstrip('\n'))
+            self.assertEqual([t[0] for t in got],
+                             [t[0] for t in self.expected])
+
+
+class TestTokenBuffer(unittest.TestCase):
+    source = TestSources.source
+
+    def test_same_tokens_as_stream(self):
+        lexer = ptpylexer.PtpyLexer()
+        lexer.input(self.source)
+        expected = [(t.type, t.value, t.lineno, t.lexpos) for t in lexer]
+
+        tokbuf = lexer.tokenize_all(self.source)
+        self.assertEqual(len(tokbuf), len(expected))
+        self.assertEqual([(t.type, t.value, t.lineno, t.lexpos)
+                          for t in tokbuf], expected)
+        self.assertEqual([(t.type, t.value, t.lineno, t.lexpos)
+                          for t in tokbuf.lexer()], expected)
+
+    def test_spans(self):
+        tokbuf = ptpylexer.PtpyLexer().tokenize_all(self.source)
+        for i in range(len(tokbuf)):
+            text = self.source[tokbuf.starts[i]:tokbuf.ends[i]]
+            if tokbuf.type(i) == 'SCONST':
+                self.assertEqual(text, '"%s"' % tokbuf.values[i])
+            elif tokbuf.type(i) not in ('INDENT', 'DEDENT', 'ENDMARKER'):
+                self.assertEqual(text, tokbuf.values[i])
+
+    def test_names_are_interned(self):
+        # build the source at runtime, so equal names start as
+        # distinct string objects
+        source = ''.join('%s = %s\n' % ('nome' * 2, 'nome' * 2)
+                         for i in range(3))
+        tokbuf = ptpylexer.PtpyLexer().tokenize_all(source)
+        names = [tokbuf.values[i] for i in range(len(tokbuf))
+                 if tokbuf.type(i) == 'NAME']
+        self.assertEqual(len(names), 6)
+        for name in names[1:]:
+            self.assertTrue(name is names[0])
+
+    def test_line_index(self):
+        lexer = ptpylexer.PtpyLexer()
+        lexer.input(self.source)
+        list(lexer)
+        tokbuf = lexer.tokenize_all(self.source)
+        self.assertEqual(list(tokbuf.line_index.starts),
+                         list(lexer.line_index.starts))
+        self.assertEqual(len(tokbuf.line_index), self.source.count('\n') + 1)
+
+class TestIncremental(unittest.TestCase):
+    source = TestSources.source
+
+    def tokens(self, toks):
+        return [(t.type, t.value, t.lineno, t.lexpos) for t in toks]
+
+    def edit(self, lexer, offset, deleted, inserted):
+        # the edit must give the same tokens as lexing the new source,
+        # replacing only the tokens it returns
+        old = lexer.tokens()
+        start, end, toks = lexer.edit(offset, deleted, inserted)
+
+        text = lexer.text
+        full = ptpylexer.PtpyLexer(engine='fused')
+        full.input(text)
+        expected = self.tokens(full)
+        self.assertEqual(self.tokens(lexer.tokens()), expected)
+        self.assertEqual(len(lexer), len(expected))
+
+        self.assertEqual(self.tokens(old[:start]), expected[:start])
+        self.assertEqual(self.tokens(toks),
+                         expected[start:start+len(toks)])
+        self.assertEqual([t.type for t in old[end:]],
+                         [t[0] for t in expected[start+len(toks):]])
+        return start, end, toks
+
+    def test_tokens(self):
+        lexer = ptpyincremental.IncrementalLexer(self.source)
+        full = ptpylexer.PtpyLexer()
+        full.input(self.source)
+        self.assertEqual(self.tokens(lexer.tokens()), self.tokens(full))
+        self.assertEqual(lexer.text, self.source)
+
+    def test_edit_in_line(self):
+        lexer = ptpyincremental.IncrementalLexer(self.source)
+        offset = self.source.index('um texto')
+        start, end, toks = self.edit(lexer, offset, 2, 'outro')
+        # only the line's tokens are scanned again
+        self.assertEqual([t.type for t in toks],
+                         ['INDENT', 'NAME', 'ASSIGN', 'SCONST', 'NEWLINE'])
+        self.assertEqual(end - start, 5)
+
+    def test_edit_lines(self):
+        lexer = ptpyincremental.IncrementalLexer(self.source)
+        offset = self.source.index('senao')
+        self.edit(lexer, offset, 0, 'e = 1\n')
+        self.edit(lexer, offset, 0, 'se e:\n    ')
+        self.edit(lexer, 0, 0, '\n\n')
+        self.edit(lexer, len(lexer.text), 0, 'f = (1,\n 2)')
+        self.edit(lexer, len(lexer.text) - 1, 1, '')
+        self.edit(lexer, len(lexer.text), 0, ')')
+
+    def test_edit_parens(self):
+        lexer = ptpyincremental.IncrementalLexer(self.source)
+        # opening a parenthesis makes the following newlines vanish
+        # until it's closed
+        offset = self.source.index('c = d') + 4
+        self.edit(lexer, offset, 0, '(')
+        self.edit(lexer, offset, 1, '')
+
+    def test_edit_strings(self):
+        lexer = ptpyincremental.IncrementalLexer(self.source)
+        self.edit(lexer, len(lexer.text), 0, 'e = """a\nb"""\n')
+        self.edit(lexer, lexer.text.index('a\nb') + 2, 0, 'c\n\n')
+        offset = self.source.index('senao')
+        self.edit(lexer, offset, 0, 'f = """\n"""\n')
+        # code inside the string is only text
+        self.edit(lexer, offset + 8, 0, 'senao:\n    ')
+        self.edit(lexer, offset + 8, len('senao:\n    '), '')
+
+    def test_error(self):
+        lexer = ptpyincremental.IncrementalLexer(self.source)
+        offset = self.source.index('senao')
+        self.assertRaises(IndentationError, lexer.edit, offset, 0, ' ')
+        self.assertEqual(lexer.text, self.source[:offset] + ' ' +
+                         self.source[offset:])
+        self.assertRaises(IndentationError, lexer.tokens)
+        self.assertEqual(lexer.text, self.source[:offset] + ' ' +
+                         self.source[offset:])
+        # the next edit scans the whole source again
+        start, end, toks = lexer.edit(offset, 1, '')
+        full = ptpylexer.PtpyLexer()
+        full.input(self.source)
+        self.assertEqual((start, end), (0, len(toks)))
+        self.assertEqual(self.tokens(toks), self.tokens(full))
+
+    def test_out_of_range(self):
+        lexer = ptpyincremental.IncrementalLexer(self.source)
+        self.assertRaises(ValueError, lexer.edit, len(self.source), 1, '')
+        self.assertRaises(ValueError, lexer.edit, -1, 0, 'a')
+
+
 
 if __name__ == '__main__':
     unittest.main()
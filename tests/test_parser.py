@@ -7,6 +7,8 @@ __author__ = "Pedro Werneck (pjwerneck@gmail.com)"
 __date__ = "Sat Sep 29 00:23:11 2012"
 
 
+import multiprocessing
+import StringIO
 import unittest
 
 from compiler import ast, misc, syntax, pycodegen
@@ -14,6 +16,8 @@ from compiler.consts import *
 
 import ply.yacc as yacc
 
+import ptpy.p_lexer as ptpylexer
+import ptpy.p_parser as ptpyparser
 from ptpy.p_parser import PtpyParser
 from ptpy.p_compiler import PtpyCompiler
 
@@ -54,6 +58,13 @@ class BaseTest(unittest.TestCase):
                 stack.append(value)
         return stack
             
+    def flatten(self, tree):
+        # every node with its position and every value, as some nodes
+        # have no repr of their own
+        return [isinstance(node, ast.Node) and
+                (type(node).__name__, node.lineno, node.col_offset) or node
+                for node in traverse_tree(tree)]
+
     def parse_expr(self, expr):
         parser = ptpyparser.PtpyParser()
         result = ptpyparser.traverse(parser.parse(expr))
@@ -118,14 +129,52 @@ class TestParserRules(BaseTest):
         assert isinstance(tree.next(), ast.Name)
         assert tree.next() == 'a'
         self.assertRaises(StopIteration, tree.next)
-        
+
+    def test_nested_tuple_item(self):
+        """Test a tuple item is kept whole
+
+        a, (b, c)
+
+        """
+        code = self.get_string(self.test_nested_tuple_item)
+        stmt = self.parser.parse(code).node.nodes[0]
+        self.assertEqual(len(stmt.expr.nodes), 2)
+        self.assertTrue(isinstance(stmt.expr.nodes[1], ast.Tuple))
+
+    def test_single_item_list(self):
+        """Test lists of one item, with and without trailing comma
+
+        [a]
+        [a,]
+
+        """
+        code = self.get_string(self.test_single_item_list)
+        for stmt in self.parser.parse(code).node.nodes:
+            self.assertTrue(isinstance(stmt.expr, ast.List))
+            self.assertEqual(len(stmt.expr.nodes), 1)
+
+    def test_long_lists(self):
+        """Long literals, argument lists and modules parse in one piece"""
+        items = ', '.join(str(i) for i in range(5000))
+        pairs = ', '.join('"k%i": %i' % (i, i) for i in range(5000))
+        code = 'a = [%s]\nb = %s,\nc = {%s}\nd = f(%s)\n' % (
+            items, items, pairs, items)
+        code += ''.join('e%i = %i\n' % (i, i) for i in range(5000))
+        stmts = self.parser.parse(code).node.nodes
+        self.assertEqual(len(stmts), 5004)
+        self.assertEqual(len(stmts[0].expr.nodes), 5000)
+        self.assertEqual(len(stmts[1].expr.nodes), 5000)
+        self.assertEqual(len(stmts[2].expr.items), 5000)
+        self.assertEqual(len(stmts[3].expr.args), 5000)
+        self.assertEqual(stmts[-1].nodes[0].name, 'e4999')
+
 
     def test_booleans(self):
         """Test all boolean operators
 
-        not a
-        a and b
-        a or b
+        nao a
+        a e b
+        a ou b
         """
         code = self.get_string(self.test_booleans)
         tree = traverse_tree(self.parser.parse(code))
@@ -162,9 +211,9 @@ class TestParserRules(BaseTest):
         a != b
         a == b
         a is b
-        a is not b
-        a in b
-        a not in b
+        a is nao b
+        a em b
+        a nao em b
 
         """
 
@@ -561,8 +610,299 @@ class TestParserRules(BaseTest):
         
         """
         code = self.get_string(self.test_assignment_to_literal_fails)
-        print self.parser._lexer
-        #self.assertRaises(SyntaxError, self.parser.parse, code)
+        self.assertRaises(SyntaxError, self.parser.parse, code)
+
+    def test_assignment_to_literal_not_recovered(self):
+        """Test the statements around an assignment to a literal don't
+        make the parser drop it and go on"""
+        for code in ["1 = 0\n", "a = 1\n1 = 0\nb = 2\n"]:
+            try:
+                self.parser.parse(code)
+            except SyntaxError, e:
+                self.assertEqual(str(e), "Cannot assign to literal")
+            else:
+                self.fail("SyntaxError not raised for %r" % code)
+
+    def test_parse_file_object(self):
+        """Test parsing a file object gives the same tree as a string
+
+        a = 1
+        b = (a,
+             2)
+        """
+        code = self.get_string(self.test_parse_file_object)
+        expected = repr(self.parser.parse(code))
+        self.assertEqual(repr(self.parser.parse(StringIO.StringIO(code))),
+                         expected)
+
+        parser = PtpyParser(ptpylexer.PtpyLexer(engine='fused', chunk_size=4))
+        self.assertEqual(repr(parser.parse(StringIO.StringIO(code))), expected)
+
+    def test_parse_token_buffer(self):
+        """Test the parser takes the tokens from a token buffer
+
+        a = {"k": (1, 2)}
+        b = a
+        """
+        code = self.get_string(self.test_parse_token_buffer)
+        tokbuf = ptpylexer.PtpyLexer().tokenize_all(code)
+        self.assertEqual(repr(self.parser.parse(tokbuf)),
+                         repr(self.parser.parse(code)))
+
+    def test_node_positions(self):
+        """Test every node gets the line and column it starts at
+
+        a = 1
+        se a:
+            b = (c +
+          d)
+        """
+        code = self.get_string(self.test_node_positions)
+        tree = self.parser.parse(code)
+        positions = []
+        def walk(node):
+            positions.append((node.__class__.__name__,
+                              node.lineno, node.col_offset))
+            for child in node.getChildNodes():
+                walk(child)
+        for node in tree.getChildNodes():
+            walk(node)
+        self.assertEqual(positions, [
+            ('Stmt', 1, 0),
+            ('Assign', 1, 0), ('AssName', 1, 0), ('Const', 1, 4),
+            ('If', 2, 0), ('Name', 2, 3), ('Stmt', 2, 5),
+            ('Assign', 3, 4), ('AssName', 3, 4),
+            ('Add', 3, 9), ('Name', 3, 9), ('Name', 4, 2)])
+
+    def test_syntax_error_position(self):
+        """Test syntax errors tell where the unexpected token is"""
+        try:
+            self.parser.parse("a = 1\nb = = 2\n")
+        except SyntaxError, e:
+            self.assertEqual(str(e), "invalid syntax at line 2, column 4: "
+                                     "unexpected ASSIGN '='")
+        else:
+            self.fail("no syntax error")
+
+    def test_dialects(self):
+        """Test the same program in every dialect gives the same tree
+
+        se nao a:
+            b = 1
+        senao:
+            b = 2
+        """
+        code = self.get_string(self.test_dialects)
+        expected = repr(self.parser.parse(code))
+        for dialect, words in [('pt-BR', ('n\xc3\xa3o', 'sen\xc3\xa3o')),
+                               ('en', ('not', 'else'))]:
+            source = code.replace('senao', words[1]).replace('nao', words[0])
+            if dialect == 'en':
+                source = source.replace('se ', 'if ')
+            parser = PtpyParser(ptpylexer.PtpyLexer(dialect=dialect))
+            self.assertEqual(repr(parser.parse(source)), expected)
+
+
+class TestParallel(BaseTest):
+    def setUp(self):
+        self.min_size = ptpyparser.PARALLEL_MIN_SIZE
+        ptpyparser.PARALLEL_MIN_SIZE = 0
+
+    def tearDown(self):
+        ptpyparser.PARALLEL_MIN_SIZE = self.min_size
+
+    def test_split_statements(self):
+        """Test sources are only cut where a top-level statement starts
+
+        a = 1
+        se a:
+            b = 2
+        senao:
+            b = 3
+        c = (1 +
+          2)
+        d = 4
+        """
+        code = self.get_string(self.test_split_statements)
+        pieces = ptpyparser.split_statements(code, 100)
+        self.assertEqual(pieces, [(1, "a = 1\n"),
+                                  (2, "se a:\n    b = 2\nsenao:\n"
+                                      "    b = 3\n"),
+                                  (6, "c = (1 +\n  2)\n"),
+                                  (8, "d = 4\n")])
+
+    def test_split_skips_strings(self):
+        """Test lines starting in strings, brackets or comments, after a
+        line continuation or with a continuation keyword aren't cut"""
+        code = ('a = """\nb = 1\n"""\n'
+                "c = ['(', 1,\nd]\n"
+                "e = 1 + \\\nf\n"
+                "se a:\n    b = 2\n# comment\n    c = 3\n"
+                "else:\n    d = 4\n"
+                "g = 5\n")
+        self.assertEqual(ptpyparser.split_statements(code, 1000), [
+            (1, 'a = """\nb = 1\n"""\n'),
+            (4, "c = ['(', 1,\nd]\n"),
+            (6, "e = 1 + \\\nf\n"),
+            (8, "se a:\n    b = 2\n# comment\n    c = 3\n"),
+            (12, "else:\n    d = 4\n"),
+            (14, "g = 5\n")])
+        # else is only a keyword in en
+        self.assertEqual(ptpyparser.split_statements(code, 1000, 'en')[3:], [
+            (8, "se a:\n    b = 2\n# comment\n    c = 3\n"
+                "else:\n    d = 4\n"),
+            (14, "g = 5\n")])
+        # nor before the first statement
+        self.assertEqual(
+            ptpyparser.split_statements("# a\n\nb = 1\nc = 2\n", 1000),
+            [(1, "# a\n\nb = 1\n"), (4, "c = 2\n")])
+
+    def test_same_tree(self):
+        """Test a parallel parse gives the tree a serial parse does"""
+        from ptpy.bench import corpus
+        code = corpus.generate('mixed', 8192, seed=2)
+        expected = PtpyParser().parse(code)
+        parser = PtpyParser(processes=2)
+        try:
+            tree = parser.parse(code)
+        finally:
+            parser.close()
+        self.assertEqual(self.flatten(tree.node),
+                         self.flatten(expected.node))
+
+    def test_pool(self):
+        """Test parallel parses share one pool until the parser is
+        closed, and a pool given to the parser is left open"""
+        from ptpy.bench import corpus
+        code = corpus.generate('mixed', 8192, seed=2)
+        expected = self.flatten(PtpyParser().parse(code).node)
+        parser = PtpyParser(processes=2)
+        self.assertEqual(self.flatten(parser.parse(code).node), expected)
+        pool = parser._pool
+        self.assertTrue(pool is not None)
+        self.assertEqual(self.flatten(parser.parse(code).node), expected)
+        self.assertTrue(parser._pool is pool)
+        parser.close()
+        self.assertTrue(parser._pool is None)
+
+        pool = multiprocessing.Pool(2)
+        try:
+            parser = PtpyParser(processes=2, pool=pool)
+            self.assertEqual(self.flatten(parser.parse(code).node),
+                             expected)
+            parser.close()
+            self.assertEqual(pool.apply(len, ("abc",)), 3)
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def test_first_error(self):
+        """Test a parallel parse raises the error a serial parse does"""
+        from ptpy.bench import corpus
+        lines = corpus.generate('comments', 8192, seed=2).split('\n')
+        lines[100] = 'a = = 1'
+        lines[-10] = 'b = = 2'
+        code = '\n'.join(lines)
+        errors = []
+        for processes in (None, 2):
+            parser = PtpyParser(processes=processes)
+            try:
+                parser.parse(code)
+            except SyntaxError, e:
+                errors.append(str(e))
+            parser.close()
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0], errors[1])
+        self.assertTrue(errors[0].startswith("invalid syntax at line 101,"))
+
+
+class TestPrattParserRules(TestParserRules):
+    # every rule test again, on the hand-written engine
+    def setUp(self):
+        self.parser = PtpyParser(engine='pratt')
+
+
+class TestPrattEngine(BaseTest):
+    def assertSameParse(self, code):
+        results = []
+        for engine in ('yacc', 'pratt'):
+            try:
+                tree = PtpyParser(engine=engine).parse(code)
+            except SyntaxError, e:
+                results.append(str(e))
+            else:
+                results.append(self.flatten(tree.node))
+        self.assertEqual(results[1], results[0])
+
+    def test_corpus(self):
+        """Test the engines give the same trees on the bench corpora"""
+        from ptpy.bench import corpus
+        for shape in sorted(corpus.SHAPES):
+            self.assertSameParse(corpus.generate(shape, 4096, seed=3))
+
+    def test_positions(self):
+        """Test nodes get the positions the PLY parser gives them
+
+        x = (a) + (f)(b, (c,)).d ** 2 if -e else [1, {"k": g}]
+        se nao x nao em (y, z):
+            para i em x: y = i; passar
+        senao:
+            definir (w) h:
+                z = x is nao 1
+        """
+        self.assertSameParse(self.get_string(self.test_positions))
+
+    def test_errors(self):
+        """Test syntax errors are found at the same token"""
+        for code in ["a = = 1\n", "a < b < c\n", "f(a b)\n", "[]\n",
+                     "a ** -b\n", "se a:\nb\n", "", "x = (1,\n",
+                     "definir a + :\n    b\n", "a = 1\n  b = 2\n",
+                     "a = $\n", "a = 1\n1 = 0\nb = 2\n"]:
+            self.assertSameParse(code)
+
+    def test_token_buffer(self):
+        """Test the engine parses from a token buffer"""
+        from ptpy.bench import corpus
+        code = corpus.generate('mixed', 4096, seed=3)
+        tokbuf = ptpylexer.PtpyLexer().tokenize_all(code)
+        parser = PtpyParser(engine='pratt')
+        self.assertEqual(self.flatten(parser.parse(tokbuf).node),
+                         self.flatten(parser.parse(code).node))
+
+
+class TestTables(unittest.TestCase):
+    def test_lextab_is_current(self):
+        """The shipped lexer table matches the rules in p_lexer"""
+        import ptpy.lextab
+        self.assertEqual(ptpy.lextab._signature,
+                         ptpylexer.lexer_signature())
+
+    def test_parsetab_is_current(self):
+        """The shipped parser table matches the grammar in p_parser"""
+        import ptpy.parsetab
+        pinfo = yacc.ParserReflect(dict((k, getattr(ptpyparser, k))
+                                        for k in dir(ptpyparser)))
+        pinfo.get_all()
+        self.assertEqual(ptpy.parsetab._lr_signature, pinfo.signature())
+
+    def test_tables_are_shared(self):
+        """Parsers share one copy of the tables"""
+        a, b = PtpyParser(), PtpyParser()
+        self.assertTrue(a._parser is not b._parser)
+        self.assertTrue(a._parser.action is b._parser.action)
+        self.assertTrue(a._lexer.lexer.lexre is b._lexer.lexer.lexre)
+
+
+
+class TestBenchCorpus(unittest.TestCase):
+    def test_shapes_compile(self):
+        """Every benchmark corpus shape parses and compiles"""
+        from ptpy.bench import corpus, throughput
+        for shape in sorted(corpus.SHAPES):
+            source = corpus.generate(shape, 2048, seed=1)
+            self.assertEqual(source, corpus.generate(shape, 2048, seed=1))
+            result = throughput.measure(source, repeat=1)
+            self.assertTrue(result['tokens'] > 0)
 
 
 